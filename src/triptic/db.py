@@ -31,6 +31,11 @@ def get_db_connection():
     conn = sqlite3.connect(get_db_path())
     conn.row_factory = sqlite3.Row
     try:
+        # Safe with WAL (set in init_database) and skips an fsync per commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Read pages straight from the OS page cache instead of copying them in
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA temp_store=MEMORY")
         yield conn
         conn.commit()
     except Exception:
@@ -45,6 +50,10 @@ def init_database() -> None:
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
+        # WAL lets the server's request threads read while one of them
+        # writes; the mode is persistent, so setting it once here is enough
+        cursor.execute("PRAGMA journal_mode=WAL")
+
         # Asset Versions table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS asset_versions (
@@ -230,56 +239,77 @@ def migrate_to_uuid_versioning() -> None:
 
 
 # Asset Group CRUD Operations
-def save_asset_group_db(asset_group_id: str, left_asset: 'Asset', center_asset: 'Asset', right_asset: 'Asset') -> int:
-    """Save an asset group to the database."""
+def _save_asset_group(cursor: sqlite3.Cursor, asset_group_id: str, left_asset: 'Asset', center_asset: 'Asset',
+                      right_asset: 'Asset') -> int:
+    """Insert or update an asset group and its assets using an open cursor."""
     from datetime import datetime
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    # Insert or get asset_group
+    cursor.execute(
+        "INSERT OR IGNORE INTO asset_groups (group_id, created_at) VALUES (?, ?)",
+        (asset_group_id, datetime.now().isoformat())
+    )
 
-        # Insert or get asset_group
+    cursor.execute("SELECT id FROM asset_groups WHERE group_id = ?", (asset_group_id,))
+    group_db_id = cursor.fetchone()[0]
+
+    # Save each screen's asset
+    for screen_name, asset in [('left', left_asset), ('center', center_asset), ('right', right_asset)]:
+        # Insert or update asset
         cursor.execute(
-            "INSERT OR IGNORE INTO asset_groups (group_id, created_at) VALUES (?, ?)",
-            (asset_group_id, datetime.now().isoformat())
+            "SELECT id FROM assets WHERE asset_group_id = ? AND screen = ?",
+            (group_db_id, screen_name)
         )
+        asset_row = cursor.fetchone()
 
-        cursor.execute("SELECT id FROM asset_groups WHERE group_id = ?", (asset_group_id,))
-        group_db_id = cursor.fetchone()[0]
-
-        # Save each screen's asset
-        for screen_name, asset in [('left', left_asset), ('center', center_asset), ('right', right_asset)]:
-            # Insert or update asset
+        if asset_row:
+            asset_db_id = asset_row[0]
+            # Update current_version_uuid
             cursor.execute(
-                "SELECT id FROM assets WHERE asset_group_id = ? AND screen = ?",
-                (group_db_id, screen_name)
+                "UPDATE assets SET current_version_uuid = ? WHERE id = ?",
+                (asset.current_version_uuid, asset_db_id)
             )
-            asset_row = cursor.fetchone()
+        else:
+            # Insert new asset
+            cursor.execute(
+                "INSERT INTO assets (asset_group_id, screen, current_version_uuid) VALUES (?, ?, ?)",
+                (group_db_id, screen_name, asset.current_version_uuid)
+            )
+            asset_db_id = cursor.lastrowid
 
-            if asset_row:
-                asset_db_id = asset_row[0]
-                # Update current_version_uuid
-                cursor.execute(
-                    "UPDATE assets SET current_version_uuid = ? WHERE id = ?",
-                    (asset.current_version_uuid, asset_db_id)
-                )
-            else:
-                # Insert new asset
-                cursor.execute(
-                    "INSERT INTO assets (asset_group_id, screen, current_version_uuid) VALUES (?, ?, ?)",
-                    (group_db_id, screen_name, asset.current_version_uuid)
-                )
-                asset_db_id = cursor.lastrowid
+        # Delete old versions and insert new ones
+        cursor.execute("DELETE FROM asset_versions WHERE asset_id = ?", (asset_db_id,))
 
-            # Delete old versions and insert new ones
-            cursor.execute("DELETE FROM asset_versions WHERE asset_id = ?", (asset_db_id,))
+        cursor.executemany(
+            "INSERT INTO asset_versions (asset_id, content_uuid, prompt, version_uuid, timestamp, version_index) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (asset_db_id, version.content, version.prompt, version.version_uuid, version.timestamp or datetime.now().isoformat(), idx)
+                for idx, version in enumerate(asset.versions)
+            ]
+        )
+
+    return group_db_id
+
+
+def save_asset_group_db(asset_group_id: str, left_asset: 'Asset', center_asset: 'Asset', right_asset: 'Asset') -> int:
+    """Save an asset group to the database."""
+    with get_db_connection() as conn:
+        return _save_asset_group(conn.cursor(), asset_group_id, left_asset, center_asset, right_asset)
 
-            for idx, version in enumerate(asset.versions):
-                cursor.execute(
-                    "INSERT INTO asset_versions (asset_id, content_uuid, prompt, version_uuid, timestamp, version_index) VALUES (?, ?, ?, ?, ?, ?)",
-                    (asset_db_id, version.content, version.prompt, version.version_uuid, version.timestamp or datetime.now().isoformat(), idx)
-                )
 
-        return group_db_id
+def save_asset_groups_db(asset_groups: list[tuple[str, 'Asset', 'Asset', 'Asset']]) -> None:
+    """Save several asset groups in a single transaction.
+
+    Each entry is an (asset_group_id, left, center, right) tuple, matching
+    the arguments of save_asset_group_db.
+    """
+    if not asset_groups:
+        return
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for asset_group_id, left_asset, center_asset, right_asset in asset_groups:
+            _save_asset_group(cursor, asset_group_id, left_asset, center_asset, right_asset)
 
 
 def get_asset_group_db(asset_group_id: str) -> Optional[dict]:
@@ -545,6 +575,14 @@ def get_all_asset_groups_db() -> dict:
         return _build_asset_groups_from_rows(cursor, group_rows)
 
 
+def get_asset_group_ids_db() -> set[str]:
+    """Get the IDs of all asset groups without loading their assets."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT group_id FROM asset_groups")
+        return {row[0] for row in cursor.fetchall()}
+
+
 def get_asset_groups_by_ids_db(group_ids: list[str]) -> dict:
     """Get specific asset groups by their IDs using batch queries."""
     if not group_ids:
@@ -571,52 +609,116 @@ def delete_asset_group_db(asset_group_id: str) -> bool:
         return cursor.rowcount > 0
 
 
+def delete_current_version_db(asset_group_id: str, screen: str) -> Optional[str]:
+    """Delete a screen's current version and make its newest remaining version current.
+
+    Runs as one transaction without loading or rewriting the rest of the
+    asset group. Raises ValueError, leaving the database unchanged, if the
+    asset group doesn't exist, the current version can't be found, or it
+    is the only version left.
+
+    Returns:
+        The version_uuid that is now current
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT a.id
+            FROM asset_groups ag
+            LEFT JOIN assets a ON a.asset_group_id = ag.id AND a.screen = ?
+            WHERE ag.group_id = ?
+        """, (screen, asset_group_id))
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Asset group not found: {asset_group_id}")
+        asset_db_id = row[0]
+
+        cursor.execute("""
+            DELETE FROM asset_versions
+            WHERE asset_id = ? AND version_uuid = (SELECT current_version_uuid FROM assets WHERE id = ?)
+        """, (asset_db_id, asset_db_id))
+        if cursor.rowcount == 0:
+            cursor.execute("SELECT 1 FROM asset_versions WHERE asset_id = ? LIMIT 1", (asset_db_id,))
+            if not cursor.fetchone():
+                raise ValueError(f"No versions found for {asset_group_id}/{screen}")
+            raise ValueError("Current version not found in versions list")
+
+        # The most recent remaining version (last in order) becomes current;
+        # the gap left in version_index is harmless since reads only sort by it
+        cursor.execute(
+            "SELECT version_uuid FROM asset_versions WHERE asset_id = ? ORDER BY version_index DESC LIMIT 1",
+            (asset_db_id,)
+        )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError("Cannot delete last remaining version")
+
+        cursor.execute("UPDATE assets SET current_version_uuid = ? WHERE id = ?", (row[0], asset_db_id))
+        return row[0]
+
+
 # Playlist CRUD Operations
-def save_playlist_db(name: str, assets: list[str], current_position: int, child_playlists: list[str] | None = None) -> int:
-    """Save a playlist to the database."""
+def _save_playlist(cursor: sqlite3.Cursor, name: str, assets: list[str], current_position: int,
+                   child_playlists: list[str] | None = None) -> int:
+    """Insert or update a playlist and its items using an open cursor."""
     from datetime import datetime
 
     child_playlists_json = json.dumps(child_playlists) if child_playlists else None
 
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    # Insert or update playlist
+    cursor.execute(
+        "SELECT id FROM playlists WHERE name = ?",
+        (name,)
+    )
+    playlist_row = cursor.fetchone()
 
-        # Insert or update playlist
+    if playlist_row:
+        playlist_db_id = playlist_row[0]
         cursor.execute(
-            "SELECT id FROM playlists WHERE name = ?",
-            (name,)
+            "UPDATE playlists SET current_position = ?, child_playlists = ? WHERE id = ?",
+            (current_position, child_playlists_json, playlist_db_id)
         )
-        playlist_row = cursor.fetchone()
+    else:
+        cursor.execute(
+            "INSERT INTO playlists (name, current_position, created_at, child_playlists) VALUES (?, ?, ?, ?)",
+            (name, current_position, datetime.now().isoformat(), child_playlists_json)
+        )
+        playlist_db_id = cursor.lastrowid
 
-        if playlist_row:
-            playlist_db_id = playlist_row[0]
-            cursor.execute(
-                "UPDATE playlists SET current_position = ?, child_playlists = ? WHERE id = ?",
-                (current_position, child_playlists_json, playlist_db_id)
-            )
-        else:
-            cursor.execute(
-                "INSERT INTO playlists (name, current_position, created_at, child_playlists) VALUES (?, ?, ?, ?)",
-                (name, current_position, datetime.now().isoformat(), child_playlists_json)
-            )
-            playlist_db_id = cursor.lastrowid
+    # Delete old playlist items
+    cursor.execute("DELETE FROM playlist_items WHERE playlist_id = ?", (playlist_db_id,))
 
-        # Delete old playlist items
-        cursor.execute("DELETE FROM playlist_items WHERE playlist_id = ?", (playlist_db_id,))
+    # Insert new playlist items, resolving each asset_group db_id in the same
+    # statement; items whose asset group doesn't exist are skipped
+    cursor.executemany(
+        "INSERT INTO playlist_items (playlist_id, asset_group_id, position) "
+        "SELECT ?, id, ? FROM asset_groups WHERE group_id = ?",
+        [(playlist_db_id, position, asset_group_id) for position, asset_group_id in enumerate(assets)]
+    )
 
-        # Insert new playlist items
-        for position, asset_group_id in enumerate(assets):
-            # Get asset_group db_id
-            cursor.execute("SELECT id FROM asset_groups WHERE group_id = ?", (asset_group_id,))
-            group_row = cursor.fetchone()
+    return playlist_db_id
+
+
+def save_playlist_db(name: str, assets: list[str], current_position: int, child_playlists: list[str] | None = None) -> int:
+    """Save a playlist to the database."""
+    with get_db_connection() as conn:
+        return _save_playlist(conn.cursor(), name, assets, current_position, child_playlists)
 
-            if group_row:
-                cursor.execute(
-                    "INSERT INTO playlist_items (playlist_id, asset_group_id, position) VALUES (?, ?, ?)",
-                    (playlist_db_id, group_row[0], position)
-                )
 
-        return playlist_db_id
+def save_playlists_db(playlists: list[tuple[str, list[str], int, list[str] | None]]) -> None:
+    """Save several playlists in a single transaction.
+
+    Each entry is a (name, assets, current_position, child_playlists) tuple,
+    matching the arguments of save_playlist_db.
+    """
+    if not playlists:
+        return
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for name, assets, current_position, child_playlists in playlists:
+            _save_playlist(cursor, name, assets, current_position, child_playlists)
 
 
 def get_playlist_db(name: str) -> Optional[dict]:
@@ -667,17 +769,14 @@ def get_all_playlists_db() -> dict:
         if not playlist_rows:
             return {}
 
-        playlist_db_ids = [row['id'] for row in playlist_rows]
-        placeholders = ','.join('?' * len(playlist_db_ids))
-
-        # Batch fetch all playlist items
-        cursor.execute(f"""
+        # Every playlist is wanted, so fetch all items in one pass without a
+        # bound id list; the order follows the (playlist_id, position) index
+        cursor.execute("""
             SELECT pi.playlist_id, ag.group_id
             FROM playlist_items pi
             JOIN asset_groups ag ON pi.asset_group_id = ag.id
-            WHERE pi.playlist_id IN ({placeholders})
-            ORDER BY pi.position
-        """, playlist_db_ids)
+            ORDER BY pi.playlist_id, pi.position
+        """)
 
         items_by_playlist = {}
         for row in cursor.fetchall():
@@ -714,6 +813,29 @@ def rename_playlist_db(old_name: str, new_name: str) -> bool:
         return cursor.rowcount > 0
 
 
+def rename_playlist_with_current_db(old_name: str, new_name: str, current_default: str) -> bool:
+    """Rename a playlist and repoint the current_playlist setting in one transaction.
+
+    current_default is the playlist that is current while the setting is unset.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("UPDATE playlists SET name = ? WHERE name = ?", (new_name, old_name))
+        if cursor.rowcount == 0:
+            return False
+
+        cursor.execute("SELECT value FROM settings WHERE key = 'current_playlist'")
+        row = cursor.fetchone()
+        current = json.loads(row[0]) if row else current_default
+        if current == old_name:
+            cursor.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('current_playlist', ?)",
+                (json.dumps(new_name),)
+            )
+        return True
+
+
 # Settings Operations
 def get_setting_db(key: str, default=None):
     """Get a setting from the database."""
@@ -728,6 +850,23 @@ def get_setting_db(key: str, default=None):
         return default
 
 
+def get_settings_db(defaults: dict) -> dict:
+    """Get several settings in one query, falling back to defaults[key] for missing ones."""
+    if not defaults:
+        return {}
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        placeholders = ','.join('?' * len(defaults))
+        cursor.execute(
+            f"SELECT key, value FROM settings WHERE key IN ({placeholders})",
+            list(defaults)
+        )
+        found = {row[0]: json.loads(row[1]) for row in cursor.fetchall()}
+
+    return {key: found.get(key, default) for key, default in defaults.items()}
+
+
 def set_setting_db(key: str, value):
     """Set a setting in the database."""
     with get_db_connection() as conn:
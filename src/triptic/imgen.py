@@ -1,5 +1,6 @@
 """Image generation utilities for triptic."""
 
+import functools
 import json
 import logging
 import os
@@ -24,7 +25,21 @@ def get_api_key() -> str | None:
         return api_key
 
     # Check .env file in project root
-    env_file = Path.cwd() / '.env'
+    return get_env_file_api_key()
+
+
+def get_env_file_api_key() -> str | None:
+    """Get the GEMINI_API_KEY entry from the .env file in the working directory."""
+    return _read_env_file_api_key(Path.cwd() / '.env')
+
+
+@functools.lru_cache(maxsize=4)
+def _read_env_file_api_key(env_file: Path) -> str | None:
+    """Scan env_file for GEMINI_API_KEY.
+
+    Cached per path so Gemini requests don't re-read the file each time;
+    save_api_key() clears the cache when it rewrites the key.
+    """
     if env_file.exists():
         with open(env_file) as f:
             for line in f:
@@ -49,6 +64,7 @@ def save_api_key(api_key: str) -> None:
     with open(env_file, 'w') as f:
         f.writelines(existing_lines)
         f.write(f'GEMINI_API_KEY={api_key}\n')
+    _read_env_file_api_key.cache_clear()
 
     print(f"    ✓ Saved API key to {env_file}")
 
@@ -634,9 +650,7 @@ def generate_video_from_image(input_image_path: Path, output_video_path: Path) -
 
     except Exception as api_error:
         error_msg = str(api_error)
-        import traceback
-        traceback_str = traceback.format_exc()
-        logging.error(f"[Veo] API error: {error_msg}\n{traceback_str}")
+        logging.exception(f"[Veo] API error: {error_msg}")
         if 'not found' in error_msg.lower() or 'permission' in error_msg.lower():
             raise RuntimeError(
                 "Video generation API is not available with your current Gemini API key. "
@@ -1,27 +1,243 @@
 """HTTP server for triptic."""
 
 import base64
+import email.utils
 import uuid
 from dataclasses import dataclass, field, fields, asdict
-from typing import Optional
+from typing import Callable, Optional
+import functools
+import hashlib
 import http.server
-import json
 import logging
 import logging.handlers
+import mimetypes
 import os
+import random
+import re
 import shutil
 import socketserver
+import subprocess
 import threading
+import time
 import urllib.parse
-from collections import defaultdict
+import urllib.request
+import weakref
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+
+import orjson
+from PIL import Image
 
 # Import SQLite backend
 from triptic import db, storage
 
-# Global dictionary to track video generation jobs
-video_jobs = {}
+
+def _dumps(obj) -> bytes:
+    """Serialize obj to JSON bytes."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+_loads = orjson.loads
+
+# Playlist names double as directory names, so keep them to a safe charset.
+_PLAYLIST_NAME_RE = re.compile(r'\A[a-zA-Z0-9_\-]+\Z')
+
+_VALID_SCREENS = frozenset(('left', 'center', 'right'))
+
+# File extensions (lower case, without the dot) discover_imagesets picks up.
+_IMAGESET_EXTENSIONS = frozenset(('png', 'jpg', 'jpeg', 'gif', 'mp4', 'webm'))
+
+# One line of a numbered "1. ...", "2) ..." list in a Gemini response.
+_NUMBERED_PROMPT_RE = re.compile(r'^\s*([123])[.)]\s*(.+?)\s*$', re.M)
+
+# Content types for the handful of extensions the assets dir holds; anything
+# else falls back to mimetypes.
+_ASSET_CONTENT_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif',
+    '.mp4': 'video/mp4',
+}
+
+
+def _str_field(data: dict, key: str) -> Optional[str]:
+    """Get a string field from a parsed JSON body; None if missing or not a string."""
+    value = data.get(key)
+    return value if isinstance(value, str) else None
+
+
+# Captures <name> and <screen> from /<kind>/<name>[/<action>/<screen>] API
+# paths, stopping at any query string.
+_RESOURCE_PATH_RE = re.compile(r'/[^/?]*/([^/?]*)(?:/[^/?]*/([^/?]*))?')
+
+# Bodies for the common small {"status": "ok", ...} responses. Strings made
+# only of these characters serialize to themselves, so they can be
+# spliced into a template without going through the JSON encoder.
+_OK_BODY = b'{"status":"ok"}'
+_JSON_PLAIN_STR_RE = re.compile(r'[A-Za-z0-9_\-. :/]*\Z')
+
+
+def _ok_response(key: str, value) -> bytes:
+    """Serialize {"status": "ok", key: value}, templating plain strings."""
+    if isinstance(value, str) and _JSON_PLAIN_STR_RE.match(value):
+        return b'{"status":"ok","%s":"%s"}' % (key.encode(), value.encode())
+    return _dumps({'status': 'ok', key: value})
+
+
+# Header block shared by every JSON API response. The status line is
+# prepended per protocol version and status code by _json_response_head.
+_JSON_HEADERS = (
+    b"Content-type: application/json\r\n"
+    b"Access-Control-Allow-Origin: *\r\n"
+)
+_NO_CACHE_HEADERS = (
+    b"Cache-Control: no-store, no-cache, must-revalidate\r\n"
+    b"Pragma: no-cache\r\n"
+    b"Expires: 0\r\n"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _json_response_head(protocol_version: str, code: int, no_cache: bool, server: str) -> bytes:
+    """Status line plus static headers, everything but Date and Content-Length."""
+    phrase = http.server.BaseHTTPRequestHandler.responses.get(code, ('',))[0]
+    return (
+        b"%s %d %s\r\n" % (protocol_version.encode('latin-1'), code, phrase.encode('latin-1'))
+        + b"Server: %s\r\n" % server.encode('latin-1')
+        + _JSON_HEADERS
+        + (_NO_CACHE_HEADERS if no_cache else b"")
+    )
+
+
+# Formatted Date header value, reused for every response within the same second
+_http_date_stamp: tuple[int, bytes] = (0, b'')
+
+
+def _http_date() -> bytes:
+    """Current time as an HTTP Date header value (RFC 9110 IMF-fixdate)."""
+    global _http_date_stamp
+    now = int(time.time())
+    stamp_second, stamp = _http_date_stamp
+    if stamp_second != now:
+        stamp = email.utils.formatdate(now, usegmt=True).encode('latin-1')
+        _http_date_stamp = (now, stamp)
+    return stamp
+
+
+# Upper bounds on request bodies: JSON API calls are tiny and read into
+# memory, uploads carry a whole image or video and are streamed to disk.
+_MAX_BODY = 1 << 20
+_MAX_UPLOAD_BODY = 512 << 20
+# Initial size of the per-connection buffer JSON request bodies are read into.
+_JSON_BUF_SIZE = 64 << 10
+
+# Chunk size for streaming upload bodies to disk; small enough to keep peak
+# memory flat, large enough that a big video is only a few thousand reads.
+_COPY_BUF_SIZE = 256 << 10
+
+# Default prompt for a new imageset, following Imagen best practices:
+# - Use descriptive narratives, not just keywords
+# - Include specific details about lighting, mood, composition
+# - Use photography terminology for photorealistic images
+# - Be explicit about aspect ratio and requirements
+_AUTO_PROMPT_TEMPLATE = (
+    "A stunning photograph of %s, captured in cinematic lighting with professional composition. "
+    "The scene features rich colors and detailed textures, shot with an 85mm lens for beautiful depth of field. "
+    "Natural lighting creates a warm, inviting atmosphere. High-resolution photography with sharp focus on the subject. "
+    "Vertical 9:16 aspect ratio, perfect for portrait orientation display."
+)
+# Turns an imageset slug like 'red-fox_cub' into prompt text
+_SUBJECT_TRANSLATE = str.maketrans({'-': ' ', '_': ' '})
+_PROMPT_FILE_TEMPLATE = (
+    "Main prompt: %(prompt)s\n\n"
+    "Screen-specific prompts:\n"
+    "  Left: %(prompt)s\n"
+    "  Center: %(prompt)s\n"
+    "  Right: %(prompt)s\n"
+)
+
+# Video generation jobs by ID, oldest first. Finished jobs are only polled
+# for a while, so entries expire _video_jobs_ttl seconds after their last
+# update and the table is capped at _video_jobs_max entries.
+video_jobs: OrderedDict[str, dict] = OrderedDict()
+_video_jobs_max = 10_000
+_video_jobs_ttl = 3600.0
+_video_jobs_lock = threading.Lock()
+
+# Video generation runs on a small fixed pool: each job mostly waits on the
+# upstream API, which rate-limits well below one thread per request anyway.
+_video_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='VideoGen')
+
+# Independent file copies within one request (an imageset's three screens
+# plus its prompt) run side by side here; the copies block in the kernel,
+# not on the GIL.
+_file_copy_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='FileCopy')
+
+# Independent Gemini text requests made on behalf of one HTTP request (e.g.
+# the three panel prompts of a triptych) are issued concurrently here.
+_gemini_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix='Gemini')
+
+# One Gemini client is shared across requests so its HTTP session (and the
+# TLS connection behind it) is reused. It is rebuilt if the API key changes.
+_genai_client = None
+_genai_client_key: str | None = None
+_genai_client_lock = threading.Lock()
+
+
+def _get_genai_client(api_key: str):
+    """Return the shared Gemini client for api_key, creating it on first use.
+
+    Raises ImportError if google-genai is not installed.
+    """
+    global _genai_client, _genai_client_key
+    with _genai_client_lock:
+        if _genai_client is None or _genai_client_key != api_key:
+            from google import genai
+            _genai_client = genai.Client(api_key=api_key)
+            _genai_client_key = api_key
+        return _genai_client
+
+
+def _expire_video_jobs(now: float) -> None:
+    """Drop expired and excess jobs. Caller must hold _video_jobs_lock."""
+    while video_jobs:
+        job = next(iter(video_jobs.values()))
+        if job['_updated'] + _video_jobs_ttl > now and len(video_jobs) <= _video_jobs_max:
+            break
+        video_jobs.popitem(last=False)
+
+
+def add_video_job(job_id: str, job: dict) -> None:
+    """Register a new video generation job."""
+    now = time.monotonic()
+    with _video_jobs_lock:
+        video_jobs[job_id] = {**job, '_updated': now}
+        _expire_video_jobs(now)
+
+
+def update_video_job(job_id: str, **changes) -> None:
+    """Update a job's fields; a no-op if the job has already expired."""
+    now = time.monotonic()
+    with _video_jobs_lock:
+        job = video_jobs.get(job_id)
+        if job is None:
+            return
+        job.update(changes, _updated=now)
+        video_jobs.move_to_end(job_id)
+
+
+def get_video_job(job_id: str) -> Optional[dict]:
+    """Get a snapshot of a job's fields, or None if unknown or expired."""
+    now = time.monotonic()
+    with _video_jobs_lock:
+        _expire_video_jobs(now)
+        job = video_jobs.get(job_id)
+        return dict(job) if job is not None else None
 
 
 # Data Models
@@ -75,20 +291,26 @@ class Asset:
         """Get all versions of this asset."""
         return self.versions
 
+    def index_of(self, version_uuid: Optional[str]) -> Optional[int]:
+        """Get the position of a version in the history by UUID, or None."""
+        if version_uuid:
+            for i, version in enumerate(self.versions):
+                if version.version_uuid == version_uuid:
+                    return i
+        return None
+
     def set_version(self, version_uuid: str) -> bool:
         """Set the current version by UUID. Returns True if successful."""
-        for version in self.versions:
-            if version.version_uuid == version_uuid:
-                self.current_version_uuid = version_uuid
-                return True
-        return False
+        if self.index_of(version_uuid) is None:
+            return False
+        self.current_version_uuid = version_uuid
+        return True
 
     def get_current_version(self) -> Optional[AssetVersion]:
         """Get the currently active version. Returns placeholder if not found."""
-        if self.current_version_uuid:
-            for version in self.versions:
-                if version.version_uuid == self.current_version_uuid:
-                    return version
+        i = self.index_of(self.current_version_uuid)
+        if i is not None:
+            return self.versions[i]
 
         # Return first version if current_version_uuid not set or not found
         if self.versions:
@@ -261,12 +483,115 @@ def setup_logging() -> None:
     logging.info(f"Logging configured. Server log: {server_log_file}, Requests log: {requests_log_file}")
 
 
+def _json_endpoint(error_prefix: str):
+    """Decorate a handler method so uncaught exceptions become a 500 JSON error.
+
+    The exception is logged with its traceback and reported to the client
+    as "<error_prefix>: <exception>". If the handler had already started its
+    response, a second one would desync the connection, so it is closed
+    instead.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except Exception as e:
+                logging.exception(error_prefix)
+                if self._response_started:
+                    self.close_connection = True
+                else:
+                    self._send_json_error(500, f"{error_prefix}: {e}")
+        return wrapper
+    return decorator
+
+
+# Gemini prompt templates for the prompt-helper endpoints, filled in with
+# str.format(); user text only ever goes into the placeholders.
+_FLUFF_TMPL = """You are a prompt engineer for Google's Imagen image generation AI.
+
+Given this simple prompt: "{simple_prompt}"
+
+Expand it into a detailed, descriptive prompt following these best practices:
+
+1. Use descriptive narratives, not just keywords
+2. Include specific details about:
+   - Photography terminology (lens, composition, lighting setup)
+   - Visual style and artistic approach
+   - Color palette and mood
+   - Textures and materials
+   - Atmospheric conditions
+3. Be explicit about technical requirements:
+   - Aspect ratio: 9:16 (vertical portrait)
+   - Resolution and quality level
+4. Describe the scene with rich contextual details
+5. Keep it focused and coherent - don't add unrelated elements
+
+Generate a single, well-crafted prompt (2-4 sentences) that will produce stunning results with Imagen. Return ONLY the expanded prompt text, nothing else."""
+
+_FLUFF_PLUS_TMPL = """You are a prompt engineer for Google's Imagen image generation AI.
+
+Given this category/theme: "{category_prompt}"
+
+Write one sub-prompt for a triptych (three-panel artwork) on this theme. This prompt is for {role}.
+
+Example:
+Category: "jazz musician"
+Left panel: "jazz pianist performing at a dimly lit club"
+Center panel: "saxophone player on a street corner at sunset"
+Right panel: "jazz bass player in a recording studio"
+
+Guidelines:
+1. Offer a distinct perspective, angle, or interpretation of the theme
+2. Use descriptive language suitable for image generation
+3. Keep the prompt concise (5-15 words)
+
+Return ONLY the prompt, nothing else."""
+
+_DIFF_SINGLE_TMPL = """You are a prompt engineer for Google's Imagen image generation AI.
+
+You are working on a triptych (three-panel artwork) with the theme: "{main_prompt}"
+
+Two panels already have prompts:
+- {first_screen}: "{first_prompt}"
+- {second_screen}: "{second_prompt}"
+
+Generate a prompt for the {screen} panel that:
+1. Fits thematically with the existing two prompts
+2. Relates to the main theme: "{main_prompt}"
+3. Creates a cohesive triptych when combined with the other two
+4. Is distinct but complementary to the existing prompts
+5. Uses similar style and tone to the other prompts
+6. Is concise (5-15 words)
+
+Return ONLY the prompt text, nothing else. No numbering, no explanations."""
+
+
 class TripticHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler that serves from the public directory."""
 
+    # Keep connections open between requests: the admin UI and the frames
+    # make many small calls, so every response must carry Content-Length.
+    protocol_version = 'HTTP/1.1'
+
+    # Socket timeout, so idle keep-alive connections don't pin a thread forever.
+    timeout = 120
+
+    # Buffer wfile so the header block and body of send_response-style
+    # responses (static files, errors, redirects) leave in one send rather
+    # than one per write; handle_one_request flushes after every request.
+    wbufsize = 8192
+
+    # Resolved on first use and shared by every connection; the public dir
+    # doesn't move for the lifetime of the process.
+    _default_public_dir: Optional[str] = None
+
     def __init__(self, *args, directory: str = None, **kwargs):
-        self.public_dir = directory or str(get_public_dir())
-        super().__init__(*args, directory=self.public_dir, **kwargs)
+        if directory is None:
+            if TripticHandler._default_public_dir is None:
+                TripticHandler._default_public_dir = str(get_public_dir())
+            directory = TripticHandler._default_public_dir
+        super().__init__(*args, directory=directory, **kwargs)
 
     def _requires_auth(self, path: str) -> bool:
         """Check if a path requires authentication.
@@ -321,7 +646,6 @@ class TripticHandler(http.server.SimpleHTTPRequestHandler):
 
     def _get_auth_token(self) -> str:
         """Generate auth token from credentials."""
-        import hashlib
         expected_username = os.environ.get('TRIPTIC_AUTH_USERNAME', '')
         expected_password = os.environ.get('TRIPTIC_AUTH_PASSWORD', '')
         # Create a hash of credentials as the token
@@ -393,11 +717,13 @@ class TripticHandler(http.server.SimpleHTTPRequestHandler):
 
     def _send_auth_required(self) -> None:
         """Send 401 Unauthorized response with WWW-Authenticate header."""
+        body = b'<html><body><h1>401 Unauthorized</h1><p>Authentication required.</p></body></html>'
         self.send_response(401)
         self.send_header('WWW-Authenticate', 'Basic realm="Triptic Management"')
         self.send_header('Content-type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(b'<html><body><h1>401 Unauthorized</h1><p>Authentication required.</p></body></html>')
+        self.wfile.write(body)
 
     def _maybe_set_auth_cookie(self) -> None:
         """Set auth cookie if basic auth just succeeded."""
@@ -417,14 +743,193 @@ class TripticHandler(http.server.SimpleHTTPRequestHandler):
         else:
             requests_logger.info(format % args)
 
+    def handle_one_request(self) -> None:
+        """Handle one request, closing the connection if its body went unread.
+
+        Handlers that reject a request early don't read its body; on a
+        keep-alive connection those bytes would be parsed as the next request.
+        """
+        self._body_read = False
+        self._response_started = False
+        super().handle_one_request()
+        if self._body_unread():
+            self.close_connection = True
+
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        """Send the status line, noting that this request's response has begun."""
+        self._response_started = True
+        super().send_response(code, message)
+
+    def _body_unread(self) -> bool:
+        """Whether the current request carries a body no handler has read."""
+        if self._body_read:
+            return False
+        headers = getattr(self, 'headers', None)
+        return bool(headers) and (
+            headers.get('Content-Length', '0') != '0' or 'Transfer-Encoding' in headers
+        )
+
+    def _path_args(self) -> tuple[Optional[str], Optional[str]]:
+        """Parse (name, screen) out of a /<kind>/<name>[/<action>/<screen>] path.
+
+        The name is URL-decoded; missing or empty segments come back as None.
+        """
+        m = _RESOURCE_PATH_RE.match(self.path)
+        if not m:
+            return None, None
+        name, screen = m.groups()
+        return unquote(name) or None, screen or None
+
+    def _content_length(self, limit: int) -> Optional[int]:
+        """Return the request's Content-Length, refusing anything larger than limit.
+
+        Returns None after sending an error response if Content-Length is
+        malformed or too large; callers should return immediately.
+        """
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self.send_error(400, "Invalid Content-Length")
+            return None
+
+        if content_length > limit:
+            # The body is left unread, so the connection can't be reused
+            self.close_connection = True
+            self.send_error(413, f"Request body too large (limit {limit} bytes)")
+            return None
+
+        return content_length
+
+    def _read_json(self, limit: int = _MAX_BODY) -> Optional[dict]:
+        """Read and parse a JSON object request body; an empty body parses as {}.
+
+        Returns None after sending an error response if the body is too
+        large, isn't valid JSON or isn't an object; callers should return
+        immediately.
+        """
+        content_length = self._content_length(limit)
+        if content_length is None:
+            return None
+        self._body_read = True
+        if not content_length:
+            return {}
+        try:
+            data = _loads(self._read_into_buffer(content_length))
+        except ValueError:
+            self._send_json_error(400, "Invalid JSON body")
+            return None
+        if not isinstance(data, dict):
+            self._send_json_error(400, "JSON body must be an object")
+            return None
+        return data
+
+    def _read_into_buffer(self, size: int) -> memoryview:
+        """Read up to size body bytes into this connection's reusable buffer.
+
+        The buffer is kept across keep-alive requests and only grows, so
+        small JSON bodies don't allocate a fresh bytes object each time. The
+        returned view is only valid until the next call; a short read (client
+        went away) returns just the bytes that arrived.
+        """
+        buf = getattr(self, '_json_buf', None)
+        if buf is None or len(buf) < size:
+            buf = self._json_buf = bytearray(max(size, _JSON_BUF_SIZE))
+        view = memoryview(buf)[:size]
+        got = 0
+        while got < size:
+            n = self.rfile.readinto(view[got:got + _COPY_BUF_SIZE])
+            if not n:
+                break
+            got += n
+        return view[:got]
+
+    def _read_body(self, limit: int = _MAX_BODY) -> Optional[bytes]:
+        """Read the request body into memory, refusing anything larger than limit.
+
+        Returns None after sending an error response; see _content_length.
+        """
+        content_length = self._content_length(limit)
+        if content_length is None:
+            return None
+        self._body_read = True
+        return self.rfile.read(content_length)
+
+    def _read_body_to_file(self, dst_path: Path, limit: int = _MAX_UPLOAD_BODY) -> Optional[int]:
+        """Stream the request body into dst_path without holding it in memory.
+
+        Returns the number of bytes written (an empty body writes nothing),
+        or None after sending an error response; see _content_length.
+        """
+        content_length = self._content_length(limit)
+        if content_length is None:
+            return None
+        self._body_read = True
+        if content_length:
+            _copy_stream(self.rfile, dst_path, content_length)
+        return content_length
+
     def _send_json_error(self, code: int, message: str) -> None:
         """Send a JSON error response instead of HTML."""
-        self.send_response(code)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        error_response = json.dumps({'status': 'error', 'message': message})
-        self.wfile.write(error_response.encode())
+        self._write_json(code, _dumps({'status': 'error', 'message': message}))
+
+    def _write_json_ok(self, payload: bytes, no_cache: bool = False) -> None:
+        """Send a 200 JSON response with headers and body in a single write."""
+        self._write_json(200, payload, no_cache)
+
+    def _write_json(self, code: int, payload: bytes, no_cache: bool = False) -> None:
+        """Send a JSON response with headers and body in a single write.
+
+        Equivalent to send_response(code) + the JSON/CORS headers (and the
+        no-cache trio when no_cache is set) + end_headers(), but reuses a
+        cached header block instead of formatting each header per request.
+        """
+        self._response_started = True
+        self.log_request(code)
+        head = _json_response_head(self.protocol_version, code, no_cache, self.version_string())
+        head += b"Date: %s\r\n" % _http_date()
+        if self._body_unread():
+            self.close_connection = True
+            head += b"Connection: close\r\n"
+        elif self.request_version == 'HTTP/1.0' and not self.close_connection:
+            # An HTTP/1.0 client asked for keep-alive; without the echo it
+            # would assume the server closes after this response.
+            head += b"Connection: keep-alive\r\n"
+        head += b"Content-Length: %d\r\n\r\n" % len(payload)
+        self._write_gather(head, payload)
+
+    def _send_file_body(self, f, size: int) -> None:
+        """Send size bytes of the open file f as the response body.
+
+        socket.sendfile copies in the kernel via os.sendfile where available
+        (and falls back to a send loop otherwise), so the file never passes
+        through a Python bytes object.
+        """
+        self.wfile.flush()
+        self.connection.sendfile(f, 0, size)
+
+    def _write_gather(self, *parts: bytes) -> None:
+        """Write several buffers to the client with one gather-send.
+
+        Uses sendmsg() on the socket so headers and body go out in a single
+        syscall without first being copied into one bytes object. Falls back
+        to wfile for whatever sendmsg didn't take, or when it's unavailable.
+        """
+        sendmsg = getattr(self.connection, 'sendmsg', None)
+        if sendmsg is None:
+            for part in parts:
+                self.wfile.write(part)
+            return
+
+        self.wfile.flush()
+        sent = sendmsg(parts)
+        for part in parts:
+            if sent >= len(part):
+                sent -= len(part)
+                continue
+            self.wfile.write(memoryview(part)[sent:])
+            sent = 0
 
     def do_GET(self) -> None:
         """Handle GET requests."""
@@ -442,6 +947,7 @@ class TripticHandler(http.server.SimpleHTTPRequestHandler):
                 self.send_response(302)
                 self.send_header('Location', self.path)
                 self.send_header('Set-Cookie', f'triptic_auth={token}; Path=/; Expires={expires_str}; SameSite=Strict')
+                self.send_header('Content-Length', '0')
                 self.end_headers()
                 self._set_auth_cookie = False
                 return
@@ -487,6 +993,7 @@ class TripticHandler(http.server.SimpleHTTPRequestHandler):
             # Redirect root to wall
             self.send_response(302)
             self.send_header('Location', '/wall.html')
+            self.send_header('Content-Length', '0')
             self.end_headers()
         else:
             # Delegate to parent for static file serving (includes /defaults/)
@@ -513,8 +1020,8 @@ class TripticHandler(http.server.SimpleHTTPRequestHandler):
                 return
 
         if self.path.startswith('/heartbeat/'):
-            screen_id = self.path.split('/')[-1]
-            self._handle_heartbeat(screen_id)
+            screen_id, _ = self._path_args()
+            self._handle_heartbeat(screen_id or '')
         elif self.path == '/config':
             self._handle_post_config()
         elif self.path == '/frame-log':
@@ -595,495 +1102,351 @@ class TripticHandler(http.server.SimpleHTTPRequestHandler):
         else:
             self._send_json_error(404, "Not found")
 
+    @_json_endpoint("Error getting config")
     def _handle_get_config(self) -> None:
         """Get configuration."""
-        try:
-            config = get_config()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            self.end_headers()
-            response = json.dumps(config)
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error getting config: {e}")
+        config = get_config()
+        response = _dumps(config)
+        self._write_json_ok(response, no_cache=True)
 
+    @_json_endpoint("Error updating config")
     def _handle_post_config(self) -> None:
         """Update configuration."""
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            update_config(data)
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok'})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error updating config: {e}")
+        data = self._read_json()
+        if data is None:
+            return
+        update_config(data)
+        response = _OK_BODY
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error getting settings")
     def _handle_get_settings(self) -> None:
         """Get settings."""
-        try:
-            settings = get_settings()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            self.end_headers()
-            response = json.dumps(settings)
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error getting settings: {e}")
+        settings = get_settings()
+        response = _dumps(settings)
+        self._write_json_ok(response, no_cache=True)
 
+    @_json_endpoint("Error updating settings")
     def _handle_post_settings(self) -> None:
         """Update settings."""
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            update_settings(data)
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok'})
-            self.wfile.write(response.encode())
-            logging.info(f"Settings updated: model={data.get('model', 'N/A')}")
-        except Exception as e:
-            self.send_error(500, f"Error updating settings: {e}")
+        data = self._read_json()
+        if data is None:
+            return
+        update_settings(data)
+        response = _OK_BODY
+        self._write_json_ok(response)
+        logging.info(f"Settings updated: model={data.get('model', 'N/A')}")
 
+    @_json_endpoint("Error generating thumbnails")
     def _handle_generate_thumbnails(self) -> None:
         """Generate thumbnails for all existing images that don't have them."""
-        try:
-            from . import storage
-            assets_dir = storage.get_assets_dir()
-
-            # Find all PNG images that don't have _thumb suffix
-            images = list(assets_dir.glob("*.png"))
-            images = [p for p in images if not p.stem.endswith("_thumb")]
-
-            created = 0
-            skipped = 0
-            failed = 0
+        assets_dir = storage.get_assets_dir()
 
-            for img_path in images:
-                content_uuid = img_path.stem
-                thumb_path = assets_dir / f"{content_uuid}_thumb.png"
+        # Find all PNG images that don't have _thumb suffix
+        images = list(assets_dir.glob("*.png"))
+        images = [p for p in images if not p.stem.endswith("_thumb")]
 
-                if thumb_path.exists():
-                    skipped += 1
-                    continue
+        created = 0
+        skipped = 0
+        failed = 0
 
-                result = storage.create_thumbnail(content_uuid, img_path)
-                if result:
-                    created += 1
-                else:
-                    failed += 1
+        for img_path in images:
+            content_uuid = img_path.stem
+            thumb_path = assets_dir / f"{content_uuid}_thumb.png"
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
-                'status': 'ok',
-                'created': created,
-                'skipped': skipped,
-                'failed': failed,
-                'total': len(images)
-            })
-            self.wfile.write(response.encode())
-            logging.info(f"Generated thumbnails: created={created}, skipped={skipped}, failed={failed}")
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self._send_json_error(500, f"Error generating thumbnails: {e}")
+            if thumb_path.exists():
+                skipped += 1
+                continue
 
+            result = storage.create_thumbnail(content_uuid, img_path)
+            if result:
+                created += 1
+            else:
+                failed += 1
+
+        response = _dumps({
+            'status': 'ok',
+            'created': created,
+            'skipped': skipped,
+            'failed': failed,
+            'total': len(images)
+        })
+        self._write_json_ok(response)
+        logging.info(f"Generated thumbnails: created={created}, skipped={skipped}, failed={failed}")
+
+    @_json_endpoint("Error getting generation queue")
     def _handle_get_generation_queue(self) -> None:
         """Get the current generation queue."""
-        try:
-            queue_items = db.get_generation_queue()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.end_headers()
-            response = json.dumps({'items': queue_items})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self._send_json_error(500, f"Error getting generation queue: {e}")
+        queue_items = db.get_generation_queue()
+        self._write_json_ok(_dumps({'items': queue_items}), no_cache=True)
 
+    @_json_endpoint("Error canceling generations")
     def _handle_cancel_generations(self) -> None:
         """Cancel selected generation requests."""
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
+        data = self._read_json()
+        if data is None:
+            return
 
-            uuids = data.get('uuids', [])
-            if not uuids:
-                self._send_json_error(400, "No UUIDs provided")
-                return
+        uuids = data.get('uuids', [])
+        if not uuids:
+            self._send_json_error(400, "No UUIDs provided")
+            return
 
-            # Cancel the generations in the database
-            canceled_count = db.cancel_generations(uuids)
-
-            # Replace the placeholder images with canceled placeholders
-            from . import storage
-            canceled_placeholder = storage.get_assets_dir() / f"{storage.CANCELED_PLACEHOLDER_UUID}.png"
-
-            for uuid in uuids:
-                # Get the content_uuid for this generation request
-                queue_items = db.get_generation_queue()
-                for item in queue_items:
-                    if item['uuid'] == uuid and item['status'] == 'canceled':
-                        content_uuid = item['content_uuid']
-                        output_path = storage.get_assets_dir() / f"{content_uuid}.png"
-                        if canceled_placeholder.exists() and output_path.exists():
-                            shutil.copy2(canceled_placeholder, output_path)
-                            # Also update thumbnail
-                            storage.create_thumbnail(content_uuid, output_path)
+        # Cancel the generations in the database
+        canceled_count = db.cancel_generations(uuids)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'canceled': canceled_count})
-            self.wfile.write(response.encode())
-            logging.info(f"Canceled {canceled_count} generation requests")
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self._send_json_error(500, f"Error canceling generations: {e}")
+        # Replace the placeholder images with canceled placeholders
+        canceled_placeholder = storage.get_assets_dir() / f"{storage.CANCELED_PLACEHOLDER_UUID}.png"
+
+        for uuid in uuids:
+            # Get the content_uuid for this generation request
+            queue_items = db.get_generation_queue()
+            for item in queue_items:
+                if item['uuid'] == uuid and item['status'] == 'canceled':
+                    content_uuid = item['content_uuid']
+                    output_path = storage.get_assets_dir() / f"{content_uuid}.png"
+                    if canceled_placeholder.exists() and output_path.exists():
+                        shutil.copy2(canceled_placeholder, output_path)
+                        # Also update thumbnail
+                        storage.create_thumbnail(content_uuid, output_path)
+
+        response = _dumps({'status': 'ok', 'canceled': canceled_count})
+        self._write_json_ok(response)
+        logging.info(f"Canceled {canceled_count} generation requests")
 
+    @_json_endpoint("Error getting video models")
     def _handle_get_video_models(self) -> None:
         """Get available video generation models from Gemini API."""
-        try:
-            # Get API key from settings
-            settings = get_settings()
-            api_key = settings.get('gemini_api_key', '')
-
-            if not api_key:
-                self.send_error(400, "Gemini API key not configured")
-                return
+        # Get API key from settings
+        settings = get_settings()
+        api_key = settings.get('gemini_api_key', '')
 
-            try:
-                from google import genai
-            except ImportError:
-                self.send_error(500, "google-genai package not available")
-                return
+        if not api_key:
+            self.send_error(400, "Gemini API key not configured")
+            return
 
-            # Create Gemini client
-            client = genai.Client(api_key=api_key)
+        try:
+            client = _get_genai_client(api_key)
+        except ImportError:
+            self.send_error(500, "google-genai package not available")
+            return
 
-            # List all models and filter for video generation models
-            video_models = []
-            try:
-                models = client.models.list()
-                for model in models:
-                    # Check if model supports video generation
-                    if hasattr(model, 'name') and 'veo' in model.name.lower():
-                        model_info = {
-                            'name': model.name,
-                            'display_name': getattr(model, 'display_name', model.name),
-                            'description': getattr(model, 'description', 'Video generation model')
-                        }
-                        video_models.append(model_info)
-            except Exception as e:
-                logging.warning(f"Error listing models from API: {e}")
-                # Fallback to known models if API call fails
-                video_models = [
-                    {
-                        'name': 'veo-2.0-generate-001',
-                        'display_name': 'Veo 2.0',
-                        'description': 'Google\'s Veo 2.0 video generation model'
+        # List all models and filter for video generation models
+        video_models = []
+        try:
+            models = client.models.list()
+            for model in models:
+                # Check if model supports video generation
+                if hasattr(model, 'name') and 'veo' in model.name.lower():
+                    model_info = {
+                        'name': model.name,
+                        'display_name': getattr(model, 'display_name', model.name),
+                        'description': getattr(model, 'description', 'Video generation model')
                     }
-                ]
-
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            self.end_headers()
-            response = json.dumps({'models': video_models})
-            self.wfile.write(response.encode())
+                    video_models.append(model_info)
         except Exception as e:
-            logging.error(f"Error getting video models: {e}")
-            self.send_error(500, f"Error getting video models: {e}")
+            logging.warning(f"Error listing models from API: {e}")
+            # Fallback to known models if API call fails
+            video_models = [
+                {
+                    'name': 'veo-2.0-generate-001',
+                    'display_name': 'Veo 2.0',
+                    'description': 'Google\'s Veo 2.0 video generation model'
+                }
+            ]
+
+        response = _dumps({'models': video_models})
+        self._write_json_ok(response, no_cache=True)
 
+    @_json_endpoint("Error getting playlist")
     def _handle_get_playlist(self) -> None:
         """Get current playlist items."""
-        try:
-            current_name = get_current_playlist()
-
-            # Check if there's a locked asset group - if so, return only that asset group
-            state = read_state()
-            locked_asset_group = state.get('current_imageset_override')
-
-            if locked_asset_group:
-                # Get the locked asset group directly, regardless of playlist
-                asset_group = get_asset_group(locked_asset_group)
-                if asset_group:
-                    item = {'name': locked_asset_group}
-                    for screen in ['left', 'center', 'right']:
-                        screen_asset = getattr(asset_group, screen)
-                        if screen_asset and screen_asset.versions:
-                            current_version = screen_asset.get_current_version()
-                            if current_version:
-                                content_uuid = current_version.content
-                                if content_uuid and not content_uuid.startswith('img/'):
-                                    item[screen] = f"/content/assets/{content_uuid}.png"
-                                    item[f"{screen}_thumb"] = f"/content/assets/{content_uuid}_thumb.png"
-                                    # Add video URL if available
-                                    if screen_asset.video_url:
-                                        item[f"{screen}_video"] = screen_asset.video_url
-                                else:
-                                    item[screen] = "/defaults/generating.png"
-                                    item[f"{screen}_thumb"] = "/defaults/generating.png"
-                    items = [item]
-                else:
-                    # Locked asset group not found, fall back to playlist
-                    items = get_playlist_items(current_name)
+        current_name = get_current_playlist()
+
+        # Check if there's a locked asset group - if so, return only that asset group
+        state = read_state_cached()
+        locked_asset_group = state.get('current_imageset_override')
+
+        if locked_asset_group:
+            # Get the locked asset group directly, regardless of playlist
+            asset_group = get_asset_group(locked_asset_group)
+            if asset_group:
+                item = {'name': locked_asset_group}
+                for screen in ['left', 'center', 'right']:
+                    screen_asset = getattr(asset_group, screen)
+                    if screen_asset and screen_asset.versions:
+                        current_version = screen_asset.get_current_version()
+                        if current_version:
+                            content_uuid = current_version.content
+                            if content_uuid and not content_uuid.startswith('img/'):
+                                item[screen] = f"/content/assets/{content_uuid}.png"
+                                item[f"{screen}_thumb"] = f"/content/assets/{content_uuid}_thumb.png"
+                                # Add video URL if available
+                                if screen_asset.video_url:
+                                    item[f"{screen}_video"] = screen_asset.video_url
+                            else:
+                                item[screen] = "/defaults/generating.png"
+                                item[f"{screen}_thumb"] = "/defaults/generating.png"
+                items = [item]
             else:
+                # Locked asset group not found, fall back to playlist
                 items = get_playlist_items(current_name)
+        else:
+            items = get_playlist_items(current_name)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            self.end_headers()
-            response = json.dumps({'name': current_name, 'items': items})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error getting playlist: {e}")
+        response = _dumps({'name': current_name, 'items': items})
+        self._write_json_ok(response, no_cache=True)
 
+    @_json_endpoint("Error getting playlists")
     def _handle_get_playlists(self) -> None:
         """Get all available playlists."""
-        try:
-            playlists = get_all_playlists()
-            current = get_current_playlist()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            self.end_headers()
-            # Return both the list of playlist names and full playlist data
-            response = json.dumps({
-                'playlists': list(playlists.keys()),
-                'current': current,
-                'data': {name: playlist.to_dict() for name, playlist in playlists.items()}
-            })
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error getting playlists: {e}")
-
+        playlists = get_all_playlists()
+        current = get_current_playlist()
+        # Return both the list of playlist names and full playlist data
+        response = _dumps({
+            'playlists': list(playlists.keys()),
+            'current': current,
+            'data': {name: playlist.to_dict() for name, playlist in playlists.items()}
+        })
+        self._write_json_ok(response, no_cache=True)
+
+    @_json_endpoint("Error getting playlist")
     def _handle_get_playlist_by_name(self) -> None:
         """Get a specific playlist's items by name."""
-        try:
-            # Extract playlist name from path: /playlists/{name}
-            playlist_name = self.path.split('/')[-1]
-            items = get_playlist_items(playlist_name)
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            self.end_headers()
-            response = json.dumps({'name': playlist_name, 'items': items})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error getting playlist: {e}")
+        # Extract playlist name from path: /playlists/{name}
+        playlist_name, _ = self._path_args()
+        if not playlist_name:
+            self._send_json_error(400, "Missing playlist name")
+            return
+        items = get_playlist_items(playlist_name)
+        response = _dumps({'name': playlist_name, 'items': items})
+        self._write_json_ok(response, no_cache=True)
 
+    @_json_endpoint("Error getting playlist asset groups")
     def _handle_get_playlist_asset_groups(self) -> None:
         """Get just the asset group IDs from a playlist (for navigation)."""
-        try:
-            # Extract playlist name from path: /playlists/{name}/asset-groups or /playlists/{name}/imagesets
-            parts = self.path.split('/')
-            playlist_name = urllib.parse.unquote(parts[2])
-
-            # Get playlist, resolving group playlists dynamically
-            playlist_data = db.get_playlist_db(playlist_name)
-            if playlist_data:
-                child_playlists = playlist_data.get('child_playlists', [])
-                if child_playlists:
-                    asset_group_names = resolve_group_playlist_assets(playlist_name)
-                else:
-                    asset_group_names = playlist_data.get('assets', [])
+        # Extract playlist name from path: /playlists/{name}/asset-groups or /playlists/{name}/imagesets
+        playlist_name, _ = self._path_args()
+
+        # Get playlist, resolving group playlists dynamically
+        playlist_data = db.get_playlist_db(playlist_name)
+        if playlist_data:
+            child_playlists = playlist_data.get('child_playlists', [])
+            if child_playlists:
+                asset_group_names = resolve_group_playlist_assets(playlist_name)
             else:
-                asset_group_names = []
+                asset_group_names = playlist_data.get('assets', [])
+        else:
+            asset_group_names = []
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            # Return both old and new keys for compatibility
-            response = json.dumps({
-                'asset_groups': asset_group_names,
-                'imagesets': asset_group_names  # For backward compatibility
-            })
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            logging.error(f"Error getting playlist asset groups for '{playlist_name}': {e}")
-            logging.error(traceback.format_exc())
-            self.send_error(500, f"Error getting playlist asset groups: {e}")
+        # Return both old and new keys for compatibility
+        response = _dumps({
+            'asset_groups': asset_group_names,
+            'imagesets': asset_group_names  # For backward compatibility
+        })
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error getting imagesets")
     def _handle_get_imagesets(self) -> None:
         """Get image sets, optionally filtered by prefix."""
-        try:
-            # Parse query parameters
-            from urllib.parse import parse_qs, urlparse
-            parsed = urlparse(self.path)
-            query = parse_qs(parsed.query)
-            prefix = query.get('prefix', [None])[0]
-
-            imagesets = list_imagesets(prefix)
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
-                'imagesets': [{'name': name, 'files': files} for name, files in imagesets]
-            })
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error getting imagesets: {e}")
-
+        # Parse query parameters
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        prefix = query.get('prefix', [None])[0]
+
+        imagesets = list_imagesets(prefix)
+        response = _dumps({
+            'imagesets': [{'name': name, 'files': files} for name, files in imagesets]
+        })
+        self._write_json_ok(response)
+
+    @_json_endpoint("Error getting asset groups")
     def _handle_get_asset_groups(self) -> None:
         """Get all asset groups."""
-        try:
-            asset_groups = get_asset_groups()
-            # Convert to dict format for JSON
-            response_data = {
-                group_id: group.to_dict()
-                for group_id, group in asset_groups.items()
-            }
+        asset_groups = get_asset_groups()
+        # Convert to dict format for JSON
+        response_data = {
+            group_id: group.to_dict()
+            for group_id, group in asset_groups.items()
+        }
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            self.end_headers()
-            response = json.dumps({'asset_groups': response_data})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            logging.error(f"Error getting asset groups: {e}")
-            self.send_error(500, f"Error getting asset groups: {e}")
+        response = _dumps({'asset_groups': response_data})
+        self._write_json_ok(response, no_cache=True)
 
+    @_json_endpoint("Error getting asset group")
     def _handle_get_asset_group(self) -> None:
         """Get a specific asset group by ID."""
-        try:
-            from urllib.parse import unquote
+        # Extract group ID from path: /asset-group/{id}
+        group_id, _ = self._path_args()
+        if not group_id:
+            self.send_error(400, "Missing asset group ID")
+            return
 
-            # Extract group ID from path: /asset-group/{id}
-            group_id = unquote(self.path.split('/')[-1])
-            if not group_id:
-                self.send_error(400, "Missing asset group ID")
-                return
+        response = get_asset_group_json(group_id)
+        if response is None:
+            self.send_error(404, f"Asset group not found: {group_id}")
+            return
 
-            asset_group = get_asset_group(group_id)
-            if not asset_group:
-                self.send_error(404, f"Asset group not found: {group_id}")
-                return
-
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.send_header('Pragma', 'no-cache')
-            self.send_header('Expires', '0')
-            self.end_headers()
-            response = json.dumps(asset_group.to_dict())
-            self.wfile.write(response.encode())
-        except Exception as e:
-            logging.error(f"Error getting asset group: {e}")
-            self.send_error(500, f"Error getting asset group: {e}")
+        self._write_json_ok(response, no_cache=True)
 
+    @_json_endpoint("Error creating asset group")
     def _handle_create_asset_group(self) -> None:
         """Create or update an asset group."""
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
+        data = self._read_json()
+        if data is None:
+            return
 
-            if 'id' not in data:
-                self.send_error(400, "Missing asset group ID")
-                return
+        if 'id' not in data:
+            self.send_error(400, "Missing asset group ID")
+            return
 
-            # Create AssetGroup from data
-            asset_group = AssetGroup.from_dict(data)
-            save_asset_group(asset_group)
+        # Create AssetGroup from data
+        asset_group = AssetGroup.from_dict(data)
+        save_asset_group(asset_group)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'success': True, 'id': asset_group.id})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            logging.error(f"Error creating asset group: {e}")
-            self.send_error(500, f"Error creating asset group: {e}")
+        response = _dumps({'success': True, 'id': asset_group.id})
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error creating asset group from prompt")
     def _handle_create_asset_group_from_prompt(self) -> None:
         """Create asset group from a prompt using Gemini to generate left/center/right prompts."""
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
+        data = self._read_json()
+        if data is None:
+            return
 
-            prompt = data.get('prompt', '').strip()
-            playlist_name = data.get('playlist', '').strip()
-            custom_name = data.get('name', '').strip()
+        prompt = (_str_field(data, 'prompt') or '').strip()
+        playlist_name = (_str_field(data, 'playlist') or '').strip()
+        custom_name = (_str_field(data, 'name') or '').strip()
 
-            if not prompt:
-                self._send_json_error(400, "Missing prompt")
-                return
+        if not prompt:
+            self._send_json_error(400, "Missing prompt")
+            return
 
-            # Use custom name if provided, otherwise generate from prompt (slugify)
-            import re
-            if custom_name:
-                group_id = re.sub(r'[^a-z0-9]+', '-', custom_name.lower())[:50].strip('-')
-            else:
-                group_id = re.sub(r'[^a-z0-9]+', '-', prompt.lower())[:50].strip('-')
+        # Use custom name if provided, otherwise generate from prompt (slugify)
+        if custom_name:
+            group_id = re.sub(r'[^a-z0-9]+', '-', custom_name.lower())[:50].strip('-')
+        else:
+            group_id = re.sub(r'[^a-z0-9]+', '-', prompt.lower())[:50].strip('-')
 
-            # Ensure unique ID by adding suffix if needed
-            base_id = group_id
-            counter = 1
-            while get_asset_group(group_id):
-                group_id = f"{base_id}-{counter}"
-                counter += 1
+        # Ensure unique ID by adding suffix if needed
+        base_id = group_id
+        counter = 1
+        while get_asset_group(group_id):
+            group_id = f"{base_id}-{counter}"
+            counter += 1
 
-            # Use Gemini to generate 3 sub-prompts
-            try:
-                from google import genai
-                from triptic.imgen import get_api_key
+        # Use Gemini to generate 3 sub-prompts
+        try:
+            from triptic.imgen import get_api_key
 
-                api_key = get_api_key()
-                if not api_key:
-                    self._send_json_error(500, "No Gemini API key configured")
-                    return
+            api_key = get_api_key()
+            if not api_key:
+                self._send_json_error(500, "No Gemini API key configured")
+                return
 
-                client = genai.Client(api_key=api_key)
+            client = _get_genai_client(api_key)
 
-                generation_prompt = f"""You are a prompt engineer for Google's Imagen image generation AI.
+            generation_prompt = f"""You are a prompt engineer for Google's Imagen image generation AI.
 
 Given this theme/concept: "{prompt}"
 
@@ -1109,470 +1472,349 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
 2. [prompt for center]
 3. [prompt for right]"""
 
-                response = client.models.generate_content(
-                    model='gemini-2.0-flash',
-                    contents=generation_prompt
-                )
+            response = client.models.generate_content(
+                model='gemini-2.0-flash',
+                contents=generation_prompt
+            )
 
-                # Parse the response to extract the 3 prompts
-                response_text = response.text.strip()
-                lines = [line.strip() for line in response_text.split('\n') if line.strip()]
-
-                sub_prompts = {}
-                panel_names = ['left', 'center', 'right']
-
-                for i, panel in enumerate(panel_names):
-                    prefix = f"{i+1}."
-                    for line in lines:
-                        if line.startswith(prefix):
-                            sub_prompt = line[len(prefix):].strip()
-                            sub_prompts[panel] = sub_prompt
-                            break
-                    if panel not in sub_prompts and i < len(lines):
-                        sub_prompts[panel] = lines[i].lstrip('123.-) ').strip()
-
-                if len(sub_prompts) != 3:
-                    self._send_json_error(500, f"Failed to generate 3 sub-prompts (got {len(sub_prompts)})")
-                    return
-
-                # Create the asset group
-                asset_group = AssetGroup(id=group_id)
-                save_asset_group(asset_group)
+            # Parse the response to extract the 3 prompts; the first line
+            # numbered 1, 2 or 3 wins, and if the list isn't numbered the
+            # first three lines are used in order
+            response_text = response.text.strip()
+            numbered = dict(reversed(_NUMBERED_PROMPT_RE.findall(response_text)))
+            if len(numbered) < 3:
+                lines = [line.strip().lstrip('123.-) ').strip() for line in response_text.splitlines() if line.strip()]
+                numbered = {str(i + 1): line for i, line in enumerate(lines[:3])} | numbered
+
+            sub_prompts = {
+                panel: numbered[n].strip('"\'')
+                for n, panel in (('1', 'left'), ('2', 'center'), ('3', 'right'))
+                if n in numbered
+            }
 
-                # Add to playlist if specified
-                if playlist_name:
-                    add_to_playlist(playlist_name, group_id)
+            if len(sub_prompts) != 3:
+                self._send_json_error(500, f"Failed to generate 3 sub-prompts (got {len(sub_prompts)})")
+                return
 
-                # Queue generation for all 3 screens
-                queued = []
-                for screen in ['left', 'center', 'right']:
-                    screen_prompt = sub_prompts[screen]
-                    request_uuid = storage.generate_uuid()
-                    content_uuid = storage.generate_uuid()
+            # Create the asset group
+            asset_group = AssetGroup(id=group_id)
+            save_asset_group(asset_group)
 
-                    # Create placeholder
-                    generating_placeholder = storage.get_assets_dir() / f"{storage.GENERATING_PLACEHOLDER_UUID}.png"
-                    output_path = storage.get_assets_dir() / f"{content_uuid}.png"
-                    if generating_placeholder.exists():
-                        shutil.copy2(generating_placeholder, output_path)
-                        storage.create_thumbnail(content_uuid, output_path)
+            # Add to playlist if specified
+            if playlist_name:
+                add_to_playlist(playlist_name, group_id)
 
-                    # Add version to asset group
-                    version = AssetVersion(
-                        content=content_uuid,
-                        prompt=screen_prompt,
-                        timestamp=datetime.now().isoformat()
-                    )
-                    screen_asset = getattr(asset_group, screen)
-                    screen_asset.add_version(version, set_as_current=True)
+            # Queue generation for all 3 screens
+            queued = []
+            for screen in ['left', 'center', 'right']:
+                screen_prompt = sub_prompts[screen]
+                request_uuid = storage.generate_uuid()
+                content_uuid = storage.generate_uuid()
 
-                    # Add to generation queue
-                    db.add_to_generation_queue(request_uuid, group_id, screen, screen_prompt, content_uuid)
-                    queued.append({'screen': screen, 'prompt': screen_prompt, 'request_uuid': request_uuid})
+                # Create placeholder
+                storage.copy_placeholder(storage.GENERATING_PLACEHOLDER_UUID, content_uuid)
 
-                # Save updated asset group with versions
-                save_asset_group(asset_group)
+                # Add version to asset group
+                version = AssetVersion(
+                    content=content_uuid,
+                    prompt=screen_prompt,
+                    timestamp=datetime.now().isoformat()
+                )
+                screen_asset = getattr(asset_group, screen)
+                screen_asset.add_version(version, set_as_current=True)
 
-                logging.info(f"[CreateFromPrompt] Created asset group '{group_id}' with prompts: {sub_prompts}")
+                # Add to generation queue
+                db.add_to_generation_queue(request_uuid, group_id, screen, screen_prompt, content_uuid)
+                queued.append({'screen': screen, 'prompt': screen_prompt, 'request_uuid': request_uuid})
 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response_data = json.dumps({
-                    'status': 'ok',
-                    'asset_group_id': group_id,
-                    'prompts': sub_prompts,
-                    'playlist': playlist_name or None,
-                    'queued': queued
-                })
-                self.wfile.write(response_data.encode())
-
-            except ImportError:
-                self._send_json_error(500, "google-genai is not installed")
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                self._send_json_error(500, f"Error generating prompts: {e}")
+            # Save updated asset group with versions
+            save_asset_group(asset_group)
 
+            logging.info(f"[CreateFromPrompt] Created asset group '{group_id}' with prompts: {sub_prompts}")
+
+            response_data = _dumps({
+                'status': 'ok',
+                'asset_group_id': group_id,
+                'prompts': sub_prompts,
+                'playlist': playlist_name or None,
+                'queued': queued
+            })
+            self._write_json_ok(response_data)
+
+        except ImportError:
+            self._send_json_error(500, "google-genai is not installed")
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self._send_json_error(500, f"Error creating asset group from prompt: {e}")
+            logging.exception("Error generating prompts")
+            self._send_json_error(500, f"Error generating prompts: {e}")
 
+    @_json_endpoint("Error deleting asset group")
     def _handle_delete_asset_group(self) -> None:
         """Delete an asset group."""
-        try:
-            # Extract group ID from path: /asset-group/{id}
-            group_id = self.path.split('/')[-1]
-            if not group_id:
-                self.send_error(400, "Missing asset group ID")
-                return
+        # Extract group ID from path: /asset-group/{id}
+        group_id, _ = self._path_args()
+        if not group_id:
+            self.send_error(400, "Missing asset group ID")
+            return
 
-            success = delete_asset_group(group_id)
-            if not success:
-                self.send_error(404, f"Asset group not found: {group_id}")
-                return
+        success = delete_asset_group(group_id)
+        if not success:
+            self.send_error(404, f"Asset group not found: {group_id}")
+            return
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'success': True})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            logging.error(f"Error deleting asset group: {e}")
-            self.send_error(500, f"Error deleting asset group: {e}")
+        response = _dumps({'success': True})
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error adding to playlists")
     def _handle_add_asset_group_to_playlists(self) -> None:
         """Add an asset group to one or more playlists."""
-        try:
-            # Extract group ID from path: /asset-group/{id}/add-to-playlists
-            path_parts = self.path.split('/')
-            group_id = path_parts[2] if len(path_parts) > 2 else None
-
-            if not group_id:
-                self.send_error(400, "Missing asset group ID")
-                return
+        # Extract group ID from path: /asset-group/{id}/add-to-playlists
+        group_id, _ = self._path_args()
 
-            # Decode URL-encoded group ID
-            from urllib.parse import unquote
-            group_id = unquote(group_id)
+        if not group_id:
+            self.send_error(400, "Missing asset group ID")
+            return
 
-            # Verify asset group exists
-            if not get_asset_group(group_id):
-                self.send_error(404, f"Asset group not found: {group_id}")
-                return
+        # Verify asset group exists
+        if not get_asset_group(group_id):
+            self.send_error(404, f"Asset group not found: {group_id}")
+            return
 
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            playlist_names = data.get('playlists', [])
+        data = self._read_json()
+        if data is None:
+            return
+        playlist_names = data.get('playlists', [])
 
-            if not playlist_names:
-                self.send_error(400, "Missing playlists array")
-                return
+        if not playlist_names:
+            self.send_error(400, "Missing playlists array")
+            return
 
-            # Add to each playlist
-            results = {}
-            for playlist_name in playlist_names:
-                playlists = get_all_playlists()
-                if playlist_name in playlists:
-                    playlist = playlists[playlist_name]
-                    if group_id not in playlist.assets:
-                        playlist.assets.append(group_id)
-                        save_playlist(playlist)
-                        results[playlist_name] = True
-                    else:
-                        results[playlist_name] = True  # Already in playlist
-                else:
-                    results[playlist_name] = False  # Playlist doesn't exist
+        results = add_to_playlists_bulk(playlist_names, group_id)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'results': results})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            logging.error(f"Error adding asset group to playlists: {e}")
-            self.send_error(500, f"Error adding to playlists: {e}")
+        response = _dumps({'status': 'ok', 'results': results})
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error setting playlist")
     def _handle_set_playlist(self) -> None:
         """Set current playlist."""
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            playlist_name = data.get('name')
-            if not playlist_name:
-                self.send_error(400, "Missing playlist name")
-                return
-            if set_current_playlist(playlist_name):
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response = json.dumps({'status': 'ok', 'playlist': playlist_name})
-                self.wfile.write(response.encode())
-            else:
-                self.send_error(404, f"Playlist not found: {playlist_name}")
-        except Exception as e:
-            self.send_error(500, f"Error setting playlist: {e}")
+        data = self._read_json()
+        if data is None:
+            return
+        playlist_name = _str_field(data, 'name')
+        if not playlist_name:
+            self.send_error(400, "Missing playlist name")
+            return
+        if set_current_playlist(playlist_name):
+            response = _ok_response('playlist', playlist_name)
+            self._write_json_ok(response)
+        else:
+            self.send_error(404, f"Playlist not found: {playlist_name}")
 
+    @_json_endpoint("Error getting current imageset")
     def _handle_get_current_imageset(self) -> None:
         """Get current imageset override."""
-        try:
-            state = read_state()
-            imageset = state.get('current_imageset_override', None)
+        state = read_state_cached()
+        imageset = state.get('current_imageset_override', None)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'imageset': imageset})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error getting current imageset: {e}")
+        response = _dumps({'imageset': imageset})
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error setting current imageset")
     def _handle_set_current_imageset(self) -> None:
         """Set current imageset override for dashboard preview."""
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            imageset = data.get('imageset')
-            if not imageset:
-                self.send_error(400, "Missing imageset name")
-                return
+        data = self._read_json()
+        if data is None:
+            return
+        imageset = _str_field(data, 'imageset')
+        if not imageset:
+            self.send_error(400, "Missing imageset name")
+            return
+
+        # Store the current imageset override in state
+        old_imageset = None
 
-            # Store the current imageset override in state
-            state = read_state()
+        def set_override(state: dict) -> bool:
+            nonlocal old_imageset
             old_imageset = state.get('current_imageset_override')
+            if old_imageset == imageset:
+                return False
             state['current_imageset_override'] = imageset
-            write_state(state)
+            return True
 
+        if update_state(set_override):
             logging.info(f"[MUTATION] Set current imageset: '{old_imageset}' -> '{imageset}'")
+        else:
+            logging.debug(f"[MUTATION] Current imageset already '{imageset}', skipping write")
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'imageset': imageset})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            logging.error(f"[MUTATION] Set current imageset failed: {e}")
-            logging.error(traceback.format_exc())
-            self.send_error(500, f"Error setting current imageset: {e}")
+        response = _ok_response('imageset', imageset)
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error getting current asset group")
     def _handle_get_current_asset_group(self) -> None:
         """Get current asset group override (new endpoint name)."""
-        try:
-            state = read_state()
-            asset_group = state.get('current_imageset_override', None)
+        state = read_state_cached()
+        asset_group = state.get('current_imageset_override', None)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            # Return both old and new keys for compatibility
-            response = json.dumps({
-                'asset_group': asset_group,
-                'imageset': asset_group
-            })
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error getting current asset group: {e}")
+        # Return both old and new keys for compatibility
+        response = _dumps({
+            'asset_group': asset_group,
+            'imageset': asset_group
+        })
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error setting current asset group")
     def _handle_set_current_asset_group(self) -> None:
         """Set current asset group override (new endpoint name). Pass empty/null to clear."""
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            # Accept both 'asset_group' and 'imageset' keys
-            asset_group = data.get('asset_group') or data.get('imageset')
+        data = self._read_json()
+        if data is None:
+            return
+        # Accept both 'asset_group' and 'imageset' keys
+        asset_group = data.get('asset_group') or data.get('imageset')
+        if asset_group is not None and not isinstance(asset_group, str):
+            self._send_json_error(400, "asset_group must be a string")
+            return
 
-            # Store the current asset group override in state
-            state = read_state()
-            old_asset_group = state.get('current_imageset_override')
+        # Store the current asset group override in state
+        old_asset_group = None
 
+        def set_override(state: dict) -> bool:
+            nonlocal old_asset_group
+            old_asset_group = state.get('current_imageset_override')
+            if old_asset_group == (asset_group or None):
+                return False
             if asset_group:
                 state['current_imageset_override'] = asset_group
             else:
                 # Clear the override if empty/null
                 state.pop('current_imageset_override', None)
+            return True
 
-            write_state(state)
-
+        if not update_state(set_override):
+            logging.debug(f"[MUTATION] Current asset group already '{old_asset_group}', skipping write")
+        else:
             if asset_group:
                 logging.info(f"[MUTATION] Set current asset group: '{old_asset_group}' -> '{asset_group}'")
             else:
                 logging.info(f"[MUTATION] Cleared current asset group override (was: '{old_asset_group}')")
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'asset_group': asset_group, 'cleared': not asset_group})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            logging.error(f"[MUTATION] Set current asset group failed: {e}")
-            logging.error(traceback.format_exc())
-            self.send_error(500, f"Error setting current asset group: {e}")
+        response = _dumps({'status': 'ok', 'asset_group': asset_group, 'cleared': not asset_group})
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error creating playlist")
     def _handle_create_playlist(self) -> None:
         """Create a new empty playlist."""
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            playlist_name = data.get('name', '').strip()
+        data = self._read_json()
+        if data is None:
+            return
+        playlist_name = (_str_field(data, 'name') or '').strip()
 
-            if not playlist_name:
-                logging.error(f"[MUTATION] Create playlist failed: Missing playlist name")
-                self.send_error(400, "Missing playlist name")
-                return
+        if not playlist_name:
+            logging.error(f"[MUTATION] Create playlist failed: Missing playlist name")
+            self.send_error(400, "Missing playlist name")
+            return
 
-            # Validate name (letters, numbers, hyphens, underscores only)
-            import re
-            if not re.match(r'^[a-zA-Z0-9_\-]+$', playlist_name):
-                logging.error(f"[MUTATION] Create playlist failed: Invalid name '{playlist_name}'")
-                self.send_error(400, "Playlist name can only contain letters, numbers, hyphens, and underscores")
-                return
+        # Validate name (letters, numbers, hyphens, underscores only)
+        if not _PLAYLIST_NAME_RE.match(playlist_name):
+            logging.error(f"[MUTATION] Create playlist failed: Invalid name '{playlist_name}'")
+            self.send_error(400, "Playlist name can only contain letters, numbers, hyphens, and underscores")
+            return
 
-            # Check if playlist already exists
-            state = read_state()
-            if 'playlists' not in state:
-                state['playlists'] = {}
+        # Check if playlist already exists
+        state = read_state()
+        if 'playlists' not in state:
+            state['playlists'] = {}
 
-            if playlist_name in state['playlists']:
-                logging.error(f"[MUTATION] Create playlist failed: Playlist already exists '{playlist_name}'")
-                self.send_error(409, f"Playlist already exists: {playlist_name}")
-                return
+        if playlist_name in state['playlists']:
+            logging.error(f"[MUTATION] Create playlist failed: Playlist already exists '{playlist_name}'")
+            self.send_error(409, f"Playlist already exists: {playlist_name}")
+            return
 
-            # Support group playlists with child playlists
-            child_playlists = data.get('playlists', [])
+        # Support group playlists with child playlists
+        child_playlists = data.get('playlists', [])
 
-            # Create playlist using new Playlist model
-            playlist = Playlist(name=playlist_name, assets=[], current_position=0, child_playlists=child_playlists)
-            save_playlist(playlist)
+        # Create playlist using new Playlist model
+        playlist = Playlist(name=playlist_name, assets=[], current_position=0, child_playlists=child_playlists)
+        save_playlist(playlist)
 
-            logging.info(f"[MUTATION] Created playlist: '{playlist_name}'" + (f" (group: {child_playlists})" if child_playlists else ""))
+        logging.info(f"[MUTATION] Created playlist: '{playlist_name}'" + (f" (group: {child_playlists})" if child_playlists else ""))
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            resp = {'status': 'ok', 'name': playlist_name}
-            if child_playlists:
-                resp['child_playlists'] = child_playlists
-            response = json.dumps(resp)
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            logging.error(f"[MUTATION] Create playlist exception: {e}")
-            logging.error(traceback.format_exc())
-            traceback.print_exc()
-            self.send_error(500, f"Error creating playlist: {e}")
+        resp = {'status': 'ok', 'name': playlist_name}
+        if child_playlists:
+            resp['child_playlists'] = child_playlists
+        response = _dumps(resp)
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error renaming playlist")
     def _handle_rename_playlist(self) -> None:
         """Rename an existing playlist."""
-        try:
-            # Extract old playlist name from URL
-            old_name = self.path.split('/')[2]  # /playlist/{name}/rename
-            old_name = urllib.parse.unquote(old_name)
-
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            new_name = data.get('new_name', '').strip()
-
-            if not new_name:
-                logging.error(f"[MUTATION] Rename playlist failed: Missing new playlist name")
-                self._send_json_error(400, "Missing new playlist name")
-                return
-
-            # Validate name (letters, numbers, hyphens, underscores only)
-            import re
-            if not re.match(r'^[a-zA-Z0-9_\-]+$', new_name):
-                logging.error(f"[MUTATION] Rename playlist failed: Invalid name '{new_name}'")
-                self._send_json_error(400, "Playlist name can only contain letters, numbers, hyphens, and underscores")
-                return
+        # Extract old playlist name from URL
+        old_name, _ = self._path_args()  # /playlist/{name}/rename
 
-            # Check if old playlist exists and new name doesn't conflict
-            playlists = get_all_playlists()
+        data = self._read_json()
+        if data is None:
+            return
+        new_name = (_str_field(data, 'new_name') or '').strip()
 
-            if old_name not in playlists:
-                logging.error(f"[MUTATION] Rename playlist failed: Playlist not found '{old_name}'")
-                self._send_json_error(404, f"Playlist not found: {old_name}")
-                return
+        if not new_name:
+            logging.error(f"[MUTATION] Rename playlist failed: Missing new playlist name")
+            self._send_json_error(400, "Missing new playlist name")
+            return
 
-            if new_name in playlists:
-                logging.error(f"[MUTATION] Rename playlist failed: Playlist already exists '{new_name}'")
-                self._send_json_error(409, f"Playlist already exists: {new_name}")
-                return
+        # Validate name (letters, numbers, hyphens, underscores only)
+        if not _PLAYLIST_NAME_RE.match(new_name):
+            logging.error(f"[MUTATION] Rename playlist failed: Invalid name '{new_name}'")
+            self._send_json_error(400, "Playlist name can only contain letters, numbers, hyphens, and underscores")
+            return
 
-            # Rename playlist in database
-            success = rename_playlist(old_name, new_name)
-            if not success:
-                logging.error(f"[MUTATION] Rename playlist failed: Database error")
-                self._send_json_error(500, "Failed to rename playlist in database")
-                return
+        # Check if old playlist exists and new name doesn't conflict
+        playlists = get_all_playlists()
 
-            # Update current playlist if needed
-            current = get_current_playlist()
-            if current == old_name:
-                set_current_playlist(new_name)
+        if old_name not in playlists:
+            logging.error(f"[MUTATION] Rename playlist failed: Playlist not found '{old_name}'")
+            self._send_json_error(404, f"Playlist not found: {old_name}")
+            return
 
-            # Rename physical directory if it exists
-            content_dir = Path.home() / ".triptic" / "content"
-            old_dir = content_dir / old_name
-            new_dir = content_dir / new_name
+        if new_name in playlists:
+            logging.error(f"[MUTATION] Rename playlist failed: Playlist already exists '{new_name}'")
+            self._send_json_error(409, f"Playlist already exists: {new_name}")
+            return
 
-            if old_dir.exists():
-                old_dir.rename(new_dir)
+        content_dir = Path.home() / ".triptic" / "content"
+        if not rename_playlist_atomic(old_name, new_name, content_dir):
+            logging.error(f"[MUTATION] Rename playlist failed: Database error")
+            self._send_json_error(500, "Failed to rename playlist in database")
+            return
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'old_name': old_name, 'new_name': new_name})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            logging.error(f"[MUTATION] Rename playlist exception: {e}")
-            logging.error(traceback.format_exc())
-            traceback.print_exc()
-            self._send_json_error(500, f"Error renaming playlist: {e}")
+        response = _dumps({'status': 'ok', 'old_name': old_name, 'new_name': new_name})
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error deleting playlist")
     def _handle_delete_playlist(self) -> None:
         """Delete a playlist."""
-        try:
-            # Extract playlist name from URL: /playlist/{name}
-            playlist_name = self.path.split('/')[2]
-            playlist_name = urllib.parse.unquote(playlist_name)
+        # Extract playlist name from URL: /playlist/{name}
+        playlist_name, _ = self._path_args()
 
-            if not playlist_name:
-                logging.error("[MUTATION] Delete playlist failed: Missing playlist name")
-                self.send_error(400, "Missing playlist name")
-                return
+        if not playlist_name:
+            logging.error("[MUTATION] Delete playlist failed: Missing playlist name")
+            self.send_error(400, "Missing playlist name")
+            return
 
-            # Use the existing delete_playlist function
-            success = delete_playlist(playlist_name)
+        # Use the existing delete_playlist function
+        success = delete_playlist(playlist_name)
 
-            if success:
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response = json.dumps({'status': 'ok', 'playlist': playlist_name})
-                self.wfile.write(response.encode())
-                logging.info(f"[MUTATION] Deleted playlist: '{playlist_name}'")
-            else:
-                logging.error(f"[MUTATION] Delete playlist failed: Playlist not found '{playlist_name}'")
-                self.send_error(404, f"Playlist not found: {playlist_name}")
-        except Exception as e:
-            import traceback
-            logging.error(f"[MUTATION] Delete playlist exception: {e}")
-            logging.error(traceback.format_exc())
-            traceback.print_exc()
-            self.send_error(500, f"Error deleting playlist: {e}")
+        if success:
+            response = _ok_response('playlist', playlist_name)
+            self._write_json_ok(response)
+            logging.info(f"[MUTATION] Deleted playlist: '{playlist_name}'")
+        else:
+            logging.error(f"[MUTATION] Delete playlist failed: Playlist not found '{playlist_name}'")
+            self.send_error(404, f"Playlist not found: {playlist_name}")
 
+    @_json_endpoint("Error recording heartbeat")
     def _handle_heartbeat(self, screen_id: str) -> None:
         """Record screen heartbeat."""
-        try:
-            update_screen_heartbeat(screen_id)
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'screen_id': screen_id})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error recording heartbeat: {e}")
+        update_screen_heartbeat(screen_id)
+        response = _ok_response('screen_id', screen_id)
+        self._write_json_ok(response)
 
     def _handle_healthz(self) -> None:
         """Liveness + readiness check.
@@ -1586,63 +1828,47 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
         try:
             ok = check_path.exists() and check_path.stat().st_size > 0
         except OSError as e:
-            self.send_response(503)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({
+            self._write_json(503, _dumps({
                 'status': 'unhealthy',
                 'reason': f'asset read failed: {e}',
                 'check_path': str(check_path),
-            }).encode())
+            }))
             return
 
         if not ok:
-            self.send_response(503)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({
+            self._write_json(503, _dumps({
                 'status': 'unhealthy',
                 'reason': 'default asset missing on volume',
                 'check_path': str(check_path),
-            }).encode())
+            }))
             return
 
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps({'status': 'ok'}).encode())
+        self._write_json_ok(_OK_BODY)
 
+    @_json_endpoint("Error reading heartbeats")
     def _handle_get_heartbeats(self) -> None:
         """Return last-sync timestamp for every screen plus seconds-since-now."""
-        try:
-            heartbeats = db.get_all_screen_heartbeats()
-            now = datetime.now()
-            screens = {}
-            for screen_id, last_sync in heartbeats.items():
-                seconds_ago = None
-                try:
-                    seconds_ago = int((now - datetime.fromisoformat(last_sync)).total_seconds())
-                except (ValueError, TypeError):
-                    pass
-                screens[screen_id] = {
-                    'last_sync': last_sync,
-                    'seconds_ago': seconds_ago,
-                }
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps({'screens': screens}).encode())
-        except Exception as e:
-            self.send_error(500, f"Error reading heartbeats: {e}")
+        heartbeats = db.get_all_screen_heartbeats()
+        now = datetime.now()
+        screens = {}
+        for screen_id, last_sync in heartbeats.items():
+            seconds_ago = None
+            try:
+                seconds_ago = int((now - datetime.fromisoformat(last_sync)).total_seconds())
+            except (ValueError, TypeError):
+                pass
+            screens[screen_id] = {
+                'last_sync': last_sync,
+                'seconds_ago': seconds_ago,
+            }
+        self._write_json_ok(_dumps({'screens': screens}))
 
     def _handle_frame_log(self) -> None:
         """Receive and store log messages from frames."""
-        global _frame_logs
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
+            data = self._read_json()
+            if data is None:
+                return
 
             # Get User-Agent for debugging
             user_agent = self.headers.get('User-Agent', 'unknown')
@@ -1657,12 +1883,9 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
                 'user_agent': user_agent
             }
 
+            # Bounded deque: appending drops the oldest entry past the limit
             _frame_logs.append(log_entry)
 
-            # Keep only last N entries
-            if len(_frame_logs) > _frame_logs_max:
-                _frame_logs = _frame_logs[-_frame_logs_max:]
-
             # Also log to server log for immediate visibility
             # Include User-Agent for VIDEO logs to help debug playback issues
             if 'VIDEO' in log_entry['message']:
@@ -1676,204 +1899,133 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
             else:
                 logging.info(log_msg)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(b'{"status":"ok"}')
+            self._write_json_ok(_OK_BODY)
         except Exception as e:
             logging.error(f"Error handling frame log: {e}")
-            self.send_response(200)  # Don't fail frames on log errors
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(b'{"status":"ok"}')
+            self._write_json_ok(_OK_BODY)  # Don't fail frames on log errors
 
+    @_json_endpoint("Error getting frame logs")
     def _handle_get_frame_logs(self) -> None:
         """Return stored frame logs."""
-        try:
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-            self.end_headers()
-            response = json.dumps({'logs': _frame_logs})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error getting frame logs: {e}")
+        self._write_json_ok(_dumps({'logs': list(_frame_logs)}), no_cache=True)
 
+    @_json_endpoint("Error adding to playlists")
     def _handle_add_imageset_to_playlists(self) -> None:
         """Add an imageset to one or more playlists."""
-        try:
-            # Extract imageset name from path: /imageset/{name}/add-to-playlists
-            path_parts = self.path.split('/')
-            imageset_name = path_parts[2] if len(path_parts) > 2 else None
-
-            if not imageset_name:
-                self.send_error(400, "Missing imageset name")
-                return
+        # Extract imageset name from path: /imageset/{name}/add-to-playlists
+        imageset_name, _ = self._path_args()
 
-            # Decode URL-encoded imageset name
-            from urllib.parse import unquote
-            imageset_name = unquote(imageset_name)
+        if not imageset_name:
+            self.send_error(400, "Missing imageset name")
+            return
 
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            playlist_names = data.get('playlists', [])
+        data = self._read_json()
+        if data is None:
+            return
+        playlist_names = data.get('playlists', [])
 
-            if not playlist_names:
-                self.send_error(400, "Missing playlists array")
-                return
+        if not playlist_names:
+            self.send_error(400, "Missing playlists array")
+            return
 
-            # Add to each playlist
-            results = {}
-            for playlist_name in playlist_names:
-                results[playlist_name] = add_to_playlist(playlist_name, imageset_name)
+        results = add_to_playlists_bulk(playlist_names, imageset_name)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'results': results})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            self.send_error(500, f"Error adding to playlists: {e}")
+        response = _dumps({'status': 'ok', 'results': results})
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error creating imageset")
     def _handle_create_imageset(self) -> None:
         """Create a new imageset with auto-generated prompt."""
-        try:
-            # Read the imageset name from request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
-            imageset_name = data.get('name', '').strip()
+        # Read the imageset name from request body
+        data = self._read_json()
+        if data is None:
+            return
+        imageset_name = (_str_field(data, 'name') or '').strip()
 
-            if not imageset_name:
-                self.send_error(400, "Missing imageset name")
-                return
+        if not imageset_name:
+            self.send_error(400, "Missing imageset name")
+            return
 
-            # Generate prompt based on name following Imagen best practices
-            # Extract the last part of the name (after the last slash if present)
-            name_parts = imageset_name.split('/')
-            base_name = name_parts[-1]
-
-            # Create a descriptive narrative prompt following Imagen best practices:
-            # - Use descriptive narratives, not just keywords
-            # - Include specific details about lighting, mood, composition
-            # - Use photography terminology for photorealistic images
-            # - Be explicit about aspect ratio and requirements
-            subject = base_name.replace('-', ' ').replace('_', ' ')
-            auto_prompt = (
-                f"A stunning photograph of {subject}, captured in cinematic lighting with professional composition. "
-                f"The scene features rich colors and detailed textures, shot with an 85mm lens for beautiful depth of field. "
-                f"Natural lighting creates a warm, inviting atmosphere. High-resolution photography with sharp focus on the subject. "
-                f"Vertical 9:16 aspect ratio, perfect for portrait orientation display."
-            )
+        # Generate prompt based on name following Imagen best practices
+        # Extract the last part of the name (after the last slash if present)
+        name_parts = imageset_name.split('/')
+        base_name = name_parts[-1]
 
-            # Get the prompt file path
-            content_dir = get_content_dir()
-            img_dir = content_dir / "img"
+        subject = base_name.translate(_SUBJECT_TRANSLATE)
+        auto_prompt = _AUTO_PROMPT_TEMPLATE % subject
 
-            if '/' in imageset_name:
-                # Playlist-specific imageset
-                playlist_dir = img_dir / name_parts[0]
-                playlist_dir.mkdir(parents=True, exist_ok=True)
-                prompt_file = playlist_dir / f"{base_name}.prompt.txt"
-            else:
-                # Screen-specific imageset (save in left directory)
-                left_dir = img_dir / "left"
-                left_dir.mkdir(parents=True, exist_ok=True)
-                prompt_file = left_dir / f"{imageset_name}.prompt.txt"
+        # Get the prompt file path
+        content_dir = get_content_dir()
+        img_dir = content_dir / "img"
+
+        if '/' in imageset_name:
+            # Playlist-specific imageset
+            playlist_dir = img_dir / name_parts[0]
+            playlist_dir.mkdir(parents=True, exist_ok=True)
+            prompt_file = playlist_dir / f"{base_name}.prompt.txt"
+        else:
+            # Screen-specific imageset (save in left directory)
+            left_dir = img_dir / "left"
+            left_dir.mkdir(parents=True, exist_ok=True)
+            prompt_file = left_dir / f"{imageset_name}.prompt.txt"
 
-            # Write the prompt file
-            prompt_content = f"Main prompt: {auto_prompt}\n\nScreen-specific prompts:\n  Left: {auto_prompt}\n  Center: {auto_prompt}\n  Right: {auto_prompt}\n"
-            prompt_file.write_text(prompt_content)
+        # Write the prompt file
+        prompt_content = _PROMPT_FILE_TEMPLATE % {'prompt': auto_prompt}
+        _write_file(prompt_file, prompt_content.encode())
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'name': imageset_name, 'prompt': auto_prompt})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error creating imageset: {e}")
+        response = _dumps({'status': 'ok', 'name': imageset_name, 'prompt': auto_prompt})
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error deleting imageset")
     def _handle_delete_imageset(self) -> None:
         """Delete an imageset and its files."""
-        try:
-            # Extract imageset name from path: /imageset/{name}
-            path_parts = self.path.split('/')
-            imageset_name = path_parts[2] if len(path_parts) > 2 else None
-
-            if not imageset_name:
-                self.send_error(400, "Missing imageset name")
-                return
+        # Extract imageset name from path: /imageset/{name}
+        imageset_name, _ = self._path_args()
 
-            # Decode URL-encoded imageset name
-            from urllib.parse import unquote
-            imageset_name = unquote(imageset_name)
+        if not imageset_name:
+            self.send_error(400, "Missing imageset name")
+            return
 
-            # Delete the imageset
-            if delete_imageset(imageset_name):
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response = json.dumps({'status': 'ok', 'deleted': imageset_name})
-                self.wfile.write(response.encode())
-            else:
-                self.send_error(404, f"Imageset not found: {imageset_name}")
-        except Exception as e:
-            self.send_error(500, f"Error deleting imageset: {e}")
+        # Delete the imageset
+        if delete_imageset(imageset_name):
+            response = _ok_response('deleted', imageset_name)
+            self._write_json_ok(response)
+        else:
+            self.send_error(404, f"Imageset not found: {imageset_name}")
 
+    @_json_endpoint("Error queueing image generation")
     def _handle_regenerate_image(self) -> None:
         """Queue a regeneration request for a single image."""
-        try:
-            # Parse path: /imageset/{name}/regenerate/{screen}
-            from urllib.parse import unquote
-
-            path_parts = self.path.split('/')
-            imageset_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
+        # Parse path: /imageset/{name}/regenerate/{screen}
+        imageset_name, screen = self._path_args()
 
-            if not imageset_name or not screen:
-                self._send_json_error(400, "Missing imageset name or screen")
-                return
-
-            if screen not in ['left', 'center', 'right']:
-                self._send_json_error(400, "Invalid screen name")
-                return
+        if not imageset_name or not screen:
+            self._send_json_error(400, "Missing imageset name or screen")
+            return
 
-            # Read prompt from request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
-                self._send_json_error(400, "No request body provided")
-                return
+        if screen not in _VALID_SCREENS:
+            self._send_json_error(400, "Invalid screen name")
+            return
 
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            prompt = data.get('prompt')
+        # Read prompt from request body
+        data = self._read_json()
+        if data is None:
+            return
+        prompt = _str_field(data, 'prompt')
 
-            if not prompt:
-                self._send_json_error(400, "No prompt provided in request")
-                return
+        if not prompt:
+            self._send_json_error(400, "No prompt provided in request")
+            return
 
-            # Generate UUIDs for the request and the content
-            request_uuid = storage.generate_uuid()
-            content_uuid = storage.generate_uuid()
+        # Generate UUIDs for the request and the content
+        request_uuid = storage.generate_uuid()
+        content_uuid = storage.generate_uuid()
 
-            # Create "generating" placeholder image
-            generating_placeholder = storage.get_assets_dir() / f"{storage.GENERATING_PLACEHOLDER_UUID}.png"
-            output_path = storage.get_assets_dir() / f"{content_uuid}.png"
-            if generating_placeholder.exists():
-                shutil.copy2(generating_placeholder, output_path)
-                # Also create a thumbnail for the placeholder
-                storage.create_thumbnail(content_uuid, output_path)
+        # Create "generating" placeholder image
+        storage.copy_placeholder(storage.GENERATING_PLACEHOLDER_UUID, content_uuid)
 
-            # Get or create asset group and add placeholder version
+        # Get or create asset group and add placeholder version
+        with _asset_group_lock(imageset_name):
             asset_group = get_asset_group(imageset_name)
             if not asset_group:
                 asset_group = AssetGroup(id=imageset_name)
@@ -1887,106 +2039,100 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
             screen_asset.add_version(version, set_as_current=True)
             save_asset_group(asset_group)
 
-            # Add to generation queue
-            db.add_to_generation_queue(request_uuid, imageset_name, screen, prompt, content_uuid)
+        # Add to generation queue
+        db.add_to_generation_queue(request_uuid, imageset_name, screen, prompt, content_uuid)
 
-            logging.info(f"[Queue] Added: {imageset_name}/{screen} (uuid={request_uuid})")
+        logging.info(f"[Queue] Added: {imageset_name}/{screen} (uuid={request_uuid})")
 
-            # Return immediately
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
-                'status': 'queued',
-                'screen': screen,
-                'request_uuid': request_uuid,
-                'content_uuid': content_uuid
-            })
-            self.wfile.write(response.encode())
-        except Exception as e:
-            logging.error(f"Error queueing image generation: {e}", exc_info=True)
-            self._send_json_error(500, f"Error queueing image generation: {e}")
+        # Return immediately
+        response = _dumps({
+            'status': 'queued',
+            'screen': screen,
+            'request_uuid': request_uuid,
+            'content_uuid': content_uuid
+        })
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error starting context regeneration")
     def _handle_regenerate_with_context(self) -> None:
         """Regenerate an image using the other two images as context (runs in background thread)."""
-        try:
-            from urllib.parse import unquote
-            from . import storage
-            import threading
 
-            path_parts = self.path.split('/')
-            asset_group_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
+        # Parse path: /asset-group/{name}/regenerate-with-context/{screen}
+        asset_group_name, screen = self._path_args()
 
-            if not asset_group_name or not screen:
-                self.send_error(400, "Missing asset group name or screen")
-                return
+        if not asset_group_name or not screen:
+            self.send_error(400, "Missing asset group name or screen")
+            return
 
-            if screen not in ['left', 'center', 'right']:
-                self.send_error(400, "Invalid screen name")
-                return
+        if screen not in _VALID_SCREENS:
+            self.send_error(400, "Invalid screen name")
+            return
 
-            # Read request body to get context screens
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            context_screens = data.get('contextScreens', [])
+        # Read request body to get context screens
+        data = self._read_json()
+        if data is None:
+            return
+        context_screens = data.get('contextScreens', [])
 
-            if len(context_screens) != 2:
-                self.send_error(400, "Expected exactly 2 context screens")
-                return
+        if not isinstance(context_screens, list) or len(context_screens) != 2:
+            self.send_error(400, "Expected exactly 2 context screens")
+            return
 
-            # Get asset group from database
-            asset_group = get_asset_group(asset_group_name)
-            if not asset_group:
-                self.send_error(404, f"Asset group '{asset_group_name}' not found")
-                return
+        if not all(isinstance(s, str) and s in _VALID_SCREENS for s in context_screens):
+            self.send_error(400, "Invalid context screen name")
+            return
 
-            screen_asset = getattr(asset_group, screen)
-            current_version = screen_asset.get_current_version()
-            if not current_version:
-                self.send_error(400, f"No current version found for {asset_group_name}/{screen}")
-                return
+        # Get asset group from database
+        asset_group = get_asset_group(asset_group_name)
+        if not asset_group:
+            self.send_error(404, f"Asset group '{asset_group_name}' not found")
+            return
+
+        screen_asset = getattr(asset_group, screen)
+        current_version = screen_asset.get_current_version()
+        if not current_version:
+            self.send_error(400, f"No current version found for {asset_group_name}/{screen}")
+            return
 
-            prompt = current_version.prompt
-            if not prompt:
-                self.send_error(400, f"No prompt found for {asset_group_name}/{screen}")
+        prompt = current_version.prompt
+        if not prompt:
+            self.send_error(400, f"No prompt found for {asset_group_name}/{screen}")
+            return
+
+        # Get paths to context images using UUID-based storage
+        context_images = {}
+        for ctx_screen in context_screens:
+            ctx_asset = getattr(asset_group, ctx_screen)
+            ctx_version = ctx_asset.get_current_version()
+            if not ctx_version:
+                self.send_error(404, f"No current version for context screen {ctx_screen}")
+                return
+            ctx_path = storage.get_file_path(ctx_version.content)
+            if not ctx_path or not ctx_path.exists():
+                self.send_error(404, f"Context image file not found for {ctx_screen}")
                 return
+            context_images[ctx_screen] = ctx_path
 
-            # Get paths to context images using UUID-based storage
-            context_images = {}
-            for ctx_screen in context_screens:
-                ctx_asset = getattr(asset_group, ctx_screen)
-                ctx_version = ctx_asset.get_current_version()
-                if not ctx_version:
-                    self.send_error(404, f"No current version for context screen {ctx_screen}")
-                    return
-                ctx_path = storage.get_file_path(ctx_version.content)
-                if not ctx_path or not ctx_path.exists():
-                    self.send_error(404, f"Context image file not found for {ctx_screen}")
-                    return
-                context_images[ctx_screen] = ctx_path
-
-            # Generate new UUID for output
-            new_uuid = storage.generate_uuid()
-
-            # Start background generation
-            def generate_in_background():
-                try:
-                    from triptic.imgen import generate_image_with_context
+        # Generate new UUID for output
+        new_uuid = storage.generate_uuid()
 
-                    logging.info(f"[BG] Starting context generation for {asset_group_name}/{screen}")
+        # Start background generation
+        def generate_in_background():
+            try:
+                from triptic.imgen import generate_image_with_context
 
-                    assets_dir = storage.get_assets_dir()
-                    output_path = assets_dir / f"{new_uuid}.png"
+                logging.info(f"[BG] Starting context generation for {asset_group_name}/{screen}")
 
-                    # Regenerate with context (this is the slow part)
-                    generate_image_with_context(prompt, output_path, screen, context_images)
+                assets_dir = storage.get_assets_dir()
+                output_path = assets_dir / f"{new_uuid}.png"
 
-                    # Create thumbnail
-                    storage.create_thumbnail(new_uuid, output_path)
+                # Regenerate with context (this is the slow part)
+                generate_image_with_context(prompt, output_path, screen, context_images)
 
+                # Create thumbnail
+                storage.create_thumbnail(new_uuid, output_path)
+
+                with _asset_group_lock(asset_group_name):
                     # Reload asset group to get fresh state
                     asset_group_fresh = get_asset_group(asset_group_name)
                     screen_asset_fresh = getattr(asset_group_fresh, screen)
@@ -2003,99 +2149,87 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
                     # Save to database
                     save_asset_group(asset_group_fresh)
 
-                    logging.info(f"[BG] Completed context generation for {asset_group_name}/{screen}")
-                except Exception as e:
-                    logging.error(f"[BG] Error generating {asset_group_name}/{screen} with context: {e}", exc_info=True)
-
-            # Start background thread
-            thread = threading.Thread(target=generate_in_background, daemon=True)
-            thread.start()
-
-            # Return immediately
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
-                'status': 'started',
-                'screen': screen,
-                'with_context': context_screens,
-                'uuid': new_uuid
-            })
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error starting context regeneration: {e}")
-
+                logging.info(f"[BG] Completed context generation for {asset_group_name}/{screen}")
+            except Exception as e:
+                logging.error(f"[BG] Error generating {asset_group_name}/{screen} with context: {e}", exc_info=True)
+
+        # Start background thread
+        thread = threading.Thread(target=generate_in_background, daemon=True)
+        thread.start()
+
+        # Return immediately
+        response = _dumps({
+            'status': 'started',
+            'screen': screen,
+            'with_context': context_screens,
+            'uuid': new_uuid
+        })
+        self._write_json_ok(response)
+
+    @_json_endpoint("Error starting image edit")
     def _handle_edit_image(self) -> None:
         """Edit an image using Gemini's edit_image API (runs in background thread)."""
-        try:
-            from urllib.parse import unquote
-            from . import storage
-            import threading
 
-            path_parts = self.path.split('/')
-            asset_group_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
+        asset_group_name, screen = self._path_args()
 
-            if not asset_group_name or not screen:
-                self.send_error(400, "Missing asset group name or screen")
-                return
+        if not asset_group_name or not screen:
+            self.send_error(400, "Missing asset group name or screen")
+            return
 
-            if screen not in ['left', 'center', 'right']:
-                self.send_error(400, "Invalid screen name")
-                return
+        if screen not in _VALID_SCREENS:
+            self.send_error(400, "Invalid screen name")
+            return
 
-            # Read the edit prompt from request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
-            edit_prompt = data.get('prompt', '')
+        # Read the edit prompt from request body
+        data = self._read_json()
+        if data is None:
+            return
+        edit_prompt = _str_field(data, 'prompt')
 
-            if not edit_prompt:
-                self.send_error(400, "Missing edit prompt")
-                return
+        if not edit_prompt:
+            self.send_error(400, "Missing edit prompt")
+            return
 
-            # Get asset group from database
-            asset_group = get_asset_group(asset_group_name)
-            if not asset_group:
-                self.send_error(404, f"Asset group '{asset_group_name}' not found")
-                return
+        # Get asset group from database
+        asset_group = get_asset_group(asset_group_name)
+        if not asset_group:
+            self.send_error(404, f"Asset group '{asset_group_name}' not found")
+            return
 
-            # Get the current version's image path
-            screen_asset = getattr(asset_group, screen)
-            current_version = screen_asset.get_current_version()
-            if not current_version:
-                self.send_error(404, f"No current version for {screen}")
-                return
+        # Get the current version's image path
+        screen_asset = getattr(asset_group, screen)
+        current_version = screen_asset.get_current_version()
+        if not current_version:
+            self.send_error(404, f"No current version for {screen}")
+            return
 
-            source_path = storage.get_file_path(current_version.content)
-            if not source_path or not source_path.exists():
-                self.send_error(404, "Source image file not found")
-                return
+        source_path = storage.get_file_path(current_version.content)
+        if not source_path or not source_path.exists():
+            self.send_error(404, "Source image file not found")
+            return
 
-            original_prompt = current_version.prompt
+        original_prompt = current_version.prompt
 
-            # Generate new UUID for edited image
-            new_uuid = storage.generate_uuid()
+        # Generate new UUID for edited image
+        new_uuid = storage.generate_uuid()
 
-            # Start background editing
-            def edit_in_background():
-                try:
-                    from triptic.imgen import edit_image_with_gemini
+        # Start background editing
+        def edit_in_background():
+            try:
+                from triptic.imgen import edit_image_with_gemini
 
-                    logging.info(f"[BG] Starting edit for {asset_group_name}/{screen}")
+                logging.info(f"[BG] Starting edit for {asset_group_name}/{screen}")
 
-                    assets_dir = storage.get_assets_dir()
-                    output_path = assets_dir / f"{new_uuid}.png"
+                assets_dir = storage.get_assets_dir()
+                output_path = assets_dir / f"{new_uuid}.png"
 
-                    # Edit the image (this is the slow part)
-                    edit_image_with_gemini(edit_prompt, source_path, output_path)
+                # Edit the image (this is the slow part)
+                edit_image_with_gemini(edit_prompt, source_path, output_path)
 
-                    # Create thumbnail
-                    storage.create_thumbnail(new_uuid, output_path)
+                # Create thumbnail
+                storage.create_thumbnail(new_uuid, output_path)
 
+                with _asset_group_lock(asset_group_name):
                     # Reload asset group to get fresh state
                     asset_group_fresh = get_asset_group(asset_group_name)
                     screen_asset_fresh = getattr(asset_group_fresh, screen)
@@ -2113,75 +2247,61 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
                     # Save to database
                     save_asset_group(asset_group_fresh)
 
-                    logging.info(f"[BG] Completed edit for {asset_group_name}/{screen}")
-                except Exception as e:
-                    logging.error(f"[BG] Error editing {asset_group_name}/{screen}: {e}", exc_info=True)
+                logging.info(f"[BG] Completed edit for {asset_group_name}/{screen}")
+            except Exception as e:
+                logging.error(f"[BG] Error editing {asset_group_name}/{screen}: {e}", exc_info=True)
 
-            # Start background thread
-            thread = threading.Thread(target=edit_in_background, daemon=True)
-            thread.start()
+        # Start background thread
+        thread = threading.Thread(target=edit_in_background, daemon=True)
+        thread.start()
 
-            # Return immediately
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
-                'status': 'started',
-                'screen': screen,
-                'uuid': new_uuid
-            })
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error starting image edit: {e}")
+        # Return immediately
+        response = _dumps({
+            'status': 'started',
+            'screen': screen,
+            'uuid': new_uuid
+        })
+        self._write_json_ok(response)
 
+    @_json_endpoint("Error uploading image")
     def _handle_upload_image(self) -> None:
         """Upload an image for a screen, creating a new version."""
-        try:
-            from urllib.parse import unquote
-            import uuid
-            from . import storage
 
-            # Parse path: /asset-group/{name}/upload/{screen}
-            path_parts = self.path.split('/')
-            asset_group_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
+        # Parse path: /asset-group/{name}/upload/{screen}
+        asset_group_name, screen = self._path_args()
 
-            if not asset_group_name or not screen:
-                self.send_error(400, "Missing asset group name or screen")
-                return
+        if not asset_group_name or not screen:
+            self.send_error(400, "Missing asset group name or screen")
+            return
 
-            if screen not in ['left', 'center', 'right']:
-                self.send_error(400, "Invalid screen name")
-                return
+        if screen not in _VALID_SCREENS:
+            self.send_error(400, "Invalid screen name")
+            return
 
-            # Read the uploaded image data
-            content_length = int(self.headers.get('Content-Length', 0))
-            image_data = self.rfile.read(content_length)
+        # Create a new UUID for the uploaded image
+        new_uuid = str(uuid.uuid4())
+        assets_dir = storage.get_assets_dir()
+        new_path = assets_dir / f"{new_uuid}.png"
 
-            if not image_data:
-                self.send_error(400, "No image data received")
-                return
+        # Stream the uploaded image straight to disk
+        size = self._read_body_to_file(new_path)
+        if size is None:
+            return
+
+        if not size:
+            self.send_error(400, "No image data received")
+            return
+
+        # Create thumbnail
+        storage.create_thumbnail(new_uuid, new_path)
 
+        with _asset_group_lock(asset_group_name):
             # Get or create asset group from database
             asset_group = get_asset_group(asset_group_name)
             if not asset_group:
                 # Create new asset group if it doesn't exist
                 asset_group = AssetGroup(id=asset_group_name)
 
-            # Create a new UUID for the uploaded image
-            new_uuid = str(uuid.uuid4())
-            assets_dir = storage.get_assets_dir()
-            new_path = assets_dir / f"{new_uuid}.png"
-
-            # Save the uploaded image
-            new_path.write_bytes(image_data)
-
-            # Create thumbnail
-            storage.create_thumbnail_from_bytes(new_uuid, image_data)
-
             # Create a new version for the screen
             screen_asset = getattr(asset_group, screen)
             new_version = AssetVersion(
@@ -2195,96 +2315,80 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
             # Save to database
             save_asset_group(asset_group)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
-                'status': 'ok',
-                'uploaded': screen,
-                'new_uuid': new_uuid,
-                'image_url': f'/content/assets/{new_uuid}.png'
-            })
-            self.wfile.write(response.encode())
+        response = _dumps({
+            'status': 'ok',
+            'uploaded': screen,
+            'new_uuid': new_uuid,
+            'image_url': f'/content/assets/{new_uuid}.png'
+        })
+        self._write_json_ok(response)
 
-            logging.info(f"Uploaded image to {screen} for '{asset_group_name}', created version {new_uuid}")
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error uploading image: {e}")
+        logging.info(f"Uploaded image to {screen} for '{asset_group_name}', created version {new_uuid}")
 
+    @_json_endpoint("Error uploading video")
     def _handle_upload_video(self) -> None:
         """Upload a video for a screen, creating a new version."""
-        try:
-            from urllib.parse import unquote
-            import uuid
-            from . import storage
 
-            # Parse path: /asset-group/{name}/upload-video/{screen}
-            path_parts = self.path.split('/')
-            asset_group_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
+        # Parse path: /asset-group/{name}/upload-video/{screen}
+        asset_group_name, screen = self._path_args()
 
-            if not asset_group_name or not screen:
-                self.send_error(400, "Missing asset group name or screen")
-                return
+        if not asset_group_name or not screen:
+            self.send_error(400, "Missing asset group name or screen")
+            return
 
-            if screen not in ['left', 'center', 'right']:
-                self.send_error(400, "Invalid screen name")
-                return
+        if screen not in _VALID_SCREENS:
+            self.send_error(400, "Invalid screen name")
+            return
 
-            # Read the uploaded video data
-            content_length = int(self.headers.get('Content-Length', 0))
-            video_data = self.rfile.read(content_length)
+        # Create a new UUID for the uploaded video
+        new_uuid = str(uuid.uuid4())
+        assets_dir = storage.get_assets_dir()
+        video_path = assets_dir / f"{new_uuid}.mp4"
 
-            if not video_data:
-                self.send_error(400, "No video data received")
-                return
+        # Stream the uploaded video straight to disk
+        size = self._read_body_to_file(video_path)
+        if size is None:
+            return
 
+        if not size:
+            self.send_error(400, "No video data received")
+            return
+
+        # Extract first frame as thumbnail/preview image
+        try:
+            png_path = assets_dir / f"{new_uuid}.png"
+            # Use ffmpeg to extract first frame
+            subprocess.run([
+                'ffmpeg', '-i', str(video_path), '-vframes', '1',
+                '-f', 'image2', str(png_path), '-y'
+            ], capture_output=True, check=True)
+            # Create thumbnail from the extracted frame
+            if png_path.exists():
+                storage.create_thumbnail(new_uuid)
+        except Exception as thumb_err:
+            logging.warning(f"Could not create video thumbnail: {thumb_err}")
+
+        # Create GIF version for old browsers that can't play HTML5 video
+        try:
+            gif_path = assets_dir / f"{new_uuid}.gif"
+            logging.info(f"Creating GIF from video: {video_path} -> {gif_path}")
+            # Convert to optimized GIF (320px width, 30fps, 128 colors for smooth playback)
+            subprocess.run([
+                'ffmpeg', '-i', str(video_path),
+                '-vf', 'fps=30,scale=320:-1:flags=lanczos,split[s0][s1];[s0]palettegen=max_colors=128[p];[s1][p]paletteuse=dither=bayer',
+                str(gif_path), '-y'
+            ], capture_output=True, check=True)
+            logging.info(f"Created GIF: {gif_path} ({gif_path.stat().st_size} bytes)")
+        except Exception as gif_err:
+            logging.warning(f"Could not create GIF from video: {gif_err}")
+
+        with _asset_group_lock(asset_group_name):
             # Get or create asset group from database
             asset_group = get_asset_group(asset_group_name)
             if not asset_group:
                 # Create new asset group if it doesn't exist
                 asset_group = AssetGroup(id=asset_group_name)
 
-            # Create a new UUID for the uploaded video
-            new_uuid = str(uuid.uuid4())
-            assets_dir = storage.get_assets_dir()
-            video_path = assets_dir / f"{new_uuid}.mp4"
-
-            # Save the uploaded video
-            video_path.write_bytes(video_data)
-
-            # Extract first frame as thumbnail/preview image
-            try:
-                import subprocess
-                png_path = assets_dir / f"{new_uuid}.png"
-                # Use ffmpeg to extract first frame
-                subprocess.run([
-                    'ffmpeg', '-i', str(video_path), '-vframes', '1',
-                    '-f', 'image2', str(png_path), '-y'
-                ], capture_output=True, check=True)
-                # Create thumbnail from the extracted frame
-                if png_path.exists():
-                    storage.create_thumbnail(new_uuid)
-            except Exception as thumb_err:
-                logging.warning(f"Could not create video thumbnail: {thumb_err}")
-
-            # Create GIF version for old browsers that can't play HTML5 video
-            try:
-                import subprocess
-                gif_path = assets_dir / f"{new_uuid}.gif"
-                logging.info(f"Creating GIF from video: {video_path} -> {gif_path}")
-                # Convert to optimized GIF (320px width, 30fps, 128 colors for smooth playback)
-                subprocess.run([
-                    'ffmpeg', '-i', str(video_path),
-                    '-vf', 'fps=30,scale=320:-1:flags=lanczos,split[s0][s1];[s0]palettegen=max_colors=128[p];[s1][p]paletteuse=dither=bayer',
-                    str(gif_path), '-y'
-                ], capture_output=True, check=True)
-                logging.info(f"Created GIF: {gif_path} ({gif_path.stat().st_size} bytes)")
-            except Exception as gif_err:
-                logging.warning(f"Could not create GIF from video: {gif_err}")
-
             # Create a new version for the screen
             screen_asset = getattr(asset_group, screen)
             new_version = AssetVersion(
@@ -2300,52 +2404,39 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
             # Save to database
             save_asset_group(asset_group)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
-                'status': 'ok',
-                'uploaded': screen,
-                'new_uuid': new_uuid,
-                'video_url': f'/content/assets/{new_uuid}.mp4',
-                'image_url': f'/content/assets/{new_uuid}.png'
-            })
-            self.wfile.write(response.encode())
+        response = _dumps({
+            'status': 'ok',
+            'uploaded': screen,
+            'new_uuid': new_uuid,
+            'video_url': f'/content/assets/{new_uuid}.mp4',
+            'image_url': f'/content/assets/{new_uuid}.png'
+        })
+        self._write_json_ok(response)
 
-            logging.info(f"Uploaded video to {screen} for '{asset_group_name}', created version {new_uuid}")
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error uploading video: {e}")
+        logging.info(f"Uploaded video to {screen} for '{asset_group_name}', created version {new_uuid}")
 
+    @_json_endpoint("Error uploading image from URL")
     def _handle_upload_from_url(self) -> None:
         """Upload an image from a URL for a screen, creating a new version."""
         try:
-            from urllib.parse import unquote
-            import uuid
-            import urllib.request
-            from . import storage
 
             # Parse path: /asset-group/{name}/upload-from-url/{screen}
-            path_parts = self.path.split('/')
-            asset_group_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
+            asset_group_name, screen = self._path_args()
 
             if not asset_group_name or not screen:
                 self.send_error(400, "Missing asset group name or screen")
                 return
 
-            if screen not in ['left', 'center', 'right']:
+            if screen not in _VALID_SCREENS:
                 self.send_error(400, "Invalid screen name")
                 return
 
             # Read the JSON body with URL
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode('utf-8'))
+            data = self._read_json()
+            if data is None:
+                return
 
-            image_url = data.get('url')
+            image_url = _str_field(data, 'url')
             prompt = data.get('prompt', f'Uploaded from URL: {image_url}')
 
             if not image_url:
@@ -2365,12 +2456,6 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
                 self.send_error(400, "Failed to fetch image from URL")
                 return
 
-            # Get or create asset group from database
-            asset_group = get_asset_group(asset_group_name)
-            if not asset_group:
-                # Create new asset group if it doesn't exist
-                asset_group = AssetGroup(id=asset_group_name)
-
             # Create a new UUID for the uploaded image
             new_uuid = str(uuid.uuid4())
             assets_dir = storage.get_assets_dir()
@@ -2382,203 +2467,176 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
             # Create thumbnail
             storage.create_thumbnail_from_bytes(new_uuid, image_data)
 
-            # Create a new version for the screen
-            screen_asset = getattr(asset_group, screen)
-            new_version = AssetVersion(
-                version_uuid=new_uuid,
-                content=new_uuid,
-                prompt=prompt,
-                timestamp=datetime.now().isoformat()
-            )
-            screen_asset.add_version(new_version, set_as_current=True)
+            with _asset_group_lock(asset_group_name):
+                # Get or create asset group from database
+                asset_group = get_asset_group(asset_group_name)
+                if not asset_group:
+                    # Create new asset group if it doesn't exist
+                    asset_group = AssetGroup(id=asset_group_name)
 
-            # Save to database
-            save_asset_group(asset_group)
+                # Create a new version for the screen
+                screen_asset = getattr(asset_group, screen)
+                new_version = AssetVersion(
+                    version_uuid=new_uuid,
+                    content=new_uuid,
+                    prompt=prompt,
+                    timestamp=datetime.now().isoformat()
+                )
+                screen_asset.add_version(new_version, set_as_current=True)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
+                # Save to database
+                save_asset_group(asset_group)
+
+            response = _dumps({
                 'status': 'ok',
                 'uploaded': screen,
                 'new_uuid': new_uuid,
                 'image_url': f'/content/assets/{new_uuid}.png',
                 'source_url': image_url
             })
-            self.wfile.write(response.encode())
+            self._write_json_ok(response)
 
             logging.info(f"Uploaded image from URL to {screen} for '{asset_group_name}', created version {new_uuid}")
         except urllib.error.URLError as e:
             logging.error(f"Error fetching image from URL: {e}")
             self.send_error(400, f"Error fetching image from URL: {e}")
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error uploading image from URL: {e}")
 
+    @_json_endpoint("Error starting video generation")
     def _handle_generate_video(self) -> None:
         """Generate a video from an image using Google Veo API (async)."""
-        try:
-            from urllib.parse import unquote
-            from . import storage
 
-            path_parts = self.path.split('/')
-            asset_group_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
-
-            if not asset_group_name or not screen:
-                self.send_error(400, "Missing asset group name or screen")
-                return
+        asset_group_name, screen = self._path_args()
 
-            if screen not in ['left', 'center', 'right']:
-                self.send_error(400, "Invalid screen name")
-                return
+        if not asset_group_name or not screen:
+            self.send_error(400, "Missing asset group name or screen")
+            return
 
-            # Get asset group from database
-            asset_group = get_asset_group(asset_group_name)
-            if not asset_group:
-                self.send_error(404, f"Asset group '{asset_group_name}' not found")
-                return
+        if screen not in _VALID_SCREENS:
+            self.send_error(400, "Invalid screen name")
+            return
 
-            # Get the current version's image path
-            screen_asset = getattr(asset_group, screen)
-            current_version = screen_asset.get_current_version()
-            if not current_version:
-                self.send_error(404, f"No current version for {screen}")
-                return
+        # Get asset group from database
+        asset_group = get_asset_group(asset_group_name)
+        if not asset_group:
+            self.send_error(404, f"Asset group '{asset_group_name}' not found")
+            return
 
-            image_path = storage.get_file_path(current_version.content)
-            if not image_path or not image_path.exists():
-                self.send_error(404, "Image file not found")
-                return
+        # Get the current version's image path
+        screen_asset = getattr(asset_group, screen)
+        current_version = screen_asset.get_current_version()
+        if not current_version:
+            self.send_error(404, f"No current version for {screen}")
+            return
 
-            # Determine video output path (use same UUID with .mp4 extension)
-            assets_dir = storage.get_assets_dir()
-            video_path = assets_dir / f"{current_version.content}.mp4"
-
-            # Create a unique job ID for this video generation
-            import uuid
-            job_id = str(uuid.uuid4())
-
-            # Store job status
-            video_jobs[job_id] = {
-                'status': 'processing',
-                'asset_group': asset_group_name,
-                'screen': screen,
-                'video_path': video_path,
-                'error': None
-            }
+        image_path = storage.get_file_path(current_version.content)
+        if not image_path or not image_path.exists():
+            self.send_error(404, "Image file not found")
+            return
 
-            logging.info(f"Starting async video generation for {asset_group_name} {screen} screen (job: {job_id})")
+        # Determine video output path (use same UUID with .mp4 extension)
+        assets_dir = storage.get_assets_dir()
+        video_path = assets_dir / f"{current_version.content}.mp4"
 
-            # Start video generation in background thread
-            import threading
-            def generate_video_async():
-                try:
-                    from triptic.imgen import generate_video_from_image
-                    result_path = generate_video_from_image(image_path, video_path)
+        # Create a unique job ID for this video generation
+        job_id = str(uuid.uuid4())
 
-                    # Update job status
-                    content_dir = get_content_dir()
-                    video_relative = result_path.relative_to(content_dir.parent)
-                    video_url = f"/{video_relative}"
+        # Store job status
+        add_video_job(job_id, {
+            'status': 'processing',
+            'asset_group': asset_group_name,
+            'screen': screen,
+            'video_path': str(video_path),
+            'error': None
+        })
 
-                    video_jobs[job_id]['status'] = 'complete'
-                    video_jobs[job_id]['video_url'] = video_url
-                    logging.info(f"Video generation complete for job {job_id}")
-                except Exception as e:
-                    logging.error(f"Video generation failed for job {job_id}: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    video_jobs[job_id]['status'] = 'error'
-                    video_jobs[job_id]['error'] = str(e)
-
-            thread = threading.Thread(target=generate_video_async, daemon=True)
-            thread.start()
-
-            # Return immediately with job ID
-            self.send_response(202)  # 202 Accepted
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'processing', 'job_id': job_id})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error starting video generation: {e}")
+        logging.info(f"Starting async video generation for {asset_group_name} {screen} screen (job: {job_id})")
 
-    def _handle_get_video_job_status(self) -> None:
-        """Get the status of a video generation job."""
-        try:
-            # Parse path: /video-job/{job_id}
-            job_id = self.path.split('/')[-1]
+        # Queue video generation on the video worker pool
+        def generate_video_async():
+            try:
+                from triptic.imgen import generate_video_from_image
+                result_path = generate_video_from_image(image_path, video_path)
+                # video_url in the group's row is derived from the .mp4 on disk
+                invalidate_asset_group_cache(asset_group_name)
+
+                # Update job status
+                content_dir = get_content_dir()
+                video_relative = result_path.relative_to(content_dir.parent)
+                video_url = f"/{video_relative.as_posix()}"
+
+                update_video_job(job_id, status='complete', video_url=video_url)
+                logging.info(f"Video generation complete for job {job_id}")
+            except Exception as e:
+                logging.exception(f"Video generation failed for job {job_id}: {e}")
+                update_video_job(job_id, status='error', error=str(e))
 
-            if job_id not in video_jobs:
-                self.send_error(404, "Job not found")
-                return
+        _video_pool.submit(generate_video_async)
 
-            job = video_jobs[job_id]
+        # Return immediately with job ID
+        self._write_json(202, _dumps({'status': 'processing', 'job_id': job_id}))
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+    @_json_endpoint("Error getting job status")
+    def _handle_get_video_job_status(self) -> None:
+        """Get the status of a video generation job."""
+        # Parse path: /video-job/{job_id}
+        job_id, _ = self._path_args()
 
-            response_data = {
-                'status': job['status'],
-                'imageset': job['imageset'],
-                'screen': job['screen']
-            }
+        job = get_video_job(job_id)
+        if job is None:
+            self.send_error(404, "Job not found")
+            return
+
+        response_data = {
+            'status': job['status'],
+            'imageset': job['asset_group'],
+            'screen': job['screen']
+        }
 
-            if job['status'] == 'complete':
-                response_data['video_url'] = job['video_url']
-            elif job['status'] == 'error':
-                response_data['error'] = job['error']
+        if job['status'] == 'complete':
+            response_data['video_url'] = job['video_url']
+        elif job['status'] == 'error':
+            response_data['error'] = job['error']
 
-            self.wfile.write(json.dumps(response_data).encode())
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error getting job status: {e}")
+        self._write_json_ok(_dumps(response_data))
 
+    @_json_endpoint("Error serving asset file")
     def _handle_get_asset_file(self) -> None:
         """Serve asset files from the assets directory."""
-        try:
-            # Extract filename from path: /content/assets/{uuid}.{ext}
-            # Strip query parameters (e.g., ?t=timestamp) if present
-            path_without_query = self.path.split('?')[0]
-            filename = path_without_query.split('/')[-1]
-
-            # Get the file from storage
-            assets_dir = storage.get_assets_dir()
-            file_path = assets_dir / filename
-
-            if not file_path.exists():
-                logging.debug(f"Asset not found: {file_path}")
-                self.send_error(404, "Asset not found")
-                return
+        # Extract filename from path: /content/assets/{uuid}.{ext}
+        # Strip query parameters (e.g., ?t=timestamp) if present
+        path_without_query = self.path.split('?')[0]
+        filename = path_without_query.split('/')[-1]
+
+        # Get the file from storage
+        assets_dir = storage.get_assets_dir()
+        file_path = assets_dir / filename
+
+        if not file_path.exists():
+            logging.debug(f"Asset not found: {file_path}")
+            self.send_error(404, "Asset not found")
+            return
 
-            # Generate ETag from filename (UUID is unique per content)
-            # Strip extension to get just the UUID part
-            etag = f'"{filename.rsplit(".", 1)[0]}"'
+        # Generate ETag from filename (UUID is unique per content)
+        # Strip extension to get just the UUID part
+        etag = f'"{filename.rsplit(".", 1)[0]}"'
 
-            # Check If-None-Match header for conditional request
-            if_none_match = self.headers.get('If-None-Match')
-            if if_none_match and if_none_match == etag:
-                self.send_response(304)
-                self.end_headers()
-                return
+        # Check If-None-Match header for conditional request
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match and if_none_match == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
 
-            # Determine content type
-            import mimetypes
-            content_type, _ = mimetypes.guess_type(str(file_path))
-            if content_type is None:
-                content_type = 'application/octet-stream'
+        # Determine content type
+        content_type = _ASSET_CONTENT_TYPES.get(file_path.suffix.lower())
+        if content_type is None:
+            content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
 
+        # Open before sending any headers so a failure (e.g. the name is a
+        # directory) can still be reported as an error response
+        with open(file_path, 'rb') as f:
             # Get file size for Content-Length
-            file_size = file_path.stat().st_size
+            file_size = os.fstat(f.fileno()).st_size
 
             # Send the file with long cache (UUID-based files are immutable)
             self.send_response(200)
@@ -2589,106 +2647,78 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
 
-            with open(file_path, 'rb') as f:
-                self.wfile.write(f.read())
-
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error serving asset file: {e}")
+            self._send_file_body(f, file_size)
 
+    @_json_endpoint("Error reordering playlist")
     def _handle_reorder_playlist(self) -> None:
         """Reorder imagesets in a playlist."""
-        try:
-            # Parse path: /playlists/{name}/reorder
-            from urllib.parse import unquote
-            path_parts = self.path.split('/')
-            playlist_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
+        # Parse path: /playlists/{name}/reorder
+        playlist_name, _ = self._path_args()
 
-            if not playlist_name:
-                self._send_json_error(400, "Missing playlist name")
-                return
+        if not playlist_name:
+            self._send_json_error(400, "Missing playlist name")
+            return
 
-            # Read the new order from request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            new_order = data.get('order', [])
+        # Read the new order from request body
+        data = self._read_json()
+        if data is None:
+            return
+        new_order = data.get('order', [])
 
-            if not isinstance(new_order, list):
-                self._send_json_error(400, "Invalid order format")
-                return
+        if not isinstance(new_order, list):
+            self._send_json_error(400, "Invalid order format")
+            return
 
-            # Update the playlist order
-            if reorder_playlist(playlist_name, new_order):
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response = json.dumps({'status': 'ok', 'playlist': playlist_name})
-                self.wfile.write(response.encode())
-            else:
-                self._send_json_error(404, f"Playlist not found: {playlist_name}")
-        except Exception as e:
-            self._send_json_error(500, f"Error reordering playlist: {e}")
+        # Update the playlist order
+        if reorder_playlist(playlist_name, new_order):
+            response = _ok_response('playlist', playlist_name)
+            self._write_json_ok(response)
+        else:
+            self._send_json_error(404, f"Playlist not found: {playlist_name}")
 
+    @_json_endpoint("Error removing from playlist")
     def _handle_remove_from_playlist(self) -> None:
         """Remove an asset group from a playlist."""
-        try:
-            # Parse path: /playlists/{name}/remove
-            from urllib.parse import unquote
-            path_parts = self.path.split('/')
-            playlist_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
+        # Parse path: /playlists/{name}/remove
+        playlist_name, _ = self._path_args()
 
-            if not playlist_name:
-                self._send_json_error(400, "Missing playlist name")
-                return
+        if not playlist_name:
+            self._send_json_error(400, "Missing playlist name")
+            return
 
-            # Read the asset ID from request body (support 'asset_group', 'asset', and 'imageset' for compatibility)
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
-            asset_id = data.get('asset_group') or data.get('asset') or data.get('imageset')
+        # Read the asset ID from request body (support 'asset_group', 'asset', and 'imageset' for compatibility)
+        data = self._read_json()
+        if data is None:
+            return
+        asset_id = _str_field(data, 'asset_group') or _str_field(data, 'asset') or _str_field(data, 'imageset')
 
-            if not asset_id:
-                self._send_json_error(400, "Missing asset ID")
-                return
+        if not asset_id:
+            self._send_json_error(400, "Missing asset ID")
+            return
 
-            # Remove from playlist
-            if remove_from_playlist(playlist_name, asset_id):
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response = json.dumps({'status': 'ok', 'removed': asset_id})
-                self.wfile.write(response.encode())
-            else:
-                self._send_json_error(404, f"Playlist or asset not found")
-        except Exception as e:
-            self._send_json_error(500, f"Error removing from playlist: {e}")
+        # Remove from playlist
+        if remove_from_playlist(playlist_name, asset_id):
+            response = _ok_response('removed', asset_id)
+            self._write_json_ok(response)
+        else:
+            self._send_json_error(404, f"Playlist or asset not found")
 
+    @_json_endpoint("Error flipping image")
     def _handle_flip_image(self) -> None:
         """Flip an image horizontally and create a new version."""
-        try:
-            from urllib.parse import unquote
-            from PIL import Image
-            from io import BytesIO
-            import uuid
-            from . import storage
 
-            # Parse path: /asset-group/{name}/flip/{screen}
-            path_parts = self.path.split('/')
-            imageset_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
+        # Parse path: /asset-group/{name}/flip/{screen}
+        imageset_name, screen = self._path_args()
 
-            if not imageset_name or not screen:
-                self.send_error(400, "Missing asset group name or screen")
-                return
+        if not imageset_name or not screen:
+            self.send_error(400, "Missing asset group name or screen")
+            return
 
-            if screen not in ['left', 'center', 'right']:
-                self.send_error(400, "Invalid screen name")
-                return
+        if screen not in _VALID_SCREENS:
+            self.send_error(400, "Invalid screen name")
+            return
 
+        with _asset_group_lock(imageset_name):
             # Get asset group from database
             logging.info(f"Flip: Looking for asset group '{imageset_name}'")
             asset_group = get_asset_group(imageset_name)
@@ -2701,26 +2731,11 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
             logging.info(f"Flip: Asset group found, getting {screen} asset")
             screen_asset = getattr(asset_group, screen)
 
-            # Use the same logic as get_displayable_images to find which version to flip
-            # First try current_version_uuid, then fall back to versions[0]
-            content_uuid = None
-            current_version = None
-
-            # Try to find current version
-            if screen_asset.current_version_uuid and screen_asset.versions:
-                logging.info(f"Flip: Looking for current version UUID {screen_asset.current_version_uuid}")
-                for version in screen_asset.versions:
-                    if version.version_uuid == screen_asset.current_version_uuid:
-                        content_uuid = version.content
-                        current_version = version
-                        logging.info(f"Flip: Found current version, content UUID: {content_uuid}")
-                        break
-
-            # If no matching version found, use first version (same as get_displayable_images)
-            if not content_uuid and screen_asset.versions:
-                content_uuid = screen_asset.versions[0].content
-                current_version = screen_asset.versions[0]
-                logging.info(f"Flip: Using first version (index 0), content UUID: {content_uuid}")
+            # Same rule as get_displayable_images: the version matching
+            # current_version_uuid, falling back to versions[0]
+            current_version = screen_asset.get_current_version()
+            content_uuid = current_version.content if current_version else None
+            logging.info(f"Flip: Current version content UUID: {content_uuid}")
 
             if not content_uuid:
                 logging.error(f"Flip: No versions available for {screen}")
@@ -2736,18 +2751,25 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
 
             logging.info(f"Flip: All checks passed, flipping image at {image_path}")
 
-            # Flip the image
-            img = Image.open(image_path)
-            flipped = img.transpose(Image.FLIP_LEFT_RIGHT)
-
-            # Save as new version with new UUID
             new_uuid = str(uuid.uuid4())
             assets_dir = storage.get_assets_dir()
             new_path = assets_dir / f"{new_uuid}{image_path.suffix}"
-            flipped.save(new_path)
 
-            # Create thumbnail
-            storage.create_thumbnail(new_uuid, new_path)
+            with _image_work_slots:
+                # Flip the image
+                with Image.open(image_path) as img:
+                    flipped = img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+
+                # Save as new version with new UUID. zlib dominates PNG
+                # save time, and level 1 is several times faster than the
+                # default for slightly larger files.
+                if image_path.suffix.lower() == '.png':
+                    flipped.save(new_path, compress_level=1)
+                else:
+                    flipped.save(new_path)
+
+                # Create thumbnail by mirroring the source's
+                storage.create_flipped_thumbnail(content_uuid, new_uuid)
 
             # Copy the prompt from the flipped version
             prompt = current_version.prompt if current_version else ""
@@ -2764,32 +2786,21 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
             # Save to database
             save_asset_group(asset_group)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'flipped': screen, 'new_uuid': new_uuid})
-            self.wfile.write(response.encode())
+        response = _dumps({'status': 'ok', 'flipped': screen, 'new_uuid': new_uuid})
+        self._write_json_ok(response)
 
-            logging.info(f"Flipped {screen} image for '{imageset_name}', created version {new_uuid}")
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error flipping image: {e}")
+        logging.info(f"Flipped {screen} image for '{imageset_name}', created version {new_uuid}")
 
+    @_json_endpoint("Error getting image versions")
     def _handle_get_image_versions(self) -> None:
         """Get available version numbers and current version for an image."""
         try:
             # Parse path: /asset-group/{name}/versions/{screen}
-            from urllib.parse import unquote
-            from . import storage
 
-            path_parts = self.path.split('/')
-            imageset_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
+            imageset_name, screen = self._path_args()
 
             assert imageset_name and screen, "Missing asset group name or screen"
-            assert screen in ['left', 'center', 'right'], f"Invalid screen: {screen}"
+            assert screen in _VALID_SCREENS, f"Invalid screen: {screen}"
 
             # Get asset group from database
             asset_group = get_asset_group(imageset_name)
@@ -2814,12 +2825,7 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
                     versions = list(range(1, version_count + 1))
 
                     # Find which version number corresponds to the current UUID
-                    current_uuid = screen_asset.current_version_uuid
-                    current_index = None
-                    for i, v in enumerate(screen_asset.versions):
-                        if v.version_uuid == current_uuid:
-                            current_index = i
-                            break
+                    current_index = screen_asset.index_of(screen_asset.current_version_uuid)
 
                     # Map array index to version number (1-N)
                     # Index 0 = version 1, index 1 = version 2, etc.
@@ -2829,41 +2835,33 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
                         # Fallback: oldest version (version 1)
                         current_version = 1
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
+            response = _dumps({
                 'versions': versions,
                 'current': current_version
             })
-            self.wfile.write(response.encode())
+            self._write_json_ok(response)
         except AssertionError as e:
             self._send_json_error(400, str(e))
-        except Exception as e:
-            self._send_json_error(500, f"Error getting image versions: {e}")
 
+    @_json_endpoint("Error restoring image version")
     def _handle_restore_image_version(self) -> None:
         """Restore a specific version of an image."""
         try:
             # Parse path: /asset-group/{name}/version/{screen}
-            from urllib.parse import unquote
-            path_parts = self.path.split('/')
-            imageset_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
+            imageset_name, screen = self._path_args()
 
             if not imageset_name or not screen:
                 self._send_json_error(400, "Missing asset group name or screen")
                 return
 
-            if screen not in ['left', 'center', 'right']:
+            if screen not in _VALID_SCREENS:
                 self._send_json_error(400, "Invalid screen name")
                 return
 
             # Read request body to get version number
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body.decode())
+            data = self._read_json()
+            if data is None:
+                return
             version = data.get('version')
 
             if version is None:
@@ -2872,97 +2870,68 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
 
             # Set the version as current (database only)
             if restore_image_version(imageset_name, screen, version):
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response = json.dumps({'status': 'ok', 'version': version})
-                self.wfile.write(response.encode())
+                response = _dumps({'status': 'ok', 'version': version})
+                self._write_json_ok(response)
             else:
                 self._send_json_error(500, "Failed to set current version")
         except AssertionError as e:
             self._send_json_error(404, str(e))
-        except Exception as e:
-            self._send_json_error(500, f"Error restoring image version: {e}")
 
+    @_json_endpoint("Error deleting image version")
     def _handle_delete_image_version(self) -> None:
         """Delete the current version of an image."""
         try:
             # Parse path: /asset-group/{name}/delete-version/{screen}
-            from urllib.parse import unquote
-            import traceback
-
-            logging.info(f"[DELETE_VERSION] ========== HANDLER CALLED ==========")
-            logging.info(f"[DELETE_VERSION] Request path: {self.path}")
-
-            path_parts = self.path.split('/')
-            logging.info(f"[DELETE_VERSION] Path parts: {path_parts}")
-
-            imageset_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-            screen = path_parts[4] if len(path_parts) > 4 else None
-
-            logging.info(f"[DELETE_VERSION] Asset group: {imageset_name}, Screen: {screen}")
+            imageset_name, screen = self._path_args()
 
             if not imageset_name or not screen:
                 self._send_json_error(400, "Missing asset group name or screen")
                 return
 
-            if screen not in ['left', 'center', 'right']:
+            if screen not in _VALID_SCREENS:
                 self._send_json_error(400, "Invalid screen name")
                 return
 
             # Delete the current version
             result = delete_image_version(imageset_name, screen)
-            logging.info(f"[DELETE_VERSION] Delete result: {result}")
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok'})
-            self.wfile.write(response.encode())
-            logging.info(f"[DELETE_VERSION] Success")
+            self._write_json_ok(_OK_BODY)
+            logging.info(f"[DELETE_VERSION] {imageset_name}/{screen} -> {result}")
 
-        except AssertionError as e:
-            logging.error(f"[DELETE_VERSION] Assertion failed: {e}")
+        except (AssertionError, ValueError) as e:
+            logging.error(f"[DELETE_VERSION] Rejected: {e}")
             self._send_json_error(400, str(e))
-        except Exception as e:
-            import traceback
-            logging.error(f"[DELETE_VERSION] Exception: {e}")
-            logging.error(traceback.format_exc())
-            self._send_json_error(500, f"Error deleting image version: {str(e)}")
 
+    @_json_endpoint("Error swapping images")
     def _handle_swap_images(self) -> None:
         """Swap current versions between two screens."""
-        try:
-            from urllib.parse import unquote
 
-            path_parts = self.path.split('/')
-            asset_group_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
+        asset_group_name, _ = self._path_args()
 
-            if not asset_group_name:
-                self.send_error(400, "Missing asset group name")
-                return
+        if not asset_group_name:
+            self.send_error(400, "Missing asset group name")
+            return
 
-            # Read request body to get the two screens to swap
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
-            screen1 = data.get('screen1')
-            screen2 = data.get('screen2')
+        # Read request body to get the two screens to swap
+        data = self._read_json()
+        if data is None:
+            return
+        screen1 = _str_field(data, 'screen1')
+        screen2 = _str_field(data, 'screen2')
 
-            if not screen1 or not screen2:
-                self.send_error(400, "Missing screen1 or screen2")
-                return
+        if not screen1 or not screen2:
+            self.send_error(400, "Missing screen1 or screen2")
+            return
 
-            if screen1 not in ['left', 'center', 'right'] or screen2 not in ['left', 'center', 'right']:
-                self.send_error(400, "Invalid screen names")
-                return
+        if screen1 not in _VALID_SCREENS or screen2 not in _VALID_SCREENS:
+            self.send_error(400, "Invalid screen names")
+            return
 
-            if screen1 == screen2:
-                self.send_error(400, "Cannot swap the same screen")
-                return
+        if screen1 == screen2:
+            self.send_error(400, "Cannot swap the same screen")
+            return
 
+        with _asset_group_lock(asset_group_name):
             # Get asset group from database
             asset_group = get_asset_group(asset_group_name)
             if not asset_group:
@@ -2984,67 +2953,51 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
                 self.send_error(404, f"No current version for {screen2}")
                 return
 
-            # Swap the current_version_uuid pointers
-            temp_uuid = asset1.current_version_uuid
-            asset1.current_version_uuid = asset2.current_version_uuid
-            asset2.current_version_uuid = temp_uuid
-
-            # Also swap the version lists so each screen has its own history
-            temp_versions = asset1.versions
-            asset1.versions = asset2.versions
-            asset2.versions = temp_versions
+            # Swap the screens' Asset records wholesale: current pointer,
+            # version history and any video_url move together, and no file
+            # on disk is touched since versions reference content by UUID
+            setattr(asset_group, screen1, asset2)
+            setattr(asset_group, screen2, asset1)
 
             # Save to database
             save_asset_group(asset_group)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'swapped': [screen1, screen2]})
-            self.wfile.write(response.encode())
+        response = _dumps({'status': 'ok', 'swapped': [screen1, screen2]})
+        self._write_json_ok(response)
 
-            logging.info(f"Swapped {screen1} and {screen2} for '{asset_group_name}'")
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error swapping images: {e}")
+        logging.info(f"Swapped {screen1} and {screen2} for '{asset_group_name}'")
 
+    @_json_endpoint("Error copying image")
     def _handle_copy_image(self) -> None:
         """Copy an image from one screen to another, creating a new version."""
-        try:
-            from urllib.parse import unquote
-            import shutil
-            import uuid
-            from . import storage
 
-            # Parse path: /asset-group/{name}/copy
-            path_parts = self.path.split('/')
-            asset_group_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
+        # Parse path: /asset-group/{name}/copy
+        asset_group_name, _ = self._path_args()
 
-            if not asset_group_name:
-                self.send_error(400, "Missing asset group name")
-                return
+        if not asset_group_name:
+            self.send_error(400, "Missing asset group name")
+            return
 
-            # Read request body to get source and target screens
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
-            source_screen = data.get('sourceScreen')
-            target_screen = data.get('targetScreen')
+        # Read request body to get source and target screens
+        data = self._read_json()
+        if data is None:
+            return
+        source_screen = _str_field(data, 'sourceScreen')
+        target_screen = _str_field(data, 'targetScreen')
 
-            if not source_screen or not target_screen:
-                self.send_error(400, "Missing sourceScreen or targetScreen")
-                return
+        if not source_screen or not target_screen:
+            self.send_error(400, "Missing sourceScreen or targetScreen")
+            return
 
-            if source_screen not in ['left', 'center', 'right'] or target_screen not in ['left', 'center', 'right']:
-                self.send_error(400, "Invalid screen names")
-                return
+        if source_screen not in _VALID_SCREENS or target_screen not in _VALID_SCREENS:
+            self.send_error(400, "Invalid screen names")
+            return
 
-            if source_screen == target_screen:
-                self.send_error(400, "Cannot copy to the same screen")
-                return
+        if source_screen == target_screen:
+            self.send_error(400, "Cannot copy to the same screen")
+            return
 
+        with _asset_group_lock(asset_group_name):
             # Get asset group from database
             asset_group = get_asset_group(asset_group_name)
             if not asset_group:
@@ -3072,14 +3025,16 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
 
             # Create a new UUID for the copied image
             new_uuid = str(uuid.uuid4())
-            assets_dir = storage.get_assets_dir()
-            new_path = assets_dir / f"{new_uuid}{source_path.suffix}"
-
-            # Copy the image file
-            shutil.copy2(source_path, new_path)
 
-            # Create thumbnail
-            storage.create_thumbnail(new_uuid, new_path)
+            if source_content_uuid in db.get_generating_content_uuids():
+                # Still a placeholder that generation will overwrite in
+                # place, so it needs a real copy rather than a link
+                new_path = storage.get_assets_dir() / f"{new_uuid}{source_path.suffix}"
+                shutil.copy2(source_path, new_path)
+                storage.create_thumbnail(new_uuid, new_path)
+            else:
+                # Finished assets are never rewritten, so share the inode
+                storage.link_asset(source_content_uuid, new_uuid)
 
             # Create a new version for the target screen
             target_asset = getattr(asset_group, target_screen)
@@ -3094,174 +3049,148 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
             # Save to database
             save_asset_group(asset_group)
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({
-                'status': 'ok',
-                'copied': {'source': source_screen, 'target': target_screen},
-                'new_uuid': new_uuid
-            })
-            self.wfile.write(response.encode())
+        response = _dumps({
+            'status': 'ok',
+            'copied': {'source': source_screen, 'target': target_screen},
+            'new_uuid': new_uuid
+        })
+        self._write_json_ok(response)
 
-            logging.info(f"Copied {source_screen} to {target_screen} for '{asset_group_name}', created version {new_uuid}")
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error copying image: {e}")
+        logging.info(f"Copied {source_screen} to {target_screen} for '{asset_group_name}', created version {new_uuid}")
 
+    @_json_endpoint("Error renaming asset group")
     def _handle_rename_imageset(self) -> None:
         """Rename an imageset (asset group) in the database."""
-        try:
-            from .db import rename_asset_group_db
-            from urllib.parse import unquote
 
-            # Parse path: /asset-group/{name}/rename
-            path_parts = self.path.split('/')
-            old_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
+        # Parse path: /asset-group/{name}/rename
+        old_name, _ = self._path_args()
 
-            if not old_name:
-                self._send_json_error(400, "Missing asset group name")
-                return
+        if not old_name:
+            self._send_json_error(400, "Missing asset group name")
+            return
 
-            # Read the new name from request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
-            new_name = data.get('newName', '').strip()
+        # Read the new name from request body
+        data = self._read_json()
+        if data is None:
+            return
+        new_name = (_str_field(data, 'newName') or '').strip()
 
-            if not new_name:
-                self._send_json_error(400, "Missing new name")
-                return
+        if not new_name:
+            self._send_json_error(400, "Missing new name")
+            return
 
-            # Rename in database
-            try:
-                success = rename_asset_group_db(old_name, new_name)
-                if not success:
-                    self._send_json_error(404, f"Asset group '{old_name}' not found")
-                    return
-            except ValueError as e:
-                self._send_json_error(400, str(e))
+        # Rename in database
+        try:
+            success = db.rename_asset_group_db(old_name, new_name)
+            invalidate_asset_group_cache(old_name, new_name)
+            if not success:
+                self._send_json_error(404, f"Asset group '{old_name}' not found")
                 return
+        except ValueError as e:
+            self._send_json_error(400, str(e))
+            return
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'oldName': old_name, 'newName': new_name})
-            self.wfile.write(response.encode())
+        response = _dumps({'status': 'ok', 'oldName': old_name, 'newName': new_name})
+        self._write_json_ok(response)
 
-            logging.info(f"Renamed asset group '{old_name}' to '{new_name}'")
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self._send_json_error(500, f"Error renaming asset group: {e}")
+        logging.info(f"Renamed asset group '{old_name}' to '{new_name}'")
 
+    @_json_endpoint("Error duplicating imageset")
     def _handle_duplicate_imageset(self) -> None:
         """Duplicate an imageset with a new name."""
-        try:
-            # Parse path: /imageset/{name}/duplicate
-            from urllib.parse import unquote
-            import shutil
-
-            path_parts = self.path.split('/')
-            source_name = unquote(path_parts[2]) if len(path_parts) > 2 else None
-
-            if not source_name:
-                self._send_json_error(400, "Missing source imageset name")
-                return
-
-            # Read the new name from request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
-            new_name = data.get('newName', '').strip()
-
-            if not new_name:
-                self._send_json_error(400, "Missing new name")
-                return
+        # Parse path: /imageset/{name}/duplicate
 
-            # Validate new name
-            if '/' in new_name and new_name.count('/') != 1:
-                self._send_json_error(400, "Invalid imageset name format")
-                return
-
-            content_dir = get_content_dir()
-            img_dir = content_dir / "img"
+        source_name, _ = self._path_args()
 
-            # Get source file paths
-            source_paths = {}
-            for screen in ['left', 'center', 'right']:
-                source_paths[screen] = get_imageset_image_path(source_name, screen)
-                if not source_paths[screen] or not source_paths[screen].exists():
-                    self._send_json_error(404, f"Source image not found for screen: {screen}")
-                    return
-
-            # Get source prompt file path
-            if '/' in source_name:
-                source_parts = source_name.split('/')
-                source_prompt_path = img_dir / source_parts[0] / f"{source_parts[1]}.prompt.txt"
-            else:
-                source_prompt_path = img_dir / "left" / f"{source_name}.prompt.txt"
+        if not source_name:
+            self._send_json_error(400, "Missing source imageset name")
+            return
 
-            # Determine destination paths
-            dest_paths = {}
-            if '/' in new_name:
-                # Playlist-specific imageset
-                new_parts = new_name.split('/')
-                new_playlist_dir = img_dir / new_parts[0]
-                new_base = new_parts[1]
+        # Read the new name from request body
+        data = self._read_json()
+        if data is None:
+            return
+        new_name = (_str_field(data, 'newName') or '').strip()
 
-                # Create playlist directory if it doesn't exist
-                new_playlist_dir.mkdir(parents=True, exist_ok=True)
+        if not new_name:
+            self._send_json_error(400, "Missing new name")
+            return
 
-                for screen in ['left', 'center', 'right']:
-                    source_path = source_paths[screen]
-                    ext = source_path.suffix
-                    dest_paths[screen] = new_playlist_dir / f"{new_base}.{screen}{ext}"
+        # Validate new name
+        if '/' in new_name and new_name.count('/') != 1:
+            self._send_json_error(400, "Invalid imageset name format")
+            return
 
-                dest_prompt_path = new_playlist_dir / f"{new_base}.prompt.txt"
-            else:
-                # Screen-specific imageset
-                for screen in ['left', 'center', 'right']:
-                    screen_dir = img_dir / screen
-                    screen_dir.mkdir(parents=True, exist_ok=True)
+        content_dir = get_content_dir()
+        img_dir = content_dir / "img"
 
-                    source_path = source_paths[screen]
-                    ext = source_path.suffix
-                    dest_paths[screen] = screen_dir / f"{new_name}{ext}"
+        # Get source file paths
+        source_paths = {}
+        for screen in ['left', 'center', 'right']:
+            source_paths[screen] = get_imageset_image_path(source_name, screen)
+            if not source_paths[screen] or not source_paths[screen].exists():
+                self._send_json_error(404, f"Source image not found for screen: {screen}")
+                return
 
-                dest_prompt_path = img_dir / "left" / f"{new_name}.prompt.txt"
+        # Get source prompt file path
+        if '/' in source_name:
+            source_parts = source_name.split('/')
+            source_prompt_path = img_dir / source_parts[0] / f"{source_parts[1]}.prompt.txt"
+        else:
+            source_prompt_path = img_dir / "left" / f"{source_name}.prompt.txt"
+
+        # Determine destination paths
+        dest_paths = {}
+        if '/' in new_name:
+            # Playlist-specific imageset
+            new_parts = new_name.split('/')
+            new_playlist_dir = img_dir / new_parts[0]
+            new_base = new_parts[1]
+
+            # Create playlist directory if it doesn't exist. A directory
+            # we just created is empty, so nothing in it can collide.
+            try:
+                new_playlist_dir.mkdir(parents=True)
+                dest_dir_is_new = True
+            except FileExistsError:
+                dest_dir_is_new = False
 
-            # Check if destination already exists
-            for screen, dest_path in dest_paths.items():
-                if dest_path and dest_path.exists():
-                    self._send_json_error(400, f"Imageset '{new_name}' already exists")
-                    return
+            for screen in ['left', 'center', 'right']:
+                source_path = source_paths[screen]
+                ext = source_path.suffix
+                dest_paths[screen] = new_playlist_dir / f"{new_base}.{screen}{ext}"
 
-            # Copy all files
+            dest_prompt_path = new_playlist_dir / f"{new_base}.prompt.txt"
+        else:
+            # Screen-specific imageset
+            dest_dir_is_new = False
             for screen in ['left', 'center', 'right']:
+                screen_dir = img_dir / screen
+                screen_dir.mkdir(parents=True, exist_ok=True)
+
                 source_path = source_paths[screen]
-                dest_path = dest_paths[screen]
+                ext = source_path.suffix
+                dest_paths[screen] = screen_dir / f"{new_name}{ext}"
 
-                if source_path and source_path.exists() and dest_path:
-                    shutil.copy2(str(source_path), str(dest_path))
+            dest_prompt_path = img_dir / "left" / f"{new_name}.prompt.txt"
 
-            # Copy prompt file if it exists
-            if source_prompt_path.exists():
-                shutil.copy2(str(source_prompt_path), str(dest_prompt_path))
+        # Check if destination already exists
+        if not dest_dir_is_new and any(dest_path.exists() for dest_path in dest_paths.values()):
+            self._send_json_error(400, f"Imageset '{new_name}' already exists")
+            return
 
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            response = json.dumps({'status': 'ok', 'sourceName': source_name, 'newName': new_name})
-            self.wfile.write(response.encode())
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self._send_json_error(500, f"Error duplicating imageset: {e}")
+        # Copy the screen images and the prompt file, if present, in parallel.
+        # Source images were already checked for existence above.
+        copies = [(source_paths[screen], dest_paths[screen]) for screen in ['left', 'center', 'right']]
+        if source_prompt_path.exists():
+            copies.append((source_prompt_path, dest_prompt_path))
+        list(_file_copy_pool.map(lambda pair: storage.fast_copy(*pair), copies))
+        invalidate_imageset_cache()
+        # A new legacy imageset exists, so the next startup must walk img again
+        db.set_setting_db('imageset_migration_done', False)
+
+        response = _dumps({'status': 'ok', 'sourceName': source_name, 'newName': new_name})
+        self._write_json_ok(response)
 
     # Aliases for new asset_group naming
     def _handle_rename_asset_group(self) -> None:
@@ -3272,262 +3201,170 @@ Return ONLY the 3 numbered prompts, nothing else. Format as:
         """Alias for backward compatibility with new asset_group naming."""
         return self._handle_duplicate_imageset()
 
+    @_json_endpoint("Error expanding prompt with Gemini")
     def _handle_fluff_prompt(self) -> None:
         """Use Gemini to expand a simple prompt into a more descriptive one."""
-        try:
-            # Read the prompt from request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
-            simple_prompt = data.get('prompt', '').strip()
-
-            if not simple_prompt:
-                self.send_error(400, "Missing prompt")
-                return
-
-            # Use Gemini to expand the prompt
-            try:
-                from google import genai
-                from triptic.imgen import get_api_key
-
-                api_key = get_api_key()
-                if not api_key:
-                    self.send_error(500, "No Gemini API key configured. Get one at: https://aistudio.google.com/apikey")
-                    return
-
-                client = genai.Client(api_key=api_key)
-
-                # Ask Gemini to expand the prompt following Imagen best practices
-                expansion_prompt = f"""You are a prompt engineer for Google's Imagen image generation AI.
+        # Read the prompt from request body
+        data = self._read_json()
+        if data is None:
+            return
+        simple_prompt = (_str_field(data, 'prompt') or '').strip()
 
-Given this simple prompt: "{simple_prompt}"
+        if not simple_prompt:
+            self.send_error(400, "Missing prompt")
+            return
 
-Expand it into a detailed, descriptive prompt following these best practices:
+        # Use Gemini to expand the prompt
+        try:
+            from triptic.imgen import get_api_key
 
-1. Use descriptive narratives, not just keywords
-2. Include specific details about:
-   - Photography terminology (lens, composition, lighting setup)
-   - Visual style and artistic approach
-   - Color palette and mood
-   - Textures and materials
-   - Atmospheric conditions
-3. Be explicit about technical requirements:
-   - Aspect ratio: 9:16 (vertical portrait)
-   - Resolution and quality level
-4. Describe the scene with rich contextual details
-5. Keep it focused and coherent - don't add unrelated elements
+            api_key = get_api_key()
+            if not api_key:
+                self.send_error(500, "No Gemini API key configured. Get one at: https://aistudio.google.com/apikey")
+                return
 
-Generate a single, well-crafted prompt (2-4 sentences) that will produce stunning results with Imagen. Return ONLY the expanded prompt text, nothing else."""
+            client = _get_genai_client(api_key)
 
-                response = client.models.generate_content(
-                    model='gemini-2.0-flash',
-                    contents=expansion_prompt
-                )
+            # Ask Gemini to expand the prompt following Imagen best practices
+            expansion_prompt = _FLUFF_TMPL.format(simple_prompt=simple_prompt)
 
-                fluffed_prompt = response.text.strip()
+            response = client.models.generate_content(
+                model='gemini-2.0-flash',
+                contents=expansion_prompt
+            )
 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response_data = json.dumps({'status': 'ok', 'fluffed_prompt': fluffed_prompt})
-                self.wfile.write(response_data.encode())
+            fluffed_prompt = response.text.strip()
 
-            except ImportError:
-                self.send_error(500, "google-genai is not installed. Install with: uv add google-genai")
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                self.send_error(500, f"Error expanding prompt with Gemini: {e}")
+            response_data = _dumps({'status': 'ok', 'fluffed_prompt': fluffed_prompt})
+            self._write_json_ok(response_data)
 
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error processing request: {e}")
+        except ImportError:
+            self.send_error(500, "google-genai is not installed. Install with: uv add google-genai")
 
+    @_json_endpoint("Error generating sub-prompts with Gemini")
     def _handle_fluff_plus_prompt(self) -> None:
         """Use Gemini to generate 3 sub-prompts from a category prompt."""
-        try:
-            # Read the category prompt from request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
-            category_prompt = data.get('prompt', '').strip()
-
-            if not category_prompt:
-                self.send_error(400, "Missing prompt")
-                return
-
-            # Use Gemini to generate 3 sub-prompts
-            try:
-                from google import genai
-                from triptic.imgen import get_api_key
-
-                api_key = get_api_key()
-                if not api_key:
-                    self.send_error(500, "No Gemini API key configured. Get one at: https://aistudio.google.com/apikey")
-                    return
-
-                client = genai.Client(api_key=api_key)
-
-                # Ask Gemini to generate 3 related sub-prompts
-                generation_prompt = f"""You are a prompt engineer for Google's Imagen image generation AI.
-
-Given this category/theme: "{category_prompt}"
+        # Read the category prompt from request body
+        data = self._read_json()
+        if data is None:
+            return
+        category_prompt = (_str_field(data, 'prompt') or '').strip()
 
-Generate exactly 3 related but distinct sub-prompts that would work well as a triptych (three-panel artwork).
-Each prompt should be a variation on the theme, offering a different perspective, angle, or interpretation.
+        if not category_prompt:
+            self.send_error(400, "Missing prompt")
+            return
 
-Example:
-Category: "jazz musician"
-Sub-prompts:
-1. "jazz pianist performing at a dimly lit club"
-2. "saxophone player on a street corner at sunset"
-3. "jazz bass player in a recording studio"
+        # Use Gemini to generate 3 sub-prompts
+        try:
+            from triptic.imgen import get_api_key
 
-Guidelines:
-1. Each sub-prompt should be distinct but thematically connected
-2. Use descriptive language suitable for image generation
-3. Keep each prompt concise (5-15 words)
-4. Ensure they work together as a cohesive set
-5. Number them 1, 2, 3 for left, center, right panels
+            api_key = get_api_key()
+            if not api_key:
+                self.send_error(500, "No Gemini API key configured. Get one at: https://aistudio.google.com/apikey")
+                return
 
-Return ONLY the 3 numbered prompts, nothing else. Format as:
-1. [prompt for left]
-2. [prompt for center]
-3. [prompt for right]"""
+            client = _get_genai_client(api_key)
 
+            # Ask Gemini for one sub-prompt per panel, in parallel. Each
+            # request gets its own role in the triptych so the three come
+            # back distinct without having to parse a numbered list.
+            def generate_panel_prompt(role: str) -> str:
+                panel_prompt = _FLUFF_PLUS_TMPL.format(category_prompt=category_prompt, role=role)
                 response = client.models.generate_content(
                     model='gemini-2.0-flash',
-                    contents=generation_prompt
+                    contents=panel_prompt
                 )
+                return response.text.strip().strip('"\'')
 
-                # Parse the response to extract the 3 prompts
-                response_text = response.text.strip()
-                lines = [line.strip() for line in response_text.split('\n') if line.strip()]
-
-                # Extract prompts from numbered lines
-                sub_prompts = {}
-                panel_names = ['left', 'center', 'right']
-
-                for i, panel in enumerate(panel_names):
-                    # Look for lines starting with "1.", "2.", "3."
-                    prefix = f"{i+1}."
-                    for line in lines:
-                        if line.startswith(prefix):
-                            # Remove the number prefix and clean up
-                            prompt = line[len(prefix):].strip()
-                            sub_prompts[panel] = prompt
-                            break
-
-                    # If we didn't find a numbered prompt, fall back to using lines in order
-                    if panel not in sub_prompts and i < len(lines):
-                        sub_prompts[panel] = lines[i].lstrip('123.-) ').strip()
-
-                # Ensure we have all 3 prompts
-                if len(sub_prompts) != 3:
-                    self.send_error(500, f"Failed to generate 3 sub-prompts (got {len(sub_prompts)})")
-                    return
-
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response_data = json.dumps({'status': 'ok', 'sub_prompts': sub_prompts})
-                self.wfile.write(response_data.encode())
-
-            except ImportError:
-                self.send_error(500, "google-genai is not installed. Install with: uv add google-genai")
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                self.send_error(500, f"Error generating sub-prompts with Gemini: {e}")
-
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error processing request: {e}")
-
-    def _handle_diff_single_prompt(self) -> None:
-        """Use Gemini to generate a single prompt that fits with two others."""
-        try:
-            # Read request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
-
-            main_prompt = data.get('main_prompt', '').strip()
-            screen = data.get('screen', '').strip()
-            other_prompts = data.get('other_prompts', {})
+            panel_roles = {
+                'left': 'the left panel, which opens the set',
+                'center': 'the center panel, the focal point of the set',
+                'right': 'the right panel, which closes the set',
+            }
+            prompts = _gemini_pool.map(generate_panel_prompt, panel_roles.values())
+            sub_prompts = {panel: prompt for panel, prompt in zip(panel_roles, prompts) if prompt}
 
-            if not screen or screen not in ['left', 'center', 'right']:
-                self.send_error(400, "Invalid screen name")
+            # Ensure we have all 3 prompts
+            if len(sub_prompts) != 3:
+                self.send_error(500, f"Failed to generate 3 sub-prompts (got {len(sub_prompts)})")
                 return
 
-            if len(other_prompts) != 2:
-                self.send_error(400, "Need exactly 2 other prompts")
-                return
+            response_data = _dumps({'status': 'ok', 'sub_prompts': sub_prompts})
+            self._write_json_ok(response_data)
 
-            # Use Gemini to generate a matching prompt
-            try:
-                from google import genai
-                from triptic.imgen import get_api_key
+        except ImportError:
+            self.send_error(500, "google-genai is not installed. Install with: uv add google-genai")
 
-                api_key = get_api_key()
-                if not api_key:
-                    self.send_error(500, "No Gemini API key configured. Get one at: https://aistudio.google.com/apikey")
-                    return
+    @_json_endpoint("Error generating prompt with Gemini")
+    def _handle_diff_single_prompt(self) -> None:
+        """Use Gemini to generate a single prompt that fits with two others."""
+        # Read request body
+        data = self._read_json()
+        if data is None:
+            return
 
-                client = genai.Client(api_key=api_key)
+        main_prompt = (_str_field(data, 'main_prompt') or '').strip()
+        screen = (_str_field(data, 'screen') or '').strip()
+        other_prompts = data.get('other_prompts', {})
 
-                # Build the prompt for Gemini
-                other_screens = [k for k in other_prompts.keys()]
-                generation_prompt = f"""You are a prompt engineer for Google's Imagen image generation AI.
+        if not screen or screen not in _VALID_SCREENS:
+            self.send_error(400, "Invalid screen name")
+            return
 
-You are working on a triptych (three-panel artwork) with the theme: "{main_prompt}"
+        if len(other_prompts) != 2:
+            self.send_error(400, "Need exactly 2 other prompts")
+            return
 
-Two panels already have prompts:
-- {other_screens[0].upper()}: "{other_prompts[other_screens[0]]}"
-- {other_screens[1].upper()}: "{other_prompts[other_screens[1]]}"
+        # Use Gemini to generate a matching prompt
+        try:
+            from triptic.imgen import get_api_key
 
-Generate a prompt for the {screen.upper()} panel that:
-1. Fits thematically with the existing two prompts
-2. Relates to the main theme: "{main_prompt}"
-3. Creates a cohesive triptych when combined with the other two
-4. Is distinct but complementary to the existing prompts
-5. Uses similar style and tone to the other prompts
-6. Is concise (5-15 words)
+            api_key = get_api_key()
+            if not api_key:
+                self.send_error(500, "No Gemini API key configured. Get one at: https://aistudio.google.com/apikey")
+                return
 
-Return ONLY the prompt text, nothing else. No numbering, no explanations."""
+            client = _get_genai_client(api_key)
+
+            # Build the prompt for Gemini
+            other_screens = [k for k in other_prompts.keys()]
+            generation_prompt = _DIFF_SINGLE_TMPL.format(
+                main_prompt=main_prompt,
+                first_screen=other_screens[0].upper(),
+                first_prompt=other_prompts[other_screens[0]],
+                second_screen=other_screens[1].upper(),
+                second_prompt=other_prompts[other_screens[1]],
+                screen=screen.upper(),
+            )
 
-                response = client.models.generate_content(
-                    model='gemini-2.0-flash',
-                    contents=generation_prompt
-                )
+            response = client.models.generate_content(
+                model='gemini-2.0-flash',
+                contents=generation_prompt
+            )
 
-                # Extract the generated prompt
-                generated_prompt = response.text.strip()
-                # Remove quotes if Gemini added them
-                generated_prompt = generated_prompt.strip('"\'')
+            # Extract the generated prompt
+            generated_prompt = response.text.strip()
+            # Remove quotes if Gemini added them
+            generated_prompt = generated_prompt.strip('"\'')
 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                response_data = json.dumps({'status': 'ok', 'prompt': generated_prompt})
-                self.wfile.write(response_data.encode())
+            response_data = _dumps({'status': 'ok', 'prompt': generated_prompt})
+            self._write_json_ok(response_data)
 
-            except ImportError:
-                self.send_error(500, "google-genai is not installed. Install with: uv add google-genai")
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                self.send_error(500, f"Error generating prompt with Gemini: {e}")
+        except ImportError:
+            self.send_error(500, "google-genai is not installed. Install with: uv add google-genai")
 
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.send_error(500, f"Error processing diff-single request: {e}")
+
+class TripticHTTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """TCP server that handles each connection on its own thread.
+
+    Lets screen polling and heartbeats proceed while another request is
+    busy, e.g. uploading a video or waiting on Gemini.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+    # socketserver's default listen backlog of 5 drops connections when a
+    # room full of screens polls at once; let the kernel queue more.
+    request_queue_size = 128
 
 
 class TripticServer:
@@ -3558,12 +3395,9 @@ class TripticServer:
         migrate_playlists_to_new_format()
         logging.info("Migrations complete")
 
-        handler = lambda *args, **kwargs: TripticHandler(
-            *args, directory=str(public_dir), **kwargs
-        )
+        handler = functools.partial(TripticHandler, directory=str(public_dir))
 
-        self.httpd = socketserver.TCPServer((self.host, self.port), handler)
-        self.httpd.allow_reuse_address = True
+        self.httpd = TripticHTTPServer((self.host, self.port), handler)
 
         self.thread = threading.Thread(target=self.httpd.serve_forever)
         self.thread.daemon = True
@@ -3583,6 +3417,7 @@ class TripticServer:
             self.thread.join()
 
 
+@storage.cached_per_env('HOME')
 def get_state_dir() -> Path:
     """Get the path to the state directory."""
     state_dir = Path.home() / ".state"
@@ -3608,37 +3443,113 @@ def read_state() -> dict:
         except Exception as e:
             logging.warning(f"Could not migrate old state file: {e}")
 
-    if not state_file.exists():
-        return {}
     try:
-        with open(state_file, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        return _loads(state_file.read_bytes())
+    except (ValueError, OSError):
         return {}
 
 
+# Parsed state file for read-only polling endpoints, keyed by the file's
+# (st_ino, mtime_ns, size) so any rewrite - ours or another process's - is picked up.
+# Held as one (key, data) tuple so concurrent refreshes can't pair one
+# thread's key with another's data.
+_state_cache: tuple = (None, {})
+
+
+def read_state_cached() -> dict:
+    """Read screen state, reusing the last parse while the file is unchanged.
+
+    The returned dict is shared between callers and must not be mutated;
+    use read_state() for read-modify-write.
+    """
+    global _state_cache
+    try:
+        st = os.stat(get_state_file())
+    except OSError:
+        return read_state()
+
+    # write_state always renames a fresh file into place, so the inode
+    # changes on every write even when size and mtime tick don't
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached_key, data = _state_cache
+    if cached_key != key:
+        data = read_state()
+        _state_cache = (key, data)
+    return data
+
+
 def write_state(state: dict) -> None:
-    """Write screen state to file."""
+    """Write screen state to file.
+
+    Writes to a temp file and renames it into place, so concurrent readers
+    never see a half-written file.
+    """
+    global _state_cache
     state_file = get_state_file()
+    tmp_file = state_file.with_name(f"{state_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    data = orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
     try:
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, state_file)
     except IOError as e:
         logging.warning(f"Could not write state file: {e}")
+        tmp_file.unlink(missing_ok=True)
+    _state_cache = (None, {})
+
+
+# Serializes read-modify-write cycles on the state file within the process
+_state_lock = threading.Lock()
+
+
+def update_state(mutate: Callable[[dict], bool]) -> bool:
+    """Read, mutate and write back the state file as one step.
+
+    mutate edits the state dict in place and returns True if it changed
+    anything; the file is only rewritten in that case.
+
+    Returns:
+        Whatever mutate returned
+    """
+    with _state_lock:
+        state = read_state()
+        changed = mutate(state)
+        if changed:
+            write_state(state)
+        return changed
+
+
+# Heartbeats are recorded to the second: the timestamp string is formatted
+# once per wall-clock second, and a screen polling again within the same
+# second doesn't rewrite an identical row.
+_heartbeat_stamp: tuple[int, str] = (0, '')
+_last_heartbeats: dict[str, str] = {}
+_last_heartbeats_max = 1024
 
 
 def update_screen_heartbeat(screen_id: str) -> None:
     """Update the heartbeat timestamp for a screen."""
-    db.update_screen_heartbeat_db(screen_id, datetime.now().isoformat())
+    global _heartbeat_stamp
+    now = int(time.time())
+    stamp_second, stamp = _heartbeat_stamp
+    if stamp_second != now:
+        stamp = datetime.fromtimestamp(now).isoformat()
+        _heartbeat_stamp = (now, stamp)
+
+    if _last_heartbeats.get(screen_id) == stamp:
+        return
+    db.update_screen_heartbeat_db(screen_id, stamp)
+    if len(_last_heartbeats) >= _last_heartbeats_max:
+        _last_heartbeats.clear()
+    _last_heartbeats[screen_id] = stamp
 
 
 def get_config() -> dict:
     """Get configuration from SQLite database."""
-    return {
-        'frequency': db.get_setting_db('frequency', 60),  # Default to 60 seconds
-        'poll_interval': db.get_setting_db('poll_interval', 1000),  # Default to 1000ms (1 second)
-        'frame_reload_minutes': db.get_setting_db('frame_reload_minutes', 10)  # Default to 10 minutes
-    }
+    return db.get_settings_db({
+        'frequency': 60,  # Default to 60 seconds
+        'poll_interval': 1000,  # Default to 1000ms (1 second)
+        'frame_reload_minutes': 10  # Default to 10 minutes
+    })
 
 
 def update_config(config: dict) -> None:
@@ -3653,25 +3564,20 @@ def update_config(config: dict) -> None:
 
 def get_settings() -> dict:
     """Get settings from SQLite database."""
+    settings = db.get_settings_db({
+        'model': 'imagen-4.0-fast-generate-001',
+        'video_model': 'veo-2.0-generate-001',
+        'gemini_api_key': '',
+        'grok_api_key': ''
+    })
+
     # Load API key from .env if not in settings
-    gemini_api_key = db.get_setting_db('gemini_api_key', '')
-    if not gemini_api_key:
-        # Try to read from .env file
-        env_file = Path.cwd() / '.env'
-        if env_file.exists():
-            with open(env_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('GEMINI_API_KEY='):
-                        gemini_api_key = line.split('=', 1)[1].strip()
-                        break
+    if not settings['gemini_api_key']:
+        # Fall back to the .env file
+        from triptic.imgen import get_env_file_api_key
+        settings['gemini_api_key'] = get_env_file_api_key() or ''
 
-    return {
-        'model': db.get_setting_db('model', 'imagen-4.0-fast-generate-001'),
-        'video_model': db.get_setting_db('video_model', 'veo-2.0-generate-001'),
-        'gemini_api_key': gemini_api_key,
-        'grok_api_key': db.get_setting_db('grok_api_key', '')
-    }
+    return settings
 
 
 def update_settings(settings: dict) -> None:
@@ -3686,13 +3592,16 @@ def update_settings(settings: dict) -> None:
         db.set_setting_db('grok_api_key', settings['grok_api_key'])
 
 
+_DEFAULT_PLAYLISTS = {
+    'animals': tuple(f'animals/{i}' for i in [1, 3, 5, 7, 9, 2, 4, 6, 8, 10]),
+    'numbers': tuple(f'numbers/{i}' for i in range(1, 11)),
+    'letters': tuple(f'letters/{i}' for i in [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]),
+}
+
+
 def get_default_playlists() -> dict:
-    """Get default playlists using imageset names."""
-    return {
-        'animals': [f'animals/{i}' for i in [1, 3, 5, 7, 9, 2, 4, 6, 8, 10]],
-        'numbers': [f'numbers/{i}' for i in range(1, 11)],
-        'letters': [f'letters/{i}' for i in [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]]
-    }
+    """Get default playlists using imageset names, as fresh mutable lists."""
+    return {name: list(items) for name, items in _DEFAULT_PLAYLISTS.items()}
 
 
 def get_playlists() -> dict:
@@ -3704,9 +3613,13 @@ def get_playlists() -> dict:
     return state['playlists']
 
 
+# Current playlist while the current_playlist setting has never been set
+_DEFAULT_CURRENT_PLAYLIST = 'letters'
+
+
 def get_current_playlist() -> str:
     """Get the current playlist name from SQLite database."""
-    return db.get_setting_db('current_playlist', 'letters')
+    return db.get_setting_db('current_playlist', _DEFAULT_CURRENT_PLAYLIST)
 
 
 def set_current_playlist(playlist_name: str) -> bool:
@@ -3742,6 +3655,35 @@ def add_to_playlist(playlist_name: str, asset_id: str) -> bool:
     return True
 
 
+def add_to_playlists_bulk(playlist_names: list[str], asset_id: str) -> dict[str, bool]:
+    """
+    Add an asset group to several playlists with one read and one write.
+
+    Args:
+        playlist_names: Names of the playlists to add to
+        asset_id: ID of the asset group to add (e.g., 'animals-1')
+
+    Returns:
+        Mapping of playlist name to True if the asset is now in it, or
+        False if the playlist doesn't exist
+    """
+    playlists = get_all_playlists()
+    results = {}
+    modified = []
+    for playlist_name in playlist_names:
+        playlist = playlists.get(playlist_name)
+        if playlist is None:
+            results[playlist_name] = False
+            continue
+        if asset_id not in playlist.assets:
+            playlist.assets.append(asset_id)
+            modified.append(playlist)
+        results[playlist_name] = True
+
+    save_playlists(modified)
+    return results
+
+
 def remove_from_playlist(playlist_name: str, asset_id: str) -> bool:
     """
     Remove an asset group from a playlist.
@@ -3817,7 +3759,6 @@ def resolve_group_playlist_assets(playlist_name: str) -> list[str]:
                     seen.add(asset)
 
     # Shuffle deterministically so the order is stable but mixed
-    import random
     rng = random.Random(playlist_name)
     rng.shuffle(all_assets)
 
@@ -3913,14 +3854,110 @@ def get_asset_groups() -> dict[str, AssetGroup]:
     }
 
 
-def get_asset_group(group_id: str) -> Optional[AssetGroup]:
-    """Get a specific asset group by ID from SQLite database."""
+# Raw DB rows for get_asset_group, keyed by group ID. Writes through this
+# module invalidate their entry; the short TTL bounds staleness for writes
+# made by other processes (e.g. the CLI).
+_asset_group_row_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_asset_group_row_cache_max = 512
+_asset_group_row_cache_ttl = 5.0
+_asset_group_row_lock = threading.Lock()
+# Bumped by every invalidation, so a read that raced with a save can tell
+# its row may predate the save and must not be cached
+_asset_group_row_generations: dict[str, int] = {}
+
+
+def _get_asset_group_row(group_id: str) -> Optional[dict]:
+    """Get an asset group's DB row, served from a short-lived cache when fresh."""
+    now = time.monotonic()
+    with _asset_group_row_lock:
+        cached = _asset_group_row_cache.get(group_id)
+        if cached and cached[0] > now:
+            _asset_group_row_cache.move_to_end(group_id)
+            return cached[1]
+        generation = _asset_group_row_generations.get(group_id, 0)
+
     group_data = db.get_asset_group_db(group_id)
+    if not group_data:
+        return None
+
+    with _asset_group_row_lock:
+        if _asset_group_row_generations.get(group_id, 0) != generation:
+            return group_data
+        _asset_group_row_cache[group_id] = (now + _asset_group_row_cache_ttl, group_data)
+        _asset_group_row_cache.move_to_end(group_id)
+        while len(_asset_group_row_cache) > _asset_group_row_cache_max:
+            _asset_group_row_cache.popitem(last=False)
+    return group_data
+
+
+# Per-group locks serializing every read-then-save of an asset group
+# (handlers and the background generate/edit jobs) now that requests run
+# concurrently; without them two edits to the same group race and the
+# later save drops the earlier one's version. Blind overwrites (create)
+# and single-statement db updates (delete version) don't take them. Weak
+# values drop a group's lock once nobody holds or waits on it.
+_asset_group_locks: weakref.WeakValueDictionary[str, threading.Lock] = weakref.WeakValueDictionary()
+_asset_group_locks_guard = threading.Lock()
+
+# Caps concurrent PIL decode/encode work at one job per core so a burst of
+# image edits can't starve the request threads serving everything else.
+_image_work_slots = threading.BoundedSemaphore(os.cpu_count() or 4)
+
+
+def _asset_group_lock(group_id: str) -> threading.Lock:
+    """Get the lock serializing edits to one asset group."""
+    with _asset_group_locks_guard:
+        lock = _asset_group_locks.get(group_id)
+        if lock is None:
+            lock = _asset_group_locks[group_id] = threading.Lock()
+        return lock
+
+
+def get_asset_group(group_id: str) -> Optional[AssetGroup]:
+    """Get a specific asset group by ID from SQLite database.
+
+    Each call builds a fresh AssetGroup, so callers may mutate the result
+    without affecting the cached row.
+    """
+    group_data = _get_asset_group_row(group_id)
     if group_data:
         return AssetGroup.from_dict(group_data)
     return None
 
 
+# Serialized asset groups for GET /asset-group/{id}, keyed by group ID and
+# validated against the raw DB row so out-of-band writes are never served stale
+_asset_group_json_cache: OrderedDict[str, tuple[dict, bytes]] = OrderedDict()
+_asset_group_json_cache_max = 128
+_asset_group_json_lock = threading.Lock()
+
+
+def get_asset_group_json(group_id: str) -> Optional[bytes]:
+    """Get an asset group serialized as JSON bytes, or None if it doesn't exist.
+
+    The DB is always read, but the from_dict/to_dict round trip and JSON
+    encoding are skipped when the row data matches the last serialization.
+    """
+    group_data = db.get_asset_group_db(group_id)
+    if not group_data:
+        return None
+
+    with _asset_group_json_lock:
+        cached = _asset_group_json_cache.get(group_id)
+        if cached and cached[0] == group_data:
+            _asset_group_json_cache.move_to_end(group_id)
+            return cached[1]
+
+    payload = _dumps(AssetGroup.from_dict(group_data).to_dict())
+
+    with _asset_group_json_lock:
+        _asset_group_json_cache[group_id] = (group_data, payload)
+        _asset_group_json_cache.move_to_end(group_id)
+        while len(_asset_group_json_cache) > _asset_group_json_cache_max:
+            _asset_group_json_cache.popitem(last=False)
+    return payload
+
+
 def save_asset_group(asset_group: AssetGroup) -> None:
     """Save or update an asset group in SQLite database."""
     db.save_asset_group_db(
@@ -3929,12 +3966,36 @@ def save_asset_group(asset_group: AssetGroup) -> None:
         asset_group.center,
         asset_group.right
     )
+    invalidate_asset_group_cache(asset_group.id)
     logging.info(f"Saved asset group: {asset_group.id}")
 
 
+def save_asset_groups(asset_groups: list[AssetGroup]) -> None:
+    """Save or update several asset groups in one SQLite transaction."""
+    db.save_asset_groups_db([
+        (g.id, g.left, g.center, g.right)
+        for g in asset_groups
+    ])
+    invalidate_asset_group_cache(*(g.id for g in asset_groups))
+    for asset_group in asset_groups:
+        logging.info(f"Saved asset group: {asset_group.id}")
+
+
+def invalidate_asset_group_cache(*group_ids: str) -> None:
+    """Drop cached rows and serializations for the given asset groups."""
+    with _asset_group_row_lock:
+        for group_id in group_ids:
+            _asset_group_row_cache.pop(group_id, None)
+            _asset_group_row_generations[group_id] = _asset_group_row_generations.get(group_id, 0) + 1
+    with _asset_group_json_lock:
+        for group_id in group_ids:
+            _asset_group_json_cache.pop(group_id, None)
+
+
 def delete_asset_group(group_id: str) -> bool:
     """Delete an asset group from SQLite database."""
     success = db.delete_asset_group_db(group_id)
+    invalidate_asset_group_cache(group_id)
     if success:
         logging.info(f"Deleted asset group: {group_id}")
     return success
@@ -3955,6 +4016,16 @@ def save_playlist(playlist: Playlist) -> None:
     logging.info(f"Saved playlist: {playlist.name}")
 
 
+def save_playlists(playlists: list[Playlist]) -> None:
+    """Save or update several playlists in one SQLite transaction."""
+    db.save_playlists_db([
+        (p.name, p.assets, p.current_position, p.child_playlists or None)
+        for p in playlists
+    ])
+    for playlist in playlists:
+        logging.info(f"Saved playlist: {playlist.name}")
+
+
 def delete_playlist(name: str) -> bool:
     """Delete a playlist from SQLite database."""
     success = db.delete_playlist_db(name)
@@ -3971,21 +4042,60 @@ def rename_playlist(old_name: str, new_name: str) -> bool:
     return success
 
 
+_rename_playlist_lock = threading.Lock()
+
+
+def rename_playlist_atomic(old_name: str, new_name: str, content_dir: Path) -> bool:
+    """
+    Rename a playlist, its current-playlist pointer and its content directory.
+
+    The database row and the current_playlist setting change in a single
+    transaction; the directory rename follows under the same lock so
+    concurrent renames cannot interleave. If the directory can't be renamed,
+    the database rename is undone before the error propagates.
+    """
+    with _rename_playlist_lock:
+        if not db.rename_playlist_with_current_db(old_name, new_name, _DEFAULT_CURRENT_PLAYLIST):
+            return False
+        try:
+            os.rename(content_dir / old_name, content_dir / new_name)
+        except FileNotFoundError:
+            pass  # Playlist has no content directory
+        except OSError:
+            db.rename_playlist_with_current_db(new_name, old_name, _DEFAULT_CURRENT_PLAYLIST)
+            raise
+    logging.info(f"Renamed playlist: '{old_name}' -> '{new_name}'")
+    return True
+
+
 def migrate_imagesets_to_asset_groups() -> None:
     """
     Migrate existing filesystem imagesets to asset_groups in state.
     Creates AssetGroup objects for any discovered imagesets that don't have one.
+    Runs once per database; later startups skip the filesystem walk.
     """
-    imagesets = discover_imagesets()
-    asset_groups = get_asset_groups()
+    if db.get_setting_db('imageset_migration_done', False):
+        return
 
+    # Only a complete walk of an existing img directory may set the marker
+    if not (get_public_dir() / "img").exists():
+        return
+    try:
+        imagesets = dict(_iter_imagesets())
+    except OSError as e:
+        logging.error(f"Error discovering imagesets for migration: {e}")
+        return
+    existing_ids = db.get_asset_group_ids_db()
+
+    # Saved together at the end so the whole migration is one transaction
+    migrated = []
     for imageset_name, files in imagesets.items():
         # Skip png/ prefixed imagesets (legacy duplicates)
         if imageset_name.startswith('png/'):
             continue
 
         # Skip if asset_group already exists
-        if imageset_name in asset_groups:
+        if imageset_name in existing_ids:
             continue
 
         logging.info(f"Migrating imageset '{imageset_name}' to asset_group")
@@ -4003,9 +4113,11 @@ def migrate_imagesets_to_asset_groups() -> None:
                 )
                 getattr(asset_group, screen).add_version(version)
 
-        save_asset_group(asset_group)
+        migrated.append(asset_group)
 
-    logging.info(f"Migrated {len(imagesets) - len(asset_groups)} imagesets to asset_groups")
+    save_asset_groups(migrated)
+    db.set_setting_db('imageset_migration_done', True)
+    logging.info(f"Migrated {len(migrated)} imagesets to asset_groups")
 
 
 def migrate_playlists_to_new_format() -> None:
@@ -4023,115 +4135,178 @@ def migrate_playlists_to_new_format() -> None:
             continue
         playlists_to_migrate.append((name, data))
 
-    for name, old_data in playlists_to_migrate:
-        if isinstance(old_data, list):
-            # Convert list of imageset names to Playlist object
-            playlist = Playlist(name=name, assets=old_data, current_position=0)
-            save_playlist(playlist)
-            logging.info(f"Migrated playlist '{name}' to new format with {len(old_data)} assets")
+    # Convert lists of imageset names to Playlist objects, saved in one transaction
+    migrated = [
+        Playlist(name=name, assets=old_data, current_position=0)
+        for name, old_data in playlists_to_migrate
+        if isinstance(old_data, list)
+    ]
+    save_playlists(migrated)
+    for playlist in migrated:
+        logging.info(f"Migrated playlist '{playlist.name}' to new format with {len(playlist.assets)} assets")
+
+
+def _walk_files(root: str, rel_dirs: tuple[str, ...] = (), descend: Callable[[tuple[str, ...]], bool] | None = None):
+    """Yield (relative directory parts, filename) for every file under root.
+
+    Uses os.scandir so file types come from the directory listing instead
+    of a stat per entry, and never builds Path objects. Like rglob, it
+    doesn't descend into symlinked directories, so a link loop can't
+    recurse forever, but symlinked files are yielded. If given, descend
+    is called with each subdirectory's relative parts and the subtree is
+    skipped when it returns False.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                sub_dirs = rel_dirs + (entry.name,)
+                if descend is None or descend(sub_dirs):
+                    yield from _walk_files(entry.path, sub_dirs, descend)
+                continue
+            try:
+                is_file = entry.is_file()
+            except OSError:
+                # A self-referencing link; Path.is_file() also treats it as not a file
+                continue
+            if is_file:
+                yield rel_dirs, entry.name
+
 
+def _prefixes_overlap(a: str, b: str) -> bool:
+    """Whether some string could start with both a and b."""
+    return a.startswith(b) or b.startswith(a)
 
-def discover_imagesets(prefix: str = None) -> dict:
+
+def _iter_imagesets(prefix: str = None):
     """
-    Discover image sets in the public/img directory.
+    Yield (name, files) for each complete image set in the public/img directory.
 
     Supports two patterns:
     1. New pattern: img/prefix/name.screen.ext (e.g., img/numbers/1.left.png)
     2. Old pattern: img/screen/name.ext (e.g., img/left/1.png) - grouped by extension
 
-    Returns a dict mapping imageset names to their files:
-    {
-        'numbers/1': {'left': 'img/numbers/1.left.png', 'center': ..., 'right': ...},
-        'png/1': {'left': 'img/left/1.png', 'center': ..., 'right': ...},
-    }
+    Yields pairs like:
+        ('numbers/1', {'left': 'img/numbers/1.left.png', 'center': ..., 'right': ...})
+        ('png/1', {'left': 'img/left/1.png', 'center': ..., 'right': ...})
+
+    Yields nothing if the img directory doesn't exist; errors from the walk
+    propagate to the caller.
     """
-    try:
-        public_dir = get_public_dir()
-        img_dir = public_dir / "img"
+    public_dir = get_public_dir()
+    img_dir = public_dir / "img"
 
-        if not img_dir.exists():
-            return {}
+    if not img_dir.exists():
+        return
 
-        # Collect all image files
-        imagesets = defaultdict(dict)
-        old_pattern_files = defaultdict(lambda: defaultdict(dict))  # {ext: {name: {screen: path}}}
-        screens = ['left', 'center', 'right']
-        extensions = ['.png', '.jpg', '.jpeg', '.gif', '.mp4', '.webm']
+    # Collect all image files as {imageset name: {screen: path}}
+    imagesets = defaultdict(dict)
+
+    # New-pattern names start with their directory path, so with a prefix
+    # only directories along it need walking. Old-pattern names start with
+    # the extension instead and can come from any screen directory, so a
+    # prefix that could match one of those still needs the full walk.
+    descend = None
+    if prefix and not any(_prefixes_overlap(f"{ext}/", prefix) for ext in _IMAGESET_EXTENSIONS):
+        descend = lambda rel_dirs: _prefixes_overlap('/'.join(rel_dirs) + '/', prefix)
+
+    # Walk through all files in img directory
+    for rel_dirs, filename in _walk_files(str(img_dir), descend=descend):
+        # Check if it has a valid extension
+        stem, _, ext_name = filename.rpartition('.')
+        ext_name = ext_name.lower()
+        if not stem or ext_name not in _IMAGESET_EXTENSIONS:
+            continue
 
-        # Walk through all files in img directory
-        for file_path in img_dir.rglob('*'):
-            if not file_path.is_file():
-                continue
+        # Relative path from the public root
+        relative_from_public = '/'.join(('img',) + rel_dirs + (filename,))
 
-            # Check if it has a valid extension
-            ext = file_path.suffix.lower()
-            if ext not in extensions:
-                continue
+        # Check if parent directory is a screen name (old pattern)
+        parent_name = rel_dirs[-1] if rel_dirs else ''
+        if parent_name in _VALID_SCREENS:
+            # Old pattern: screen/name.ext, grouped by extension
+            imagesets[f"{ext_name}/{stem}"][parent_name] = relative_from_public
+            continue
 
-            # Get relative path from img directory
-            rel_path = file_path.relative_to(img_dir)
-
-            # Check if parent directory is a screen name (old pattern)
-            parent_name = rel_path.parent.name
-            if parent_name in screens:
-                # Old pattern: screen/name.ext
-                name = file_path.stem
-                screen = parent_name
-                ext_name = ext[1:]  # Remove the dot
-                imageset_name = f"{ext_name}/{name}"
-                old_pattern_files[ext_name][name][screen] = f"img/{rel_path}".replace('\\', '/')
-                continue
+        # Try new pattern: name.screen.ext
+        name, dot, screen = stem.rpartition('.')
+        # Last part before extension should be the screen; everything
+        # before it is the imageset name, prefixed by its directories
+        if dot and screen in _VALID_SCREENS:
+            name = '/'.join(rel_dirs + (name,))
+            imagesets[name][screen] = relative_from_public
 
-            # Try new pattern: name.screen.ext
-            parts = file_path.stem.split('.')
-            if len(parts) >= 2:
-                # Last part before extension should be the screen
-                screen = parts[-1]
-                if screen in screens:
-                    # Everything before the screen is the imageset name
-                    name_parts = parts[:-1]
-                    name = '.'.join(name_parts)
-
-                    # Include parent directories in the name (but not if parent is '.')
-                    if rel_path.parent != Path('.'):
-                        name = str(rel_path.parent / name).replace('\\', '/')
-
-                    # Store the relative path from public root
-                    relative_from_public = f"img/{rel_path}".replace('\\', '/')
-                    imagesets[name][screen] = relative_from_public
-
-        # Add old pattern files to imagesets
-        for ext_name, names_dict in old_pattern_files.items():
-            for name, screens_dict in names_dict.items():
-                imageset_name = f"{ext_name}/{name}"
-                imagesets[imageset_name] = screens_dict
-
-        # Apply prefix filter and only return complete imagesets
-        complete_sets = {}
-        for name, screens_dict in imagesets.items():
-            # Apply prefix filter if specified
-            if prefix and not name.startswith(prefix):
-                continue
+    # Apply prefix filter and only yield complete imagesets (all 3 screens)
+    for name, screens_dict in imagesets.items():
+        if len(screens_dict) == 3 and (not prefix or name.startswith(prefix)):
+            yield name, screens_dict
 
-            # Must have all 3 screens
-            if len(screens_dict) == 3:
-                complete_sets[name] = screens_dict
 
-        return complete_sets
+def discover_imagesets(prefix: str = None) -> dict:
+    """
+    Discover image sets in the public/img directory (see _iter_imagesets).
 
+    Returns a dict mapping imageset names to their files:
+    {
+        'numbers/1': {'left': 'img/numbers/1.left.png', 'center': ..., 'right': ...},
+        'png/1': {'left': 'img/left/1.png', 'center': ..., 'right': ...},
+    }
+    """
+    try:
+        return dict(_iter_imagesets(prefix))
     except Exception as e:
         logging.error(f"Error discovering imagesets: {e}")
         return {}
 
 
+# Sorted list_imagesets results, keyed by prefix. Entries are dropped when
+# the img directory's own mtime changes or this module adds or deletes
+# imageset files; the short TTL bounds staleness for changes deeper in the
+# tree or made by other processes (e.g. the CLI).
+_imageset_list_cache: OrderedDict[Optional[str], tuple[float, Optional[int], list]] = OrderedDict()
+_imageset_list_cache_max = 16
+_imageset_list_cache_ttl = 5.0
+_imageset_list_lock = threading.Lock()
+
+
+def invalidate_imageset_cache() -> None:
+    """Drop cached list_imagesets results after imageset files change."""
+    with _imageset_list_lock:
+        _imageset_list_cache.clear()
+
+
 def list_imagesets(prefix: str = None) -> list:
     """
     List image sets, optionally filtered by prefix.
 
+    Results are cached briefly and shared between callers, so they must not
+    be mutated.
+
     Returns a sorted list of tuples: [(name, files_dict), ...]
     """
-    imagesets = discover_imagesets(prefix)
-    return sorted(imagesets.items())
+    try:
+        img_mtime = os.stat(get_public_dir() / "img").st_mtime_ns
+    except OSError:
+        img_mtime = None
+
+    now = time.monotonic()
+    with _imageset_list_lock:
+        cached = _imageset_list_cache.get(prefix)
+        if cached and cached[0] > now and cached[1] == img_mtime:
+            _imageset_list_cache.move_to_end(prefix)
+            return cached[2]
+
+    try:
+        imagesets = sorted(_iter_imagesets(prefix))
+    except Exception as e:
+        logging.error(f"Error discovering imagesets: {e}")
+        return []
+
+    with _imageset_list_lock:
+        _imageset_list_cache[prefix] = (now + _imageset_list_cache_ttl, img_mtime, imagesets)
+        _imageset_list_cache.move_to_end(prefix)
+        while len(_imageset_list_cache) > _imageset_list_cache_max:
+            _imageset_list_cache.popitem(last=False)
+    return imagesets
 
 
 def read_imageset_prompt(imageset_name: str, screen: str = None) -> str | None:
@@ -4156,31 +4331,27 @@ def read_imageset_prompt(imageset_name: str, screen: str = None) -> str | None:
         # Screen-specific imageset
         prompt_file = img_dir / "left" / f"{imageset_name}.prompt.txt"
 
-    if not prompt_file.exists():
-        return None
-
     try:
-        content = prompt_file.read_text()
-        # Parse the prompt from the file
-        if screen:
-            # Look for screen-specific prompt
-            screen_key = f"{screen.capitalize()}:"
-            for line in content.split('\n'):
-                if line.startswith(screen_key):
-                    return line.replace(screen_key, '').strip()
-            # If screen prompt not found, fall back to main prompt
-            for line in content.split('\n'):
-                if line.startswith('Main prompt:'):
-                    return line.replace('Main prompt:', '').strip()
-        else:
-            # Return main prompt
-            for line in content.split('\n'):
-                if line.startswith('Main prompt:'):
-                    return line.replace('Main prompt:', '').strip()
+        content = prompt_file.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
     except Exception as e:
         logging.error(f"Error reading prompt file: {e}")
+        return None
 
-    return None
+    # Parse "Key: value" lines once; the first line for each key wins
+    prompts = {}
+    for line in content.splitlines():
+        key, sep, value = line.partition(':')
+        if sep:
+            prompts.setdefault(key, value.strip())
+
+    # Prefer the screen-specific prompt, falling back to the main prompt
+    if screen:
+        screen_prompt = prompts.get(screen.capitalize())
+        if screen_prompt is not None:
+            return screen_prompt
+    return prompts.get('Main prompt')
 
 
 def get_imageset_image_path(imageset_name: str, screen: str, version: int | None = None) -> Path | None:
@@ -4195,15 +4366,14 @@ def get_imageset_image_path(imageset_name: str, screen: str, version: int | None
     Returns:
         Path to the image file (may be versioned like .v3.png)
     """
-    from . import storage
-
-    # Get the base file path (UUID-based)
-    file_path = storage.get_asset_file_path_by_group(imageset_name, screen)
-    assert file_path, f"Asset not found: {imageset_name}/{screen}"
 
-    # If no specific version requested, use current from database
+    # Get the base file path (UUID-based), plus the current version from
+    # the database in the same query if no specific version was requested
     if version is None:
-        version = storage.get_current_version_number(imageset_name, screen)
+        file_path, version = storage.get_asset_file_path_and_version(imageset_name, screen)
+    else:
+        file_path = storage.get_asset_file_path_by_group(imageset_name, screen)
+    assert file_path, f"Asset not found: {imageset_name}/{screen}"
 
     # Return versioned path if not version 9
     if version < 9:
@@ -4214,145 +4384,6 @@ def get_imageset_image_path(imageset_name: str, screen: str, version: int | None
     return file_path
 
 
-def create_image_backup(image_path: Path) -> None:
-    """
-    Create a backup of an image file, keeping the last 9 versions.
-
-    Versions are numbered 1-9, where version 1 is the oldest and version 9 is the current.
-    Backups are named: filename.v1.ext, filename.v2.ext, ..., filename.v8.ext
-    The current file (no version suffix) is considered version 9.
-
-    When creating a new backup:
-    - v1 is deleted (oldest)
-    - v2 -> v1, v3 -> v2, ... v8 -> v7
-    - current -> v8
-
-    Args:
-        image_path: Path to the image file to backup
-    """
-    if not image_path.exists():
-        return
-
-    # Get the base path without extension
-    base_path = image_path.parent / image_path.stem
-    ext = image_path.suffix
-
-    # Remove oldest backup (v1) if it exists
-    v1_path = Path(f"{base_path}.v1{ext}")
-    if v1_path.exists():
-        v1_path.unlink()
-
-    # Rotate existing backups: v2->v1, v3->v2, ..., v8->v7
-    for i in range(2, 9):
-        old_path = Path(f"{base_path}.v{i}{ext}")
-        new_path = Path(f"{base_path}.v{i-1}{ext}")
-        if old_path.exists():
-            old_path.rename(new_path)
-
-    # Create new backup from current file (current -> v8)
-    v8_path = Path(f"{base_path}.v8{ext}")
-    shutil.copy2(image_path, v8_path)
-
-
-def get_image_versions_by_uuid(content_uuid: str) -> list[int]:
-    """
-    Get a list of available version numbers for an image by UUID.
-
-    Args:
-        content_uuid: UUID of the asset
-
-    Returns:
-        List of version numbers (1-9) that exist for this image
-    """
-    from . import storage
-
-    versions = []
-    assets_dir = storage.get_assets_dir()
-
-    # Check for versions 1-8
-    for i in range(1, 9):
-        version_path = assets_dir / f"{content_uuid}.v{i}.png"
-        if version_path.exists():
-            versions.append(i)
-
-    # Check if main file exists (version 9)
-    main_path = assets_dir / f"{content_uuid}.png"
-    if main_path.exists():
-        versions.append(9)
-
-    return versions
-
-
-def get_image_versions(image_path: Path) -> list[int]:
-    """
-    Get a list of available version numbers for an image.
-
-    Args:
-        image_path: Path to the current image file
-
-    Returns:
-        List of version numbers (1-9) that exist for this image
-    """
-    versions = []
-    base_path = image_path.parent / image_path.stem
-    ext = image_path.suffix
-
-    # Check for versions 1-8
-    for i in range(1, 9):
-        version_path = Path(f"{base_path}.v{i}{ext}")
-        if version_path.exists():
-            versions.append(i)
-
-    # Check if current file exists (version 9)
-    if image_path.exists():
-        versions.append(9)
-
-    return versions
-
-
-def compact_image_versions(image_path: Path) -> None:
-    """
-    Compact version files so they fill 1-9 with newest always being 9.
-
-    This reorganizes version files to remove gaps in the sequence.
-
-    Args:
-        image_path: Path to the current image file
-    """
-    base_path = image_path.parent / image_path.stem
-    ext = image_path.suffix
-
-    # Collect all existing versions (excluding current/9)
-    existing_versions = []
-    for i in range(1, 9):
-        version_path = Path(f"{base_path}.v{i}{ext}")
-        if version_path.exists():
-            existing_versions.append((i, version_path))
-
-    # If no compaction needed (versions are sequential starting from 1)
-    if not existing_versions or (len(existing_versions) == existing_versions[-1][0]):
-        return
-
-    # Rename versions to fill gaps starting from 1
-    temp_suffix = ".tmp_version"
-    renamed_versions = []
-
-    # First pass: rename to temporary names to avoid conflicts
-    for new_idx, (old_idx, old_path) in enumerate(existing_versions, start=1):
-        if new_idx != old_idx:
-            temp_path = Path(f"{base_path}.v{new_idx}{temp_suffix}{ext}")
-            shutil.move(str(old_path), str(temp_path))
-            renamed_versions.append((new_idx, temp_path))
-        else:
-            renamed_versions.append((new_idx, old_path))
-
-    # Second pass: rename from temp names to final names
-    for idx, temp_path in renamed_versions:
-        final_path = Path(f"{base_path}.v{idx}{ext}")
-        if temp_suffix in str(temp_path):
-            shutil.move(str(temp_path), str(final_path))
-
-
 def restore_image_version(asset_group_id: str, screen: str, version: int) -> bool:
     """
     Set a specific version as current (database-only operation).
@@ -4367,32 +4398,33 @@ def restore_image_version(asset_group_id: str, screen: str, version: int) -> boo
     """
     assert version >= 1, f"Version must be >= 1, got {version}"
 
-    # Get asset group from database
-    asset_group = get_asset_group(asset_group_id)
-    assert asset_group, f"Asset group not found: {asset_group_id}"
+    with _asset_group_lock(asset_group_id):
+        # Get asset group from database
+        asset_group = get_asset_group(asset_group_id)
+        assert asset_group, f"Asset group not found: {asset_group_id}"
 
-    # Get the screen asset
-    screen_asset = getattr(asset_group, screen)
-    assert screen_asset.versions, f"No versions found for {asset_group_id}/{screen}"
+        # Get the screen asset
+        screen_asset = getattr(asset_group, screen)
+        assert screen_asset.versions, f"No versions found for {asset_group_id}/{screen}"
 
-    # Map version number (1-N) to array index
-    # Version 1 = oldest (index 0)
-    # Version 2 = second oldest (index 1), etc.
-    # Version N = newest (index N-1)
-    version_count = len(screen_asset.versions)
+        # Map version number (1-N) to array index
+        # Version 1 = oldest (index 0)
+        # Version 2 = second oldest (index 1), etc.
+        # Version N = newest (index N-1)
+        version_count = len(screen_asset.versions)
 
-    assert version <= version_count, f"Version {version} not available (only versions 1-{version_count} exist)"
+        assert version <= version_count, f"Version {version} not available (only versions 1-{version_count} exist)"
 
-    # Calculate array index: version 1 -> index 0, version 2 -> index 1, etc.
-    array_index = version - 1
-    assert 0 <= array_index < version_count, f"Invalid version mapping: {version} -> index {array_index}"
+        # Calculate array index: version 1 -> index 0, version 2 -> index 1, etc.
+        array_index = version - 1
+        assert 0 <= array_index < version_count, f"Invalid version mapping: {version} -> index {array_index}"
 
-    # Set this version as current
-    target_version = screen_asset.versions[array_index]
-    screen_asset.current_version_uuid = target_version.version_uuid
+        # Set this version as current
+        target_version = screen_asset.versions[array_index]
+        screen_asset.current_version_uuid = target_version.version_uuid
 
-    # Save to database
-    save_asset_group(asset_group)
+        # Save to database
+        save_asset_group(asset_group)
     return True
 
 
@@ -4406,39 +4438,14 @@ def delete_image_version(asset_group_id: str, screen: str) -> bool:
 
     Returns:
         True if successful
-    """
-    # Get asset group from database
-    asset_group = get_asset_group(asset_group_id)
-    assert asset_group, f"Asset group not found: {asset_group_id}"
-
-    # Get the screen asset
-    screen_asset = getattr(asset_group, screen)
-    assert screen_asset.versions, f"No versions found for {asset_group_id}/{screen}"
-    assert len(screen_asset.versions) > 1, "Cannot delete last remaining version"
-
-    # Find the current version in the versions list
-    current_uuid = screen_asset.current_version_uuid
-    current_index = None
-    for i, version in enumerate(screen_asset.versions):
-        if version.version_uuid == current_uuid:
-            current_index = i
-            break
-
-    assert current_index is not None, "Current version not found in versions list"
-
-    # Remove the current version from the list
-    deleted_version = screen_asset.versions.pop(current_index)
-    logging.info(f"Deleted version {deleted_version.version_uuid} from {asset_group_id}/{screen}")
-
-    # Set the most recent remaining version as current (last in list)
-    if screen_asset.versions:
-        screen_asset.current_version_uuid = screen_asset.versions[-1].version_uuid
-    else:
-        # This shouldn't happen due to the assertion above, but be safe
-        screen_asset.current_version_uuid = None
 
-    # Save to database
-    save_asset_group(asset_group)
+    Raises:
+        ValueError: If there is no current version to delete or it is the
+            last one
+    """
+    new_current = db.delete_current_version_db(asset_group_id, screen)
+    invalidate_asset_group_cache(asset_group_id)
+    logging.info(f"Deleted current version of {asset_group_id}/{screen}; now at {new_current}")
     return True
 
 
@@ -4463,50 +4470,103 @@ def delete_imageset(imageset_name: str) -> bool:
         base_name = parts[1]
 
         # Delete all files for this imageset
-        import glob
-        pattern = str(playlist_dir / f"{base_name}.*")
-        files = glob.glob(pattern)
-
-        if not files:
+        if not _delete_matching(playlist_dir, f"{base_name}."):
             return False
-
-        for file_path in files:
-            Path(file_path).unlink()
-            logging.info(f"Deleted: {file_path}")
+        invalidate_imageset_cache()
 
         # Remove from all playlists
-        state = read_state()
-        playlists = state.get('playlists', {})
-        for playlist_name, items in playlists.items():
-            if imageset_name in items:
-                items.remove(imageset_name)
-        write_state(state)
+        def remove_from_playlists(state: dict) -> bool:
+            changed = False
+            for items in state.get('playlists', {}).values():
+                if imageset_name in items:
+                    items.remove(imageset_name)
+                    changed = True
+            return changed
+
+        update_state(remove_from_playlists)
 
         return True
     else:
         # Screen-specific imageset (left/center/right directories)
         found = False
         for screen in ['left', 'center', 'right']:
-            screen_dir = img_dir / screen
-            if not screen_dir.exists():
-                continue
-
-            import glob
-            pattern = str(screen_dir / f"{imageset_name}.*")
-            files = glob.glob(pattern)
-
-            for file_path in files:
-                Path(file_path).unlink()
-                logging.info(f"Deleted: {file_path}")
+            if _delete_matching(img_dir / screen, f"{imageset_name}."):
                 found = True
 
+        if found:
+            invalidate_imageset_cache()
         return found
 
 
+def _delete_matching(dir_path: Path, prefix: str) -> bool:
+    """Delete the files in dir_path whose names start with prefix.
+
+    A single scandir pass with a plain prefix test, so names containing
+    glob metacharacters are matched literally.
+
+    Returns:
+        True if any file was deleted; False otherwise, including when
+        dir_path doesn't exist
+    """
+    try:
+        with os.scandir(dir_path) as it:
+            entries = [e for e in it if e.name.startswith(prefix)]
+    except FileNotFoundError:
+        return False
+
+    deleted = False
+    for entry in entries:
+        if not entry.is_dir(follow_symlinks=False):
+            os.unlink(entry.path)
+            logging.info(f"Deleted: {entry.path}")
+            deleted = True
+    return deleted
+
+
+def _write_file(path: Path, data: bytes, mode: int = 0o644) -> None:
+    """Create or truncate path and write data with raw os.write calls.
+
+    Skips the TextIOWrapper/BufferedWriter setup of Path.write_text for
+    small one-shot writes like prompt files.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _copy_stream(src, dst_path: Path, total: int, buf_size: int = _COPY_BUF_SIZE) -> None:
+    """Copy exactly total bytes from the binary stream src into dst_path.
+
+    Reads through one reusable buffer, so memory stays at buf_size however
+    large the body is. A short read (client went away) removes the partial
+    file and raises IOError.
+    """
+    buf = memoryview(bytearray(min(buf_size, total) or 1))
+    fd = os.open(dst_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        remaining = total
+        while remaining:
+            n = src.readinto(buf[:min(remaining, len(buf))])
+            if not n:
+                raise IOError(f"Request body ended after {total - remaining} of {total} bytes")
+            view = buf[:n]
+            while view:
+                view = view[os.write(fd, view):]
+            remaining -= n
+    except BaseException:
+        os.close(fd)
+        dst_path.unlink(missing_ok=True)
+        raise
+    os.close(fd)
+
+
+@storage.cached_per_env('TRIPTIC_CONTENT_DIR', 'HOME')
 def get_content_dir() -> Path:
     """Get the path to the content directory."""
-    import os
-
     # Check for environment variable override (e.g., for production deployment)
     if 'TRIPTIC_CONTENT_DIR' in os.environ:
         content_dir = Path(os.environ['TRIPTIC_CONTENT_DIR'])
@@ -4520,6 +4580,7 @@ def get_content_dir() -> Path:
     return content_dir
 
 
+@storage.cached_per_env('TRIPTIC_PUBLIC_DIR')
 def get_public_dir() -> Path:
     """Get the path to the public directory."""
     # Try relative to this file first
@@ -4553,24 +4614,32 @@ def ensure_content_symlink() -> None:
     # Create content img directory
     content_img.mkdir(parents=True, exist_ok=True)
 
-    # Remove existing img if it's not a symlink
-    if public_img.exists() and not public_img.is_symlink():
-        import shutil
+    # Try the symlink first: on an already set-up tree this is a single
+    # syscall, and it stays correct when several workers start at once.
+    try:
+        os.symlink(content_img, public_img)
+    except FileExistsError:
+        if public_img.is_symlink():
+            if os.path.realpath(public_img) != os.path.realpath(content_img):
+                logging.warning(f"{public_img} is a symlink to {os.readlink(public_img)}, not {content_img}")
+            return
+        # Move an existing real directory out of the way
         logging.warning(f"{public_img} exists but is not a symlink. Moving to {public_img}.backup")
         shutil.move(str(public_img), str(public_img) + ".backup")
-
-    # Create symlink if it doesn't exist
-    if not public_img.exists():
-        public_img.symlink_to(content_img)
-        logging.info(f"Created symlink: {public_img} -> {content_img}")
+        try:
+            os.symlink(content_img, public_img)
+        except FileExistsError:
+            # Another worker created it between the move and here
+            return
+    logging.info(f"Created symlink: {public_img} -> {content_img}")
 
 
 # Global flag to control the generation worker
 _generation_worker_running = False
 
 # Frame logs storage (circular buffer)
-_frame_logs = []
 _frame_logs_max = 500  # Keep last 500 log entries
+_frame_logs = deque(maxlen=_frame_logs_max)
 
 
 def start_generation_worker() -> threading.Thread:
@@ -4589,7 +4658,6 @@ def start_generation_worker() -> threading.Thread:
 
                 if not item:
                     # No pending items, sleep briefly
-                    import time
                     time.sleep(2)
                     continue
 
@@ -4639,7 +4707,6 @@ def start_generation_worker() -> threading.Thread:
 
             except Exception as e:
                 logging.error(f"[GenWorker] Error in worker loop: {e}", exc_info=True)
-                import time
                 time.sleep(5)  # Sleep on error to avoid tight loop
 
         logging.info("[GenWorker] Stopped generation queue worker")
@@ -4702,14 +4769,9 @@ def run_server(port: int = 3000, host: str = "localhost") -> None:
     gen_worker = start_generation_worker()
     logging.info("Generation queue worker started")
 
-    handler = lambda *args, **kwargs: TripticHandler(
-        *args, directory=str(public_dir), **kwargs
-    )
-
-    # Set allow_reuse_address before creating the server
-    socketserver.TCPServer.allow_reuse_address = True
+    handler = functools.partial(TripticHandler, directory=str(public_dir))
 
-    httpd = socketserver.TCPServer((host, port), handler)
+    httpd = TripticHTTPServer((host, port), handler)
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
@@ -1,5 +1,7 @@
 """UUID-based file storage for triptic assets."""
 
+import functools
+import os
 import uuid
 import shutil
 import sqlite3
@@ -21,10 +23,31 @@ GENERATING_PLACEHOLDER_UUID = "00000000-0000-0000-0000-000000000010"
 CANCELED_PLACEHOLDER_UUID = "00000000-0000-0000-0000-000000000011"
 
 
+def cached_per_env(*env_vars: str):
+    """Cache a no-argument directory resolver until one of env_vars changes.
+
+    Directory resolvers probe the filesystem and mkdir, and sit on nearly
+    every request path; their answer only moves if the environment does.
+    """
+    def decorator(func):
+        cache: dict[tuple, Path] = {}
+
+        @functools.wraps(func)
+        def wrapper() -> Path:
+            key = tuple(os.environ.get(name) for name in env_vars)
+            path = cache.get(key)
+            if path is None:
+                path = cache[key] = func()
+            return path
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+@cached_per_env('TRIPTIC_ASSETS_DIR', 'HOME')
 def get_assets_dir() -> Path:
     """Get the path to the assets directory."""
-    import os
-
     # Check for environment variable override (e.g., for production deployment)
     if 'TRIPTIC_ASSETS_DIR' in os.environ:
         assets_dir = Path(os.environ['TRIPTIC_ASSETS_DIR'])
@@ -313,6 +336,153 @@ def create_thumbnail_from_bytes(content_uuid: str, image_data: bytes) -> Optiona
         return None
 
 
+def create_flipped_thumbnail(source_uuid: str, content_uuid: str) -> Optional[Path]:
+    """
+    Create the thumbnail for a horizontally flipped copy of an asset.
+
+    Mirrors the source's existing thumbnail rather than downscaling the
+    full-size flipped image again; falls back to create_thumbnail when the
+    source has no thumbnail.
+
+    Args:
+        source_uuid: The UUID of the asset that was flipped
+        content_uuid: The UUID of the flipped copy
+
+    Returns:
+        Path to created thumbnail, or None on failure
+    """
+    source_thumb = get_thumbnail_path(source_uuid)
+    if source_thumb is None:
+        return create_thumbnail(content_uuid)
+
+    try:
+        with Image.open(source_thumb) as img:
+            thumb_path = get_assets_dir() / f"{content_uuid}_thumb.png"
+            img.transpose(Image.Transpose.FLIP_LEFT_RIGHT).save(thumb_path, 'PNG', optimize=True)
+            logging.info(f"Created flipped thumbnail: {thumb_path}")
+            return thumb_path
+
+    except Exception as e:
+        logging.error(f"Error creating flipped thumbnail for {content_uuid}: {e}")
+        return None
+
+
+def link_asset(source_uuid: str, content_uuid: str) -> Optional[Path]:
+    """
+    Make content_uuid a copy of source_uuid by hardlinking its files.
+
+    Links the asset file and, when present, its thumbnail, so the copy costs
+    no data movement. Falls back to a real copy where links aren't supported
+    (e.g. across devices). Only safe for finished assets: a file that will
+    still be overwritten in place, like a placeholder awaiting generation,
+    must be copied instead or the overwrite would show through both names.
+
+    Args:
+        source_uuid: The UUID of the asset to copy
+        content_uuid: The UUID for the copy
+
+    Returns:
+        Path to the new asset file, or None if the source doesn't exist
+    """
+    source = get_file_path(source_uuid)
+    if source is None or not source.exists():
+        return None
+
+    assets_dir = get_assets_dir()
+    dest = assets_dir / f"{content_uuid}{source.suffix}"
+    _link_or_copy(source, dest)
+
+    source_thumb = get_thumbnail_path(source_uuid)
+    if source_thumb is not None:
+        _link_or_copy(source_thumb, assets_dir / f"{content_uuid}_thumb.png")
+    else:
+        create_thumbnail(content_uuid, dest)
+    return dest
+
+
+def _link_or_copy(source: Path, dest: Path) -> None:
+    """Hardlink source to dest, copying instead if linking fails."""
+    try:
+        os.link(source, dest)
+    except OSError:
+        fast_copy(source, dest)
+
+
+# ioctl request number for FICLONE (linux/fs.h); fcntl only exports it from
+# Python 3.12.
+_FICLONE = 0x40049409
+
+
+def fast_copy(source: Path, dest: Path) -> None:
+    """
+    Copy a file's contents without moving the bytes through userspace.
+
+    Tries a reflink (instant on btrfs/xfs), then copy_file_range, and falls
+    back to shutil.copyfile elsewhere. Permission bits are copied; unlike
+    shutil.copy2, timestamps are not.
+
+    Args:
+        source: File to copy
+        dest: Destination path, created or truncated
+    """
+    with open(source, 'rb') as src, open(dest, 'wb') as dst:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        st = os.fstat(src_fd)
+        try:
+            import fcntl
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+            copied = True
+        except (ImportError, OSError):
+            copied = False
+
+        if not copied and hasattr(os, 'copy_file_range'):
+            try:
+                remaining = st.st_size
+                while remaining:
+                    n = os.copy_file_range(src_fd, dst_fd, remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+                copied = remaining == 0
+            except OSError:
+                copied = False
+
+        if not copied:
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            shutil.copyfileobj(src, dst)
+
+        os.fchmod(dst_fd, st.st_mode & 0o7777)
+
+
+def copy_placeholder(placeholder_uuid: str, content_uuid: str) -> bool:
+    """
+    Stand a placeholder image (and its thumbnail) in for a pending asset.
+
+    The placeholder's thumbnail is generated once and then copied, so
+    queueing a generation doesn't pay for a PNG decode/resize/encode.
+
+    Args:
+        placeholder_uuid: UUID of the placeholder, e.g. GENERATING_PLACEHOLDER_UUID
+        content_uuid: UUID of the asset the placeholder stands in for
+
+    Returns:
+        True if the placeholder was copied, False if it doesn't exist
+    """
+    assets_dir = get_assets_dir()
+    source = assets_dir / f"{placeholder_uuid}.png"
+    if not source.exists():
+        return False
+
+    shutil.copy2(source, assets_dir / f"{content_uuid}.png")
+
+    source_thumb = assets_dir / f"{placeholder_uuid}_thumb.png"
+    if source_thumb.exists() or create_thumbnail(placeholder_uuid, source):
+        shutil.copy2(source_thumb, assets_dir / f"{content_uuid}_thumb.png")
+    return True
+
+
 def delete_thumbnail(content_uuid: str) -> bool:
     """
     Delete the thumbnail for an asset.
@@ -504,7 +674,61 @@ def get_asset_file_path_by_group(asset_group_id: str, screen: str) -> Optional[P
     Returns:
         Path to the file (real asset or default placeholder)
     """
-    content_uuid = get_asset_uuid(asset_group_id, screen)
+    return _resolve_asset_file_path(get_asset_uuid(asset_group_id, screen), screen)
+
+
+def get_asset_file_path_and_version(asset_group_id: str, screen: str) -> tuple[Optional[Path], int]:
+    """
+    Get the file path and current version number (1-9) for an asset in one query.
+
+    Combines get_asset_file_path_by_group() and get_current_version_number(),
+    with the same fallbacks: the screen's placeholder path and version 9.
+
+    Args:
+        asset_group_id: The asset group identifier (e.g., 'cyberdoc3', 'art/jazz')
+        screen: The screen position ('left', 'center', or 'right')
+
+    Returns:
+        Tuple of (file path, version number)
+    """
+    content_uuid = None
+    version = 9
+
+    db_path = get_db_path()
+    if db_path.exists():
+        try:
+            conn = sqlite3.connect(db_path)
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT
+                    (SELECT content_uuid FROM asset_versions
+                     WHERE asset_id = a.id
+                     ORDER BY version_index DESC
+                     LIMIT 1),
+                    a.current_version
+                FROM asset_groups ag
+                JOIN assets a ON a.asset_group_id = ag.id
+                WHERE ag.group_id = ? AND a.screen = ?
+                """,
+                (asset_group_id, screen)
+            )
+            result = cursor.fetchone()
+            conn.close()
+
+            if result:
+                content_uuid = result[0]
+                # current_version is stored as 0-8, we display as 1-9
+                if result[1] is not None and result[1] < 8:
+                    version = result[1] + 1
+        except Exception as e:
+            logging.error(f"Error looking up asset path and version: {e}")
+
+    return _resolve_asset_file_path(content_uuid, screen), version
+
+
+def _resolve_asset_file_path(content_uuid: Optional[str], screen: str) -> Optional[Path]:
+    """Return the file for content_uuid, or the screen's placeholder if it is missing."""
     if content_uuid and not content_uuid.startswith('img/'):
         file_path = get_file_path(content_uuid)
         # Check if file actually exists on filesystem
@@ -1,5 +1,6 @@
 """Integration tests for all server endpoints using temporary database."""
 
+import http.client
 import json
 import os
 import re
@@ -206,6 +207,23 @@ class EndpointIntegrationTest(unittest.TestCase):
             # Save to database
             db.save_asset_group_db("test-group", asset_group.left, asset_group.center, asset_group.right)
 
+            # Asset group with exactly one version per screen, left untouched
+            # by the other tests so deleting its only version stays rejectable
+            single_group = AssetGroup(id="single-version-group")
+            for screen, uuid_str in [
+                ('left', test_uuid_left),
+                ('center', test_uuid_center),
+                ('right', test_uuid_right)
+            ]:
+                getattr(single_group, screen).add_version(AssetVersion(
+                    content=uuid_str,
+                    prompt=f"Single version for {screen}",
+                    timestamp=datetime.now().isoformat()
+                ))
+            db.save_asset_group_db(
+                "single-version-group", single_group.left, single_group.center, single_group.right
+            )
+
             # Create test playlist
             db.save_playlist_db("test-playlist", ["test-group"], 0)
 
@@ -749,5 +767,86 @@ class EndpointIntegrationTest(unittest.TestCase):
         self.assertIn(response.status_code, [200, 400, 404, 500])
 
 
+    # Request handling tests
+
+    def test_keep_alive_serves_sequential_requests(self):
+        """Test two requests share one HTTP/1.1 keep-alive connection"""
+        conn = http.client.HTTPConnection('localhost', self.server_port, timeout=5)
+        try:
+            conn.request('GET', '/config')
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 200)
+            self.assertIn('Date', response.headers)
+            sock = conn.sock
+
+            conn.request('POST', '/config', body=json.dumps({"frequency": 60}),
+                         headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 200)
+            self.assertIs(conn.sock, sock)
+        finally:
+            conn.close()
+
+    def test_rejected_post_with_unread_body_closes_connection(self):
+        """Test an early-rejected POST closes the connection instead of misreading its body"""
+        conn = http.client.HTTPConnection('localhost', self.server_port, timeout=5)
+        try:
+            # Rejected for the screen name before the body is read
+            conn.request('POST', '/asset-group/test-group/regenerate/nowhere',
+                         body=json.dumps({"prompt": "GET /config HTTP/1.1"}),
+                         headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 400)
+            self.assertEqual(response.getheader('Connection'), 'close')
+
+            # http.client reconnects; the next request must be answered normally
+            conn.request('GET', '/config')
+            response = conn.getresponse()
+            self.assertEqual(response.status, 200)
+            self.assertIn('frequency', json.loads(response.read()))
+        finally:
+            conn.close()
+
+    def test_oversized_body_rejected(self):
+        """Test a Content-Length over the JSON body limit gets 413"""
+        conn = http.client.HTTPConnection('localhost', self.server_port, timeout=5)
+        try:
+            conn.putrequest('POST', '/config')
+            conn.putheader('Content-Type', 'application/json')
+            conn.putheader('Content-Length', str((1 << 20) + 1))
+            conn.endheaders()
+            response = conn.getresponse()
+            response.read()
+            self.assertEqual(response.status, 413)
+        finally:
+            conn.close()
+
+    def test_invalid_json_body_rejected(self):
+        """Test malformed and non-object JSON bodies get 400"""
+        for body in ['{not json', '[1, 2, 3]']:
+            response = requests.post(
+                f"{self.base_url}/asset-group/test-group/regenerate/left",
+                data=body,
+                headers={'Content-Type': 'application/json'}
+            )
+            self.assertEqual(response.status_code, 400, body)
+            self.assertEqual(response.json()['status'], 'error')
+
+    def test_delete_last_version_rejected(self):
+        """Test deleting the only version of a screen gets 400"""
+        response = requests.post(
+            f"{self.base_url}/asset-group/single-version-group/delete-version/left"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('last remaining version', response.json()['message'])
+
+        response = requests.get(f"{self.base_url}/asset-group/single-version-group")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['left']['versions']), 1)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
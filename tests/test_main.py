@@ -74,3 +74,202 @@ class TestCLI:
         with patch.object(sys, "argv", ["triptic", "status"]):
             result = main()
             assert result == 1  # Not running
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the database at a fresh temporary file."""
+    from triptic import db
+
+    monkeypatch.setenv("TRIPTIC_DB_PATH", str(tmp_path / "triptic.db"))
+    db.init_database()
+    return tmp_path
+
+
+def _add_version(group, content: str) -> None:
+    """Append a version with the given content to the group's left screen."""
+    from triptic.server import AssetVersion
+
+    group.left.add_version(AssetVersion(content=content, prompt="test", timestamp="2024-01-01T00:00:00"))
+
+
+class TestAssetGroupCache:
+    """Tests for the asset group row cache."""
+
+    def test_cached_row_refreshed_after_save(self, temp_db):
+        """Test a save replaces the cached row instead of serving it stale."""
+        from triptic.server import AssetGroup, get_asset_group, save_asset_group
+
+        group = AssetGroup(id="cache-refresh")
+        _add_version(group, "v1")
+        save_asset_group(group)
+        assert len(get_asset_group("cache-refresh").left.versions) == 1
+
+        group = get_asset_group("cache-refresh")
+        _add_version(group, "v2")
+        save_asset_group(group)
+        assert len(get_asset_group("cache-refresh").left.versions) == 2
+
+    def test_read_racing_a_save_is_not_cached(self, temp_db):
+        """Test a row read before a save lands isn't cached over the saved one."""
+        import threading
+
+        from triptic import db
+        from triptic.server import AssetGroup, get_asset_group, save_asset_group
+
+        group = AssetGroup(id="cache-race")
+        _add_version(group, "v1")
+        save_asset_group(group)
+
+        read_done = threading.Event()
+        save_done = threading.Event()
+        original = db.get_asset_group_db
+
+        def slow_read(group_id):
+            data = original(group_id)
+            read_done.set()
+            save_done.wait(5)
+            return data
+
+        with patch.object(db, "get_asset_group_db", slow_read):
+            reader = threading.Thread(target=get_asset_group, args=("cache-race",))
+            reader.start()
+            assert read_done.wait(5)
+
+        group = AssetGroup.from_dict(original("cache-race"))
+        _add_version(group, "v2")
+        save_asset_group(group)
+        save_done.set()
+        reader.join(5)
+
+        assert len(get_asset_group("cache-race").left.versions) == 2
+
+
+class TestImagesetMigration:
+    """Tests for the one-time legacy imageset migration."""
+
+    @staticmethod
+    def _write_imageset(img_dir: Path, name: str) -> None:
+        """Create a new-pattern imageset with all three screens."""
+        img_dir.mkdir(parents=True, exist_ok=True)
+        for screen in ["left", "center", "right"]:
+            (img_dir / f"{name}.{screen}.png").write_bytes(b"png")
+
+    def test_marker_set_after_walk(self, temp_db, monkeypatch):
+        """Test the migration runs once, then skips later walks."""
+        from triptic import db, server
+
+        public_dir = temp_db / "public"
+        self._write_imageset(public_dir / "img" / "numbers", "1")
+        monkeypatch.setattr(server, "get_public_dir", lambda: public_dir)
+
+        server.migrate_imagesets_to_asset_groups()
+        assert db.get_setting_db("imageset_migration_done") is True
+        assert "numbers/1" in db.get_asset_group_ids_db()
+
+        self._write_imageset(public_dir / "img" / "numbers", "2")
+        server.migrate_imagesets_to_asset_groups()
+        assert "numbers/2" not in db.get_asset_group_ids_db()
+
+    def test_marker_not_set_without_img_dir(self, temp_db, monkeypatch):
+        """Test a missing img directory leaves the migration pending."""
+        from triptic import db, server
+
+        public_dir = temp_db / "public"
+        public_dir.mkdir()
+        monkeypatch.setattr(server, "get_public_dir", lambda: public_dir)
+
+        server.migrate_imagesets_to_asset_groups()
+        assert db.get_setting_db("imageset_migration_done") is None
+
+        self._write_imageset(public_dir / "img" / "numbers", "1")
+        server.migrate_imagesets_to_asset_groups()
+        assert "numbers/1" in db.get_asset_group_ids_db()
+
+    def test_marker_not_set_when_walk_fails(self, temp_db, monkeypatch):
+        """Test an error during the walk leaves the migration pending."""
+        from triptic import db, server
+
+        public_dir = temp_db / "public"
+        self._write_imageset(public_dir / "img" / "numbers", "1")
+        monkeypatch.setattr(server, "get_public_dir", lambda: public_dir)
+
+        def failing_walk(*args, **kwargs):
+            raise OSError("walk failed")
+
+        monkeypatch.setattr(server, "_walk_files", failing_walk)
+        server.migrate_imagesets_to_asset_groups()
+        assert db.get_setting_db("imageset_migration_done") is None
+
+
+class TestDiscoverImagesets:
+    """Tests for walking public/img for legacy imagesets."""
+
+    def test_symlinked_files_found_and_linked_dirs_skipped(self, tmp_path, monkeypatch):
+        """Test symlinked image files count, while directory links aren't followed."""
+        from triptic import server
+
+        public_dir = tmp_path / "public"
+        numbers = public_dir / "img" / "numbers"
+        numbers.mkdir(parents=True)
+        originals = tmp_path / "originals"
+        originals.mkdir()
+        for screen in ["left", "center", "right"]:
+            (originals / f"1.{screen}.png").write_bytes(b"png")
+            (numbers / f"1.{screen}.png").symlink_to(originals / f"1.{screen}.png")
+            (numbers / f"2.{screen}.png").write_bytes(b"png")
+        # A directory loop and a self-referencing link must not break the walk
+        (numbers / "loop").symlink_to(public_dir / "img")
+        (numbers / "self.png").symlink_to(numbers / "self.png")
+        monkeypatch.setattr(server, "get_public_dir", lambda: public_dir)
+
+        assert sorted(server.discover_imagesets()) == ["numbers/1", "numbers/2"]
+
+
+class TestRenamePlaylist:
+    """Tests for renaming a playlist together with its current pointer and directory."""
+
+    def test_rename_default_current_playlist(self, temp_db):
+        """Test renaming the default current playlist repoints current_playlist."""
+        from triptic import db, server
+
+        db.save_playlist_db("letters", [], 0)
+        assert server.rename_playlist_atomic("letters", "alphabet", temp_db / "content")
+        assert server.get_current_playlist() == "alphabet"
+
+    def test_directory_rename_failure_undoes_db_rename(self, temp_db, monkeypatch):
+        """Test a failed directory rename leaves the database unchanged."""
+        from triptic import db, server
+
+        db.save_playlist_db("letters", [], 0)
+        db.save_playlist_db("numbers", [], 0)
+        server.set_current_playlist("numbers")
+
+        def fail_rename(src, dst):
+            raise PermissionError(13, "Permission denied")
+
+        monkeypatch.setattr(server.os, "rename", fail_rename)
+        with pytest.raises(PermissionError):
+            server.rename_playlist_atomic("numbers", "digits", temp_db / "content")
+        assert db.get_playlist_db("numbers") is not None
+        assert db.get_playlist_db("digits") is None
+        assert server.get_current_playlist() == "numbers"
+
+
+class TestAssetGroupLock:
+    """Tests for the per-group edit locks."""
+
+    def test_lock_shared_while_held_then_dropped(self):
+        """Test one group maps to one lock while in use, and unused locks are freed."""
+        import gc
+
+        from triptic import server
+
+        lock = server._asset_group_lock("g1")
+        with lock:
+            assert server._asset_group_lock("g1") is lock
+            assert server._asset_group_lock("g2") is not lock
+        del lock
+        gc.collect()
+        assert "g1" not in server._asset_group_locks
+        assert "g2" not in server._asset_group_locks